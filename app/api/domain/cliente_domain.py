@@ -1,32 +1,38 @@
-from typing import List, Type
+import asyncio
+from datetime import datetime
+from typing import List, Literal, Tuple, Type
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.config import settings
+from app.core.database import unidade_de_trabalho
 from app.db.dto.cliente_dto import ClienteDTO
+from app.db.dto.favorito_dto import FavoritoDTO
 from app.db.dto.usuario_dto import UsuarioDTO
 from app.db.models.base import pwd_context
 from app.db.models.cliente_model import Cliente
-from app.api.schemas.cliente_schemas import ClienteCreate, ClienteUpdate
+from app.api.schemas.cliente_schemas import ClienteCreate, ClienteResponse, ClienteUpdate
 from app.core.logger import logger
 
 
 class ClienteDomain:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Inicializa o domínio responsável pela lógica de negócios relacionada a clientes.
 
         Este domínio atua como camada intermediária entre os esquemas (schemas) e os DTOs,
         orquestrando a criação, recuperação, atualização e exclusão de clientes.
 
-        :param db: Sessão do banco de dados (SQLAlchemy Session).
+        :param db: Sessão do banco de dados (SQLAlchemy AsyncSession).
         """
         self.cliente_dto = ClienteDTO(db)
         self.usuario_dto = UsuarioDTO(db)
+        self.favorito_dto = FavoritoDTO(db)
         self.db = db
         self.logger = logger
 
-    def registrar_cliente(self, cliente_data: ClienteCreate) -> Cliente:
+    async def registrar_cliente(self, cliente_data: ClienteCreate) -> Cliente:
         """
         Cria um novo cliente e um usuário associado com perfil 'cliente'.
 
@@ -39,7 +45,7 @@ class ClienteDomain:
         """
         self.logger.info(f"Administrador criando novo cliente com o "
                          f"usuário: {cliente_data.email}")
-        cliente_existente = self.cliente_dto.pegar_por_email(
+        cliente_existente = await self.cliente_dto.pegar_por_email(
             cliente_data.email)
         if cliente_existente:
             self.logger.warning(f"Falha na criacao do cliente com usuario: "
@@ -50,7 +56,7 @@ class ClienteDomain:
                 detail="E-mail já cadastrado para outro cliente."
             )
 
-        cliente_existente = self.cliente_dto.pegar_por_email(
+        cliente_existente = await self.cliente_dto.pegar_por_email(
             cliente_data.email)
         if cliente_existente:
             self.logger.warning(f"Falha ao criar usuario: Email "
@@ -59,19 +65,21 @@ class ClienteDomain:
                 status_code=status.HTTP_409_CONFLICT,
                 detail="E-mail já cadastrado para outro cliente."
             )
+        # O hash fica fora da transação para não segurar a conexão durante o bcrypt.
+        hashed_password = await asyncio.to_thread(
+            pwd_context.hash, cliente_data.password)
         try:
             cliente_data_dto = {"nome": cliente_data.nome,
                                 "email": cliente_data.email}
-            db_clientee = self.cliente_dto.registrar(cliente_data_dto)
-
-            hashed_password = pwd_context.hash(cliente_data.password)
-            user_create_data_dto = {
-                "email": cliente_data.email,
-                "hashed_password": hashed_password,
-                "perfil": "cliente",
-                "cliente_id": db_clientee.id
-            }
-            db_usuario = self.usuario_dto.registrar(user_create_data_dto)
+            async with unidade_de_trabalho(self.db):
+                db_clientee = await self.cliente_dto.registrar(cliente_data_dto)
+                user_create_data_dto = {
+                    "email": cliente_data.email,
+                    "hashed_password": hashed_password,
+                    "perfil": "cliente",
+                    "cliente_id": db_clientee.id
+                }
+                db_usuario = await self.usuario_dto.registrar(user_create_data_dto)
 
             self.logger.info(f"Cliente {db_clientee.id} e "
                              f"Usuario {db_usuario.id} criado por admin.")
@@ -79,26 +87,35 @@ class ClienteDomain:
         except Exception as e:
             self.logger.error(f"Erro ao criar cliente independente "
                               f"{cliente_data.email}: {e}", exc_info=True)
-            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao criar cliente: {e}"
             )
 
-    def todos_clientes(self, a_partir: int = 0, limite: int = 100) -> (
-            list)[Type[Cliente]]:
+    async def todos_clientes(
+            self, limite: int = 100, apos: Tuple[datetime, int] | None = None
+    ) -> tuple[list[ClienteResponse], Tuple[datetime, int] | None]:
         """
-        Recupera uma lista paginada de clientes existentes no sistema.
+        Recupera uma página de clientes existentes no sistema.
+
+        As respostas são montadas com `model_construct` direto das linhas lidas,
+        sem revalidação.
 
-        :param a_partir: Quantidade de registros a pular (offset).
         :param limite: Quantidade máxima de clientes a retornar.
-        :return: Lista de objetos Cliente.
+        :param apos: Posição (created_at, id) do último cliente da página anterior.
+        :return: Tupla com os clientes da página e a posição do último deles
+                 (None se não houver mais clientes).
         """
-        self.logger.debug(f"Recuperando todos os clientes com "
-                          f"skip={a_partir}, limite={limite}")
-        return self.cliente_dto.pegar_todos(a_partir=a_partir, limite=limite)
-
-    def cliente_por_id(self, cliente_id: int) -> Cliente | None:
+        self.logger.debug(f"Recuperando clientes com limite={limite}, apos={apos}")
+        linhas = await self.cliente_dto.pegar_todos(limite=limite + 1, apos=apos)
+        clientes = [ClienteResponse.model_construct(**linha._mapping)
+                    for linha in linhas[:limite]]
+        if len(linhas) <= limite:
+            return clientes, None
+        ultimo = linhas[limite - 1]
+        return clientes, (ultimo.created_at, ultimo.id)
+
+    async def cliente_por_id(self, cliente_id: int) -> Cliente | None:
         """
         Retorna um cliente a partir do seu ID único.
 
@@ -108,9 +125,9 @@ class ClienteDomain:
         :return: Cliente correspondente ou None se não encontrado.
         """
         self.logger.debug(f"Pegando cliente por ID: {cliente_id}")
-        return self.cliente_dto.pegar_por_id(cliente_id)
+        return await self.cliente_dto.pegar_por_id(cliente_id)
 
-    def atualizar_cliente(
+    async def atualizar_cliente(
             self, cliente_id: int, cliente_update: ClienteUpdate) -> (
             Cliente | None):
         """
@@ -125,15 +142,15 @@ class ClienteDomain:
         :raises HTTPException: 409 se o novo e-mail já estiver em uso.
         """
         self.logger.info(f"Tentando atualizar o ID do cliente: {cliente_id}")
-        db_cliente = self.cliente_dto.pegar_por_id(cliente_id)
+        db_cliente = await self.cliente_dto.pegar_por_id(cliente_id)
         if not db_cliente:
             self.logger.warning(f"Falha na atualizacao: ID do cliente "
                                 f"{cliente_id} não encontrado.")
             return None
 
         if cliente_update.email and cliente_update.email != db_cliente.email:
-            cliente_existente_with_new_email = self.cliente_dto.pegar_por_email(
-                cliente_update.email)
+            cliente_existente_with_new_email = \
+                await self.cliente_dto.pegar_por_email(cliente_update.email)
             if (cliente_existente_with_new_email and
                     cliente_existente_with_new_email.id != cliente_id):
                 self.logger.warning(f"Falha na atualizacao: Novo e-mail "
@@ -144,62 +161,94 @@ class ClienteDomain:
                     detail="Novo e-mail já cadastrado para outro cliente."
                 )
 
-            db_usuario = self.usuario_dto.pegar_por_cliente_id(cliente_id)
-            if db_usuario:
-                self.logger.info(f"Atualizando email do usuario "
-                                 f"associado do cliente {cliente_id}.")
-                self.usuario_dto.aualizacao(
-                    db_usuario, {"email": cliente_update.email})
-
         try:
-            return self.cliente_dto.atualizar(
-                db_cliente, cliente_update.model_dump(exclude_unset=True))
+            async with unidade_de_trabalho(self.db):
+                if cliente_update.email and cliente_update.email != db_cliente.email:
+                    db_usuario = await self.usuario_dto.pegar_por_cliente_id(cliente_id)
+                    if db_usuario:
+                        self.logger.info(f"Atualizando email do usuario "
+                                         f"associado do cliente {cliente_id}.")
+                        await self.usuario_dto.aualizacao(
+                            db_usuario, {"email": cliente_update.email})
+                return await self.cliente_dto.atualizar(
+                    db_cliente, cliente_update.model_dump(exclude_unset=True))
         except Exception as e:
             self.logger.error(f"Erro ao atualizar o ID do cliente "
                               f"{cliente_id}: {e}", exc_info=True)
-            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao atualizar cliente: {e}"
             )
 
-    def deletar_cliente(self, cliente_id: int) -> bool:
+    async def deletar_cliente(self, cliente_id: int) -> Literal["removido", "agendado"] | None:
         """
-        Exclui um cliente e, se houver, o usuário associado a ele.
+        Exclui um cliente junto com o usuário e os favoritos associados.
 
-        Caso o cliente não seja encontrado, retorna False. Em caso de erro durante
-        a exclusão, lança erro HTTP 500.
+        A exclusão é um único DELETE na tabela 'clientes'; usuário e favoritos
+        saem pelo ON DELETE CASCADE do banco, sem serem carregados na sessão.
+        Clientes com mais de `CLIENTE_EXCLUSAO_LIMITE_SINCRONO` favoritos não
+        são excluídos aqui: cabe a quem chama agendar `excluir_cliente_em_lotes`.
 
         :param cliente_id: ID do cliente a ser removido.
-        :return: True se excluído com sucesso, False se cliente não for encontrado.
+        :return: 'removido' se excluído, 'agendado' se a exclusão deve ser feita
+                 em segundo plano, None se o cliente não for encontrado.
         :raises HTTPException: 500 em caso de falha na exclusão.
         """
         self.logger.info(f"Tentando excluir ID do cliente: {cliente_id}")
-        db_cliente = self.cliente_dto.pegar_por_id(cliente_id)
-        if not db_cliente:
-            self.logger.warning(f"Falha na exclusao: ID do cliente "
-                                f"{cliente_id} nao encontrado.")
-            return False
-
         try:
-            db_usuario = self.usuario_dto.pegar_por_cliente_id(cliente_id)
-            if db_usuario:
-                self.logger.info(f"Excluindo usuario associado "
-                                 f"{db_usuario.id} para cliente "
-                                 f"{cliente_id}.")
-                self.usuario_dto.deletar(db_usuario)
-            else:
-                self.logger.info(f"Nenhum usuario associado encontrado "
-                                 f"para o cliente {cliente_id}. "
-                                 f"Excluindo cliente diretamente.")
-                self.cliente_dto.deletar(db_cliente)
-
-            return True
+            # Um favorito só existe com o cliente (FK), então exceder o limite
+            # também confirma que o cliente existe.
+            if await self.favorito_dto.quantidade_excede(
+                    cliente_id, settings.CLIENTE_EXCLUSAO_LIMITE_SINCRONO):
+                self.logger.info(f"Cliente {cliente_id} tem mais de "
+                                 f"{settings.CLIENTE_EXCLUSAO_LIMITE_SINCRONO} favoritos; "
+                                 f"exclusao sera feita em segundo plano.")
+                return "agendado"
+
+            async with unidade_de_trabalho(self.db):
+                removido = await self.cliente_dto.deletar(cliente_id)
         except Exception as e:
             self.logger.error(f"Erro ao excluir o ID do cliente "
                               f"{cliente_id}: {e}", exc_info=True)
-            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao deletar cliente: {e}"
             )
+
+        if not removido:
+            self.logger.warning(f"Falha na exclusao: ID do cliente "
+                                f"{cliente_id} nao encontrado.")
+            return None
+        return "removido"
+
+    async def excluir_cliente_em_lotes(self, cliente_id: int) -> None:
+        """
+        Exclui um cliente com muitos favoritos em segundo plano.
+
+        Os favoritos são removidos em lotes de `CLIENTE_EXCLUSAO_TAMANHO_LOTE`,
+        cada um na própria transação, para não manter locks nem uma transação
+        longa; por fim o cliente (e o usuário) é removido com um único DELETE.
+        Falhas são registradas em log; uma nova chamada retoma de onde parou.
+
+        :param cliente_id: ID do cliente a ser removido.
+        """
+        tamanho_lote = settings.CLIENTE_EXCLUSAO_TAMANHO_LOTE
+        total = 0
+        try:
+            while True:
+                async with unidade_de_trabalho(self.db):
+                    removidos = await self.favorito_dto.deletar_lote_por_cliente(
+                        cliente_id, tamanho_lote)
+                total += removidos
+                if removidos < tamanho_lote:
+                    break
+
+            async with unidade_de_trabalho(self.db):
+                await self.cliente_dto.deletar(cliente_id)
+        except Exception as e:
+            self.logger.error(f"Erro na exclusao em lotes do cliente {cliente_id} "
+                              f"apos {total} favoritos removidos: {e}", exc_info=True)
+            return
+
+        self.logger.info(f"Cliente {cliente_id} excluido em segundo plano "
+                         f"({total} favoritos removidos em lotes).")
@@ -1,23 +1,54 @@
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.db.dto.favorito_dto import FavoritoDTO
+from app.core.database import unidade_de_trabalho
+from app.db.dto.favorito_dto import COLUNAS_EXPORTACAO, FavoritoDTO
 from app.db.dto.cliente_dto import ClienteDTO
 from app.db.models.favorito_model import Favorito
-from app.api.schemas.favorito_schemas import FavoritoCreate
+from app.api.schemas.favorito_schemas import FavoritoCreate, FavoritoResponse
 from app.services.product_service import ProdutoService
+from app.core.config import settings
 from app.core.logger import logger
 
+ERRO_PRODUTO_INCOMPLETO = "Dados do produto incompletos na API externa."
+
+
+def _violacao_chave_estrangeira(erro: IntegrityError) -> bool:
+    # asyncpg expõe o SQLSTATE (23503 = foreign_key_violation); o SQLite só a mensagem.
+    if getattr(erro.orig, "sqlstate", None) == "23503":
+        return True
+    return "foreign key" in str(erro.orig).lower()
+
+
+def _valor_json(valor: Any) -> Any:
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    raise TypeError(f"Tipo nao serializavel: {type(valor).__name__}")
+
+
+def _valor_csv(valor: Any) -> Any:
+    return valor.isoformat() if isinstance(valor, datetime) else valor
+
 
 class FavoritoDomain:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Inicializa o domínio responsável pela lógica de favoritos de produtos.
 
         Este domínio gerencia o relacionamento entre clientes e produtos favoritos,
         interagindo com DTOs, serviços externos e banco de dados.
 
-        :param db: Sessão ativa do banco de dados (SQLAlchemy Session).
+        :param db: Sessão ativa do banco de dados (SQLAlchemy AsyncSession).
         """
         self.favorito_dto = FavoritoDTO(db)
         self.cliente_dto = ClienteDTO(db)
@@ -25,102 +56,416 @@ class FavoritoDomain:
         self.db = db
         self.logger = logger
 
+    @staticmethod
+    def _dados_favorito(cliente_id: int, produto_id: int,
+                        produto_detalhes: dict) -> dict | None:
+        # Título e preço são obrigatórios; sem imagem fica vazia, como na réplica local.
+        if produto_detalhes.get("title") is None or produto_detalhes.get("price") is None:
+            return None
+        return {
+            "cliente_id": cliente_id,
+            "produto_id": produto_id,
+            "titulo": produto_detalhes["title"],
+            "imagem": produto_detalhes.get("image") or "",
+            "preco": produto_detalhes["price"],
+            "review": produto_detalhes.get("description", "")
+        }
+
     async def adicionar_favorito(
             self, cliente_id: int, favorito_data: FavoritoCreate) -> Favorito:
         """
         Adiciona um novo produto à lista de favoritos de um cliente.
 
-        Valida a existência do cliente e se o produto já está favoritado. Em caso
-        positivo, impede a duplicação. Também consulta uma API externa para obter
-        os detalhes do produto antes de salvar.
+        A gravação é um único `INSERT ... ON CONFLICT DO NOTHING RETURNING`: os
+        dados do produto vêm da réplica local do catálogo no próprio INSERT, a
+        duplicidade (inclusive concorrente) é resolvida pela constraint única e
+        a existência do cliente pela chave estrangeira. Quando nada é inserido,
+        os dados do produto vêm do serviço de produtos (a API externa só é
+        consultada se o produto não estiver no cache nem na réplica local) e o
+        favorito é gravado por um segundo INSERT, sem consultas intermediárias.
 
         :param cliente_id: ID do cliente que está favoritando o produto.
         :param favorito_data: Dados do produto a ser favoritado (ID do produto).
         :return: Objeto Favorito criado.
-        :raises HTTPException: 404 se cliente não existir, 409 se produto já for favorito,
-                               500 em caso de erro interno.
+        :raises HTTPException: 404 se cliente ou produto não existirem, 409 se
+                               produto já for favorito, 502 se a API externa
+                               devolver o produto sem título ou preço, 500 em
+                               caso de erro interno.
         """
+        produto_id = favorito_data.produto_id
         self.logger.info(f"Tentando adicionar favorito para ID "
-                         f"do cliente {cliente_id}, ID do produto "
-                         f"{favorito_data.produto_id}")
-        db_cliente = self.cliente_dto.pegar_por_id(cliente_id)
-        if not db_cliente:
+                         f"do cliente {cliente_id}, ID do produto {produto_id}")
+
+        db_favorito = await self._gravar_favorito(
+            cliente_id, produto_id,
+            lambda: self.favorito_dto.registrar_do_catalogo(cliente_id, produto_id))
+
+        if db_favorito is None:
+            # Nada inserido: ou o produto não está na réplica local, ou já é
+            # favorito. Os dados vêm do serviço de produtos (cache em memória,
+            # réplica e, só se faltar, API externa) e o INSERT comum resolve o
+            # resto: conflito é 409 e cliente inexistente, a chave estrangeira (404).
+            try:
+                produto_detalhes = \
+                    await self.produto_service.pegar_produto_por_id_api(produto_id)
+            except HTTPException as e:
+                self.logger.error(
+                    f"Falha ao buscar detalhes do produto da API externa para o "
+                    f"ID do produto {produto_id}: {e.detail}")
+                raise e
+
+            favorito_data_registro = self._dados_favorito(
+                cliente_id, produto_id, produto_detalhes)
+            if favorito_data_registro is None:
+                self.logger.error(f"Dados incompletos na API externa para o ID "
+                                  f"do produto {produto_id}.")
+                raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY,
+                                    detail=ERRO_PRODUTO_INCOMPLETO)
+            db_favorito = await self._gravar_favorito(
+                cliente_id, produto_id,
+                lambda: self.favorito_dto.registrar(favorito_data_registro))
+            if db_favorito is None:
+                self._favorito_duplicado(cliente_id, produto_id)
+
+        self.logger.info(f"Favorito {db_favorito.id} adicionado com "
+                         f"sucesso para o cliente {cliente_id}.")
+        return db_favorito
+
+    async def _gravar_favorito(self, cliente_id: int, produto_id: int,
+                               inserir: Callable[[], Awaitable[Favorito | None]]
+                               ) -> Favorito | None:
+        try:
+            async with unidade_de_trabalho(self.db):
+                db_favorito = await inserir()
+                if db_favorito is not None:
+                    await self.cliente_dto.incrementar_versao_favoritos(cliente_id)
+            return db_favorito
+        except IntegrityError as e:
+            if not _violacao_chave_estrangeira(e):
+                raise self._erro_ao_adicionar(cliente_id, produto_id, e)
             self.logger.warning(f"Falha ao adicionar favorito: ID do cliente "
                                 f"{cliente_id} não encontrado.")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Cliente não encontrado.")
+        except Exception as e:
+            raise self._erro_ao_adicionar(cliente_id, produto_id, e)
 
-        existe_favorito = self.favorito_dto.por_cliente_produto_id(
-            cliente_id, favorito_data.produto_id)
-        if existe_favorito:
-            self.logger.warning(
-                f"Falha ao adicionar favorito: Produto "
-                f"{favorito_data.produto_id} ja favorito pelo "
-                f"cliente {cliente_id}.")
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Este produto já está na lista de "
-                       "favoritos do cliente."
-            )
+    def _erro_ao_adicionar(self, cliente_id: int, produto_id: int,
+                           e: Exception) -> HTTPException:
+        self.logger.error(f"Erro ao adicionar favorito para cliente "
+                          f"{cliente_id}, produto {produto_id}: {e}",
+                          exc_info=True)
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao adicionar favorito: {e}"
+        )
 
-        try:
-            produto_detalhes = \
-                await self.produto_service.pegar_produto_por_id_api(
-                    favorito_data.produto_id)
-        except HTTPException as e:
-            self.logger.error(
-                f"Falha ao buscar detalhes do produto da API externa para o "
-                f"ID do produto {favorito_data.produto_id}: {e.detail}")
-            raise e
-
-        favorito_data_registro = {
-            "cliente_id": cliente_id,
-            "produto_id": favorito_data.produto_id,
-            "titulo": produto_detalhes.get("title"),
-            "imagem": produto_detalhes.get("image"),
-            "preco": produto_detalhes.get("price"),
-            "review": produto_detalhes.get("description", "")
-        }
+    def _favorito_duplicado(self, cliente_id: int, produto_id: int) -> None:
+        self.logger.warning(f"Falha ao adicionar favorito: Produto {produto_id} "
+                            f"ja favorito pelo cliente {cliente_id}.")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Este produto já está na lista de "
+                   "favoritos do cliente."
+        )
+
+    async def adicionar_favoritos_em_lote(
+            self, cliente_id: int, produto_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Adiciona vários produtos à lista de favoritos de um cliente de uma vez.
+
+        Os produtos já favoritados são descobertos em uma única consulta, os
+        detalhes dos demais são resolvidos em lote (cache, réplica local e
+        chamadas concorrentes à API externa) e a gravação é um único INSERT
+        multi-linha com ON CONFLICT DO NOTHING, em uma única transação.
+
+        :param cliente_id: ID do cliente que está favoritando os produtos.
+        :param produto_ids: IDs dos produtos (duplicados são ignorados).
+        :return: Lista com um item por ID: `status` 201 e `favorito` se criado,
+                 409 se já era favorito, 502 se a API externa devolveu o produto
+                 sem título ou preço, ou o status e o `erro` do produto.
+        :raises HTTPException: 404 se cliente não existir, 500 em caso de erro interno.
+        """
+        ids = list(dict.fromkeys(produto_ids))
+        self.logger.info(f"Tentando adicionar {len(ids)} favoritos em lote "
+                         f"para ID do cliente {cliente_id}")
+        db_cliente = await self.cliente_dto.pegar_por_id(cliente_id)
+        if not db_cliente:
+            self.logger.warning(f"Falha ao adicionar favoritos em lote: ID do "
+                                f"cliente {cliente_id} não encontrado.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Cliente não encontrado.")
+
+        existentes = await self.favorito_dto.produtos_favoritados(cliente_id, ids)
+        novos = [produto_id for produto_id in ids if produto_id not in existentes]
+        lote = await self.produto_service.pegar_produtos_por_ids(novos) if novos else []
+        erros = {item["id"]: item for item in lote if "produto" not in item}
+        linhas = []
+        for item in (item for item in lote if "produto" in item):
+            dados = self._dados_favorito(cliente_id, item["id"], item["produto"])
+            if dados is None:
+                self.logger.warning(f"Dados incompletos na API externa para o ID "
+                                    f"do produto {item['id']}; item rejeitado.")
+                erros[item["id"]] = {"status": status.HTTP_502_BAD_GATEWAY,
+                                     "erro": ERRO_PRODUTO_INCOMPLETO}
+            else:
+                linhas.append(dados)
 
         try:
-            db_favorito = self.favorito_dto.registrar(favorito_data_registro)
-            self.logger.info(f"Favorito {db_favorito.id} adicionado com "
-                             f"sucesso para o cliente {cliente_id}.")
-            return db_favorito
+            async with unidade_de_trabalho(self.db):
+                criados = await self.favorito_dto.registrar_varios(linhas)
+                if criados:
+                    await self.cliente_dto.incrementar_versao_favoritos(cliente_id)
         except Exception as e:
-            self.logger.error(f"Erro ao adicionar favorito para cliente "
-                              f"{cliente_id}, produto "
-                              f"{favorito_data.produto_id}: {e}",
-                              exc_info=True)
-            self.db.rollback()
+            self.logger.error(f"Erro ao adicionar favoritos em lote para cliente "
+                              f"{cliente_id}: {e}", exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Erro ao adicionar favorito: {e}"
+                detail=f"Erro ao adicionar favoritos: {e}"
             )
 
-    def favoritos_por_cliente(
-            self, cliente_id: int, a_partir: int = 0) -> list[Favorito]:
+        por_produto = {favorito.produto_id: favorito for favorito in criados}
+        resultado = []
+        for produto_id in ids:
+            if produto_id in por_produto:
+                resultado.append({"produto_id": produto_id,
+                                  "status": status.HTTP_201_CREATED,
+                                  "favorito": por_produto[produto_id]})
+            elif produto_id in erros:
+                resultado.append({"produto_id": produto_id,
+                                  "status": erros[produto_id]["status"],
+                                  "erro": erros[produto_id]["erro"]})
+            else:
+                resultado.append({"produto_id": produto_id,
+                                  "status": status.HTTP_409_CONFLICT,
+                                  "erro": "Este produto já está na lista de "
+                                          "favoritos do cliente."})
+        self.logger.info(f"{len(criados)} de {len(ids)} favoritos adicionados em "
+                         f"lote para o cliente {cliente_id}.")
+        return resultado
+
+    async def exportar_favoritos(
+            self, formato: Literal["ndjson", "csv"],
+            cliente_id_min: int | None = None, cliente_id_max: int | None = None,
+            desde: datetime | None = None, ate: datetime | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Gera a exportação dos favoritos em NDJSON ou CSV, lote a lote.
+
+        Cada lote lido do cursor no servidor vira um único pedaço de texto,
+        então a memória usada não depende do tamanho da exportação.
+
+        :param formato: 'ndjson' ou 'csv' (com cabeçalho).
+        :param cliente_id_min: Menor ID de cliente (inclusivo).
+        :param cliente_id_max: Maior ID de cliente (inclusivo).
+        :param desde: Data de criação mínima (inclusiva).
+        :param ate: Data de criação máxima (exclusiva).
+        :return: Iterador assíncrono de pedaços de texto.
+        """
+        colunas = [coluna.key for coluna in COLUNAS_EXPORTACAO]
+        if formato == "csv":
+            yield ",".join(colunas) + "\r\n"
+
+        linhas_exportadas = 0
+        async for linhas in self.favorito_dto.exportar(
+                cliente_id_min, cliente_id_max, desde, ate,
+                tamanho_lote=settings.EXPORTACAO_TAMANHO_LOTE):
+            buffer = io.StringIO()
+            if formato == "csv":
+                csv.writer(buffer).writerows(
+                    [_valor_csv(valor) for valor in linha] for linha in linhas)
+            else:
+                for linha in linhas:
+                    buffer.write(json.dumps(dict(zip(colunas, linha)),
+                                            default=_valor_json, ensure_ascii=False))
+                    buffer.write("\n")
+            linhas_exportadas += len(linhas)
+            yield buffer.getvalue()
+        self.logger.info(f"Exportacao de favoritos concluida: "
+                         f"{linhas_exportadas} linhas ({formato}).")
+
+    async def versao_favoritos(self, cliente_id: int) -> int:
+        """
+        Retorna o contador de versão da lista de favoritos de um cliente.
+
+        O contador muda a cada inclusão ou remoção e é usado para gerar o ETag
+        da listagem sem precisar buscar os favoritos.
+
+        :param cliente_id: ID do cliente.
+        :return: Versão atual da lista de favoritos.
+        :raises HTTPException: 404 se o cliente não existir.
+        """
+        db_cliente = await self.cliente_dto.pegar_por_id(cliente_id)
+        if not db_cliente:
+            self.logger.warning(f"Falha ao obter versao dos favoritos: ID do "
+                                f"cliente {cliente_id} nao encontrado.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Cliente não encontrado.")
+        return db_cliente.favoritos_versao
+
+    async def estatisticas_favoritos(self, cliente_id: int) -> Dict[str, Any]:
+        """
+        Retorna quantidade, valor total e última atividade dos favoritos de um cliente.
+
+        Os números vêm prontos da tabela 'cliente_favoritos_stats', mantida por
+        triggers no banco, então o custo não depende de quantos favoritos o
+        cliente tem.
+
+        :param cliente_id: ID do cliente.
+        :return: Dicionário com as estatísticas do cliente.
+        :raises HTTPException: 404 se o cliente não existir.
+        """
+        estatisticas = await self.favorito_dto.estatisticas_por_cliente(cliente_id)
+        if estatisticas is None:
+            self.logger.warning(f"Falha ao obter estatisticas dos favoritos: ID do "
+                                f"cliente {cliente_id} nao encontrado.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Cliente não encontrado.")
+        return dict(estatisticas._mapping)
+
+    async def listar_estatisticas_favoritos(
+            self, limite: int, apos: int | None = None
+    ) -> tuple[list[Dict[str, Any]], int | None]:
+        """
+        Retorna uma página das estatísticas de favoritos de todos os clientes.
+
+        :param limite: Quantidade máxima de clientes na página.
+        :param apos: ID do último cliente da página anterior.
+        :return: Tupla (estatísticas da página, ID do último cliente ou None
+                 se não houver próxima página).
+        """
+        linhas = await self.favorito_dto.estatisticas(limite=limite + 1, apos=apos)
+        proximo = linhas[limite - 1].cliente_id if len(linhas) > limite else None
+        return [dict(linha._mapping) for linha in linhas[:limite]], proximo
+
+    async def favoritos_por_cliente(
+            self, cliente_id: int, limite: int,
+            apos: Tuple[datetime, int] | None = None, cliente_existe: bool = False
+    ) -> tuple[list[FavoritoResponse], Tuple[datetime, int] | None]:
         """
-        Retorna todos os produtos favoritados por um cliente.
+        Retorna uma página dos produtos favoritados por um cliente.
 
-        A busca pontuada para ignorar registros a partir do codigo em skip.
+        As linhas lidas já têm os tipos do schema, então as respostas são
+        montadas com `model_construct`, sem revalidação. A existência do cliente
+        só é consultada quando a página vem vazia, e nem assim se quem chama já
+        carregou o cliente na mesma requisição (ex: `versao_favoritos`).
 
         :param cliente_id: ID do cliente a ser consultado.
-        :param a_partir: A partir de qual favorito vem a lista.
-        :return: Lista de objeto Favorito.
+        :param limite: Quantidade máxima de favoritos na página.
+        :param apos: Posição (created_at, id) do último favorito da página anterior.
+        :param cliente_existe: True se o cliente já foi encontrado nesta requisição.
+        :return: Tupla com os favoritos da página e a posição do último deles
+                 (None se não houver mais favoritos).
         :raises HTTPException: 404 se o cliente não existir.
         """
         self.logger.debug(f"Recuperando favoritos para o ID "
                           f"do cliente {cliente_id}.")
-        db_cliente = self.cliente_dto.pegar_por_id(cliente_id)
-        if not db_cliente:
+        linhas = await self.favorito_dto.todos_por_cliente(
+            cliente_id, limite=limite + 1, apos=apos)
+        if (not linhas and not cliente_existe
+                and not await self.cliente_dto.pegar_por_id(cliente_id)):
+            self.logger.warning(f"Falha ao obter favoritos: ID do cliente "
+                                f"{cliente_id} nao encontrado.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Cliente não encontrado.")
+        favoritos = [FavoritoResponse.model_construct(**linha._mapping)
+                     for linha in linhas[:limite]]
+        if len(linhas) <= limite:
+            return favoritos, None
+        ultimo = linhas[limite - 1]
+        return favoritos, (ultimo.created_at, ultimo.id)
+
+    async def favoritos_por_cliente_json(
+            self, cliente_id: int, limite: int,
+            apos: Tuple[datetime, int] | None = None, cliente_existe: bool = False
+    ) -> tuple[str, Tuple[datetime, int] | None]:
+        """
+        Retorna uma página dos produtos favoritados por um cliente já em JSON.
+
+        O array é montado pelo Postgres no formato de List[FavoritoResponse] e
+        repassado sem passar por objetos Python. Mesma paginação de
+        `favoritos_por_cliente`.
+
+        :param cliente_id: ID do cliente a ser consultado.
+        :param limite: Quantidade máxima de favoritos na página.
+        :param apos: Posição (created_at, id) do último favorito da página anterior.
+        :param cliente_existe: True se o cliente já foi encontrado nesta requisição.
+        :return: Tupla com o array JSON da página e a posição do último favorito
+                 (None se não houver mais favoritos).
+        :raises HTTPException: 404 se o cliente não existir.
+        """
+        self.logger.debug(f"Recuperando favoritos em JSON para o ID "
+                          f"do cliente {cliente_id}.")
+        pagina = await self.favorito_dto.todos_por_cliente_json(
+            cliente_id, limite=limite, apos=apos)
+        if (not pagina.quantidade and not cliente_existe
+                and not await self.cliente_dto.pegar_por_id(cliente_id)):
             self.logger.warning(f"Falha ao obter favoritos: ID do cliente "
                                 f"{cliente_id} nao encontrado.")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Cliente não encontrado.")
-        return self.favorito_dto.todos_por_cliente(cliente_id, a_partir=a_partir)
+        if pagina.quantidade <= limite:
+            return pagina.favoritos, None
+        return pagina.favoritos, (pagina.created_at, pagina.id)
+
+    async def buscar_favoritos(self, cliente_id: int, texto: str, limite: int,
+                         deslocamento: int = 0
+                         ) -> tuple[list[Favorito], int | None]:
+        """
+        Busca favoritos de um cliente por texto, ordenados por relevância.
+
+        :param cliente_id: ID do cliente a ser consultado.
+        :param texto: Texto procurado no título e na review dos favoritos.
+        :param limite: Quantidade máxima de favoritos na página.
+        :param deslocamento: Posição inicial dentro do resultado.
+        :return: Tupla com os favoritos da página e o deslocamento da próxima
+                 página (None se não houver mais resultados).
+        :raises HTTPException: 404 se o cliente não existir.
+        """
+        self.logger.debug(f"Buscando favoritos do ID do cliente {cliente_id}.")
+        db_cliente = await self.cliente_dto.pegar_por_id(cliente_id)
+        if not db_cliente:
+            self.logger.warning(f"Falha ao buscar favoritos: ID do cliente "
+                                f"{cliente_id} nao encontrado.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Cliente não encontrado.")
+
+        favoritos = await self.favorito_dto.buscar_por_cliente(
+            cliente_id, texto, limite + 1, deslocamento)
+        proximo = deslocamento + limite if len(favoritos) > limite else None
+        return favoritos[:limite], proximo
+
+    async def buscar_favoritos_json(self, cliente_id: int, texto: str, limite: int,
+                              deslocamento: int = 0) -> tuple[str, int | None]:
+        """
+        Busca favoritos de um cliente por texto, com a página já em JSON.
+
+        O array é montado pelo Postgres no formato de List[FavoritoResponse].
+        Mesma ordenação e paginação de `buscar_favoritos`.
+
+        :param cliente_id: ID do cliente a ser consultado.
+        :param texto: Texto procurado no título e na review dos favoritos.
+        :param limite: Quantidade máxima de favoritos na página.
+        :param deslocamento: Posição inicial dentro do resultado.
+        :return: Tupla com o array JSON da página e o deslocamento da próxima
+                 página (None se não houver mais resultados).
+        :raises HTTPException: 404 se o cliente não existir.
+        """
+        self.logger.debug(f"Buscando favoritos em JSON do ID do cliente {cliente_id}.")
+        db_cliente = await self.cliente_dto.pegar_por_id(cliente_id)
+        if not db_cliente:
+            self.logger.warning(f"Falha ao buscar favoritos: ID do cliente "
+                                f"{cliente_id} nao encontrado.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Cliente não encontrado.")
+
+        pagina = await self.favorito_dto.buscar_por_cliente_json(
+            cliente_id, texto, limite, deslocamento)
+        proximo = deslocamento + limite if pagina.quantidade > limite else None
+        return pagina.favoritos, proximo
 
-    def favorito_por_id(self, cliente_id: int, favorite_id: int) -> Favorito | None:
+    async def favorito_por_id(
+            self, cliente_id: int, favorite_id: int) -> Favorito | None:
         """
         Busca um favorito específico de um cliente pelo ID do favorito.
 
@@ -132,14 +477,14 @@ class FavoritoDomain:
         """
         self.logger.debug(f"Recuperando o favorito {favorite_id} para o ID "
                           f"do cliente {cliente_id}.")
-        favorite = self.favorito_dto.pegar_id(favorite_id)
+        favorite = await self.favorito_dto.pegar_id(favorite_id)
         if favorite and favorite.cliente_id == cliente_id:
             return favorite
         self.logger.warning(f"Favorito {favorite_id} nao encontrado ou nao "
                             f"pertence ao cliente {cliente_id}.")
         return None
 
-    def remove_favorito(self, cliente_id: int, favorito_id: int) -> bool:
+    async def remove_favorito(self, cliente_id: int, favorito_id: int) -> bool:
         """
         Remove um produto da lista de favoritos de um cliente.
 
@@ -152,7 +497,7 @@ class FavoritoDomain:
         """
         self.logger.info(f"Tentativa de remover o favorito {favorito_id} "
                          f"do ID do cliente {cliente_id}.")
-        db_favorito = self.favorito_dto.pegar_id(favorito_id)
+        db_favorito = await self.favorito_dto.pegar_id(favorito_id)
         if not db_favorito or db_favorito.cliente_id != cliente_id:
             self.logger.warning(
                 f"Falha na remoção do favorito: Favorito {favorito_id} não "
@@ -160,14 +505,15 @@ class FavoritoDomain:
             return False
 
         try:
-            self.favorito_dto.deletar(db_favorito)
+            async with unidade_de_trabalho(self.db):
+                await self.favorito_dto.deletar(db_favorito)
+                await self.cliente_dto.incrementar_versao_favoritos(cliente_id)
             self.logger.info(f"Favorito {favorito_id} removido com sucesso "
                              f"para o cliente {cliente_id}.")
             return True
         except Exception as e:
             self.logger.error(f"Erro ao remover o favorito {favorito_id} "
                               f"do cliente {cliente_id}: {e}", exc_info=True)
-            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao remover favorito: {e}"
@@ -0,0 +1,247 @@
+import asyncio
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.schemas.cliente_schemas import ClienteCreateWithPassword
+from app.core.config import settings
+from app.core.database import unidade_de_trabalho
+from app.core.logger import logger
+from app.db.dto.cliente_dto import ClienteDTO
+from app.db.models.base import pwd_context
+from app.util.metrics import IMPORTACAO_CLIENTES_LINHAS_TOTAL
+
+COLUNAS_CSV = ("nome", "email", "password")
+# Linhas que um registro do CSV pode ocupar (campos entre aspas com quebras de
+# linha); acima disso a aspa é considerada não fechada.
+_MAX_LINHAS_REGISTRO_CSV = 100
+
+# O bcrypt libera o GIL, então threads dão paralelismo real para os hashes.
+_executor_hash = ThreadPoolExecutor(max_workers=settings.IMPORTACAO_HASH_WORKERS,
+                                    thread_name_prefix="importacao-hash")
+
+
+async def _linhas(corpo: AsyncIterator[bytes],
+                  tamanho_maximo: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Quebra o corpo da requisição, recebido em pedaços, em linhas numeradas.
+
+    Só o pedaço novo é percorrido; da linha ainda incompleta ficam guardados
+    apenas os trechos recebidos. Uma linha com mais de `tamanho_maximo` bytes é
+    descartada até a próxima quebra de linha e entregue como None.
+    """
+    partes: List[bytes] = []
+    tamanho = 0
+    numero = 0
+    async for pedaco in corpo:
+        inicio = 0
+        while (fim := pedaco.find(b"\n", inicio)) >= 0:
+            numero += 1
+            if tamanho + fim - inicio > tamanho_maximo:
+                yield numero, None
+            else:
+                partes.append(pedaco[inicio:fim])
+                yield numero, b"".join(partes).rstrip(b"\r")
+            partes, tamanho = [], 0
+            inicio = fim + 1
+        tamanho += len(pedaco) - inicio
+        if tamanho > tamanho_maximo:
+            partes = []
+        elif inicio < len(pedaco):
+            partes.append(pedaco[inicio:])
+    if tamanho > tamanho_maximo:
+        yield numero + 1, None
+    elif (resto := b"".join(partes)).strip():
+        yield numero + 1, resto.rstrip(b"\r")
+
+
+async def registros_do_corpo(corpo: AsyncIterator[bytes], formato: Literal["csv", "ndjson"]
+                             ) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Lê as linhas de um CSV (com cabeçalho nome,email,password) ou NDJSON à
+    medida que chegam.
+
+    No CSV, um campo entre aspas pode conter quebras de linha: as linhas são
+    acumuladas até o `csv.reader` fechar o registro, que é numerado pela sua
+    primeira linha. Linhas maiores que `IMPORTACAO_MAX_TAMANHO_LINHA` bytes
+    são recusadas com erro, sem serem guardadas em memória.
+
+    :param corpo: Corpo da requisição em pedaços.
+    :param formato: 'csv' ou 'ndjson'.
+    :return: Iterador de (número da linha, dados, erro); `dados` é None quando
+             a linha não pôde ser lida.
+    :raises HTTPException: 422 se o cabeçalho do CSV for inválido.
+    """
+    cabecalho: Optional[List[str]] = None
+    pendentes: List[str] = []
+    inicio = 0
+    tamanho_maximo = settings.IMPORTACAO_MAX_TAMANHO_LINHA
+    async for numero, bruta in _linhas(corpo, tamanho_maximo):
+        if bruta is not None and not pendentes and not bruta.strip():
+            continue
+        texto = None
+        if bruta is None:
+            erro = f"Linha maior que {tamanho_maximo} bytes."
+        else:
+            try:
+                texto = bruta.decode("utf-8").lstrip("\ufeff")
+            except UnicodeDecodeError:
+                erro = "Linha não está em UTF-8."
+        if texto is None:
+            # Registro do CSV em andamento: o erro é dele, numerado pela primeira linha.
+            yield (inicio if pendentes else numero), None, erro
+            pendentes = []
+            continue
+
+        if formato == "ndjson":
+            try:
+                dados = json.loads(texto)
+            except ValueError:
+                yield numero, None, "JSON inválido."
+                continue
+            if not isinstance(dados, dict):
+                yield numero, None, "A linha deve ser um objeto JSON."
+                continue
+            yield numero, dados, None
+            continue
+
+        if not pendentes:
+            inicio = numero
+        pendentes.append(texto + "\n")
+        try:
+            valores = next(csv.reader(pendentes, strict=True))
+        except csv.Error as e:
+            if "unexpected end of data" not in str(e):
+                pendentes = []
+                yield inicio, None, f"CSV inválido: {e}."
+            elif len(pendentes) >= _MAX_LINHAS_REGISTRO_CSV:
+                pendentes = []
+                yield inicio, None, "Campo entre aspas não foi fechado."
+            continue
+        pendentes = []
+
+        if cabecalho is None:
+            cabecalho = [valor.strip().lower() for valor in valores]
+            if not set(COLUNAS_CSV) <= set(cabecalho):
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Cabeçalho do CSV deve conter: {', '.join(COLUNAS_CSV)}.")
+            continue
+        if len(valores) != len(cabecalho):
+            yield inicio, None, (f"Esperadas {len(cabecalho)} colunas, "
+                                 f"encontradas {len(valores)}.")
+            continue
+        yield inicio, dict(zip(cabecalho, valores)), None
+
+    if pendentes:
+        yield inicio, None, "Campo entre aspas não foi fechado."
+
+
+class ImportacaoClientesDomain:
+    def __init__(self, db: AsyncSession):
+        """
+        Inicializa o domínio da importação em massa de clientes.
+
+        As linhas são validadas conforme chegam e gravadas em lotes de
+        `IMPORTACAO_TAMANHO_LOTE`: senhas com hash em paralelo, carga via COPY
+        e merge em conjunto, com um commit por lote.
+
+        :param db: Sessão ativa do banco de dados (SQLAlchemy AsyncSession).
+        """
+        self.cliente_dto = ClienteDTO(db)
+        self.db = db
+        self.logger = logger
+
+    async def importar(self, corpo: AsyncIterator[bytes],
+                       formato: Literal["csv", "ndjson"]) -> Dict[str, Any]:
+        """
+        Importa clientes (e seus usuários com perfil 'cliente') de um CSV ou NDJSON.
+
+        Cada linha traz `nome`, `email` e `password`. Linhas inválidas, e-mails
+        repetidos no arquivo e e-mails já cadastrados são relatados com o número
+        da linha, sem interromper a importação das demais.
+
+        :param corpo: Corpo da requisição em pedaços.
+        :param formato: 'csv' ou 'ndjson'.
+        :return: Resumo com total de linhas, importados e erros por linha.
+        :raises HTTPException: 422 se o cabeçalho do CSV for inválido,
+                               500 em caso de erro na carga.
+        """
+        self.logger.info(f"Iniciando importacao de clientes ({formato}).")
+        resultado = {"total": 0, "importados": 0, "erros": [], "erros_omitidos": 0}
+        vistos: set[str] = set()
+        lote: List[Tuple[int, ClienteCreateWithPassword]] = []
+
+        async for numero, dados, erro in registros_do_corpo(corpo, formato):
+            resultado["total"] += 1
+            if erro is not None:
+                self._registrar_erro(resultado, numero, None, erro)
+                continue
+            try:
+                cliente = ClienteCreateWithPassword(**dados)
+            except ValidationError as e:
+                detalhe = e.errors()[0]
+                campo = ".".join(str(parte) for parte in detalhe["loc"])
+                email = dados.get("email")
+                self._registrar_erro(resultado, numero,
+                                     str(email) if email is not None else None,
+                                     f"{campo}: {detalhe['msg']}")
+                continue
+            if cliente.email in vistos:
+                self._registrar_erro(resultado, numero, cliente.email,
+                                     "E-mail repetido no arquivo.")
+                continue
+            vistos.add(cliente.email)
+            lote.append((numero, cliente))
+
+            if len(lote) >= settings.IMPORTACAO_TAMANHO_LOTE:
+                await self._gravar_lote(lote, resultado)
+                lote = []
+
+        if lote:
+            await self._gravar_lote(lote, resultado)
+
+        self.logger.info(f"Importacao de clientes concluida: {resultado['importados']} "
+                         f"de {resultado['total']} linhas importadas.")
+        return resultado
+
+    async def _gravar_lote(self, lote: List[Tuple[int, ClienteCreateWithPassword]],
+                           resultado: Dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        hashes = await asyncio.gather(*[
+            loop.run_in_executor(_executor_hash, pwd_context.hash, cliente.password)
+            for _, cliente in lote])
+        registros = [(numero, cliente.nome, cliente.email, hashed_password)
+                     for (numero, cliente), hashed_password in zip(lote, hashes)]
+
+        try:
+            async with unidade_de_trabalho(self.db):
+                importados = await self.cliente_dto.importar_lote(registros)
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar lote da importacao de clientes: {e}",
+                              exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Erro ao importar clientes a partir da linha {lote[0][0]}: {e}"
+            )
+
+        resultado["importados"] += len(importados)
+        IMPORTACAO_CLIENTES_LINHAS_TOTAL.labels(resultado="importada").inc(len(importados))
+        for numero, cliente in lote:
+            if cliente.email not in importados:
+                self._registrar_erro(resultado, numero, cliente.email,
+                                     "E-mail já cadastrado.")
+
+    @staticmethod
+    def _registrar_erro(resultado: Dict[str, Any], numero: int,
+                        email: Optional[str], erro: str) -> None:
+        IMPORTACAO_CLIENTES_LINHAS_TOTAL.labels(resultado="erro").inc()
+        if len(resultado["erros"]) >= settings.IMPORTACAO_MAX_ERROS:
+            resultado["erros_omitidos"] += 1
+            return
+        resultado["erros"].append({"linha": numero, "email": email, "erro": erro})
@@ -1,6 +1,8 @@
-from sqlalchemy.orm import Session
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.database import unidade_de_trabalho
 from app.db.dto.usuario_dto import UsuarioDTO
 from app.db.dto.cliente_dto import ClienteDTO
 from app.db.models.usuario_model import Usuario
@@ -10,14 +12,14 @@ from app.core.logger import logger
 
 
 class UsusarioDomain:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Inicializa o domínio responsável pelas operações de usuários no sistema.
 
         Este domínio gerencia a criação, a checagem de autenticação e recuperação de usuários,
         incluindo o vínculo com clientes quando necessário.
 
-        :param db: Sessão ativa do banco de dados (SQLAlchemy Session).
+        :param db: Sessão ativa do banco de dados (SQLAlchemy AsyncSession).
         """
         self.usuario_dto = UsuarioDTO(db)
         self.cliente_dto = ClienteDTO(db)
@@ -36,7 +38,8 @@ class UsusarioDomain:
         :raises HTTPException: 409 se o e-mail já estiver em uso, 500 em caso de erro interno.
         """
         self.logger.info(f"Criando usuario: {usuario_data.email}")
-        usuario_existente = self.usuario_dto.pegar_por_email(usuario_data.email)
+        usuario_existente = await self.usuario_dto.pegar_por_email(
+            usuario_data.email)
         if usuario_existente:
             self.logger.warning(f"Falha ao criar usuario: "
                                 f"Email {usuario_data.email} ja registrado.")
@@ -45,7 +48,8 @@ class UsusarioDomain:
                 detail="E-mail já cadastrado."
             )
 
-        hashed_password = pwd_context.hash(usuario_data.password)
+        hashed_password = await asyncio.to_thread(
+            pwd_context.hash, usuario_data.password)
         user_create_data = {
             "email": usuario_data.email,
             "hashed_password": hashed_password,
@@ -57,21 +61,16 @@ class UsusarioDomain:
                 "nome": f"Cliente {usuario_data.email.split('@')[0]}",
                 "email": usuario_data.email
             }
-            db_cliente = self.cliente_dto.registrar(cliente_data)
-
-            db_usuario = self.usuario_dto.registrar(user_create_data)
-            db_usuario.cliente_id = db_cliente.id
-            self.usuario_dto.db.add(db_usuario)
-            self.usuario_dto.db.commit()
-            self.usuario_dto.db.refresh(db_usuario)
-            self.usuario_dto.db.refresh(db_cliente)
+            async with unidade_de_trabalho(self.db):
+                db_cliente = await self.cliente_dto.registrar(cliente_data)
+                user_create_data["cliente_id"] = db_cliente.id
+                db_usuario = await self.usuario_dto.registrar(user_create_data)
 
             self.logger.info(f"Usuario {db_usuario.id} criado com sucesso.")
             return db_usuario
         except Exception as e:
             self.logger.error(f"Erro ao criar usuario "
                               f"{usuario_data.email}: {e}", exc_info=True)
-            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao criar usuário: {e}"
@@ -93,7 +92,8 @@ class UsusarioDomain:
                          f"{usuario_data.email} com seguinte perfil "
                          f"{usuario_data.perfil}")
 
-        usuario_existente = self.usuario_dto.pegar_por_email(usuario_data.email)
+        usuario_existente = await self.usuario_dto.pegar_por_email(
+            usuario_data.email)
         if usuario_existente:
             self.logger.warning(f"Criacao de usuario deu errado: "
                                 f"Email {usuario_data.email} já registrado.")
@@ -102,7 +102,8 @@ class UsusarioDomain:
                 detail="E-mail já cadastrado."
             )
 
-        hashed_password = pwd_context.hash(usuario_data.password)
+        hashed_password = await asyncio.to_thread(
+            pwd_context.hash, usuario_data.password)
         user_create_data = {
             "email": usuario_data.email,
             "hashed_password": hashed_password,
@@ -110,7 +111,8 @@ class UsusarioDomain:
         }
 
         try:
-            db_usuario = self.usuario_dto.registrar(user_create_data)
+            async with unidade_de_trabalho(self.db):
+                db_usuario = await self.usuario_dto.registrar(user_create_data)
             self.logger.info(f"Usuario {db_usuario.id} com perfil "
                              f"{db_usuario.perfil} criado pelo "
                              f"administrador.")
@@ -118,7 +120,6 @@ class UsusarioDomain:
         except Exception as e:
             self.logger.error(f"Error creating user by admin for "
                               f"{usuario_data.email}: {e}", exc_info=True)
-            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao criar usuário por admin: {e}"
@@ -140,7 +141,8 @@ class UsusarioDomain:
         """
         self.logger.info(f"Criando usuario de rede "
                          f"social para: {usuario_data.email}")
-        usuario_existente = self.usuario_dto.pegar_por_email(usuario_data.email)
+        usuario_existente = await self.usuario_dto.pegar_por_email(
+            usuario_data.email)
         if usuario_existente:
             self.logger.info(f"Usuario {usuario_data.email} ja existe. "
                              f"Continuando com o login do usuário existente.")
@@ -153,15 +155,16 @@ class UsusarioDomain:
                            "Login social não permitido."
                 )
             if usuario_existente.cliente_id:
-                db_client = self.cliente_dto.pegar_por_id(
+                db_client = await self.cliente_dto.pegar_por_id(
                     usuario_existente.cliente_id)
                 if db_client and db_client.nome != google_name:
                     self.logger.info(f"Atualizando o nome do cliente para o "
                                      f"usuário social existente "
                                      f"{usuario_existente.id}.")
-                    self.cliente_dto.atualizar(db_client,
-                                               {"nome": google_name,
-                                               "email": usuario_data.email})
+                    async with unidade_de_trabalho(self.db):
+                        await self.cliente_dto.atualizar(
+                            db_client, {"nome": google_name,
+                                        "email": usuario_data.email})
             return usuario_existente
 
         self.logger.info(f"Criando usaurio de rede social: "
@@ -177,14 +180,10 @@ class UsusarioDomain:
                 "nome": f"Cliente {usuario_data.email.split('@')[0]}",
                 "email": usuario_data.email
             }
-            db_cliente = self.cliente_dto.registrar(cliente_data)
-
-            db_usuario = self.usuario_dto.registrar(user_create_data)
-            db_usuario.cliente_id = db_cliente.id
-            self.usuario_dto.db.add(db_usuario)
-            self.usuario_dto.db.commit()
-            self.usuario_dto.db.refresh(db_usuario)
-            self.usuario_dto.db.refresh(db_cliente)
+            async with unidade_de_trabalho(self.db):
+                db_cliente = await self.cliente_dto.registrar(cliente_data)
+                user_create_data["cliente_id"] = db_cliente.id
+                db_usuario = await self.usuario_dto.registrar(user_create_data)
 
             self.logger.info(f"Usuario rede social {db_usuario.id} "
                              f"criado com sucesso.")
@@ -192,13 +191,12 @@ class UsusarioDomain:
         except Exception as e:
             self.logger.error(f"Error in create_user_from_social for "
                               f"{usuario_data.email}: {e}", exc_info=True)
-            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro interno ao criar usuário via login social: {e}"
             )
 
-    def autenticar_usuario(
+    async def autenticar_usuario(
             self, email: str, password: str) -> Usuario | None:
         """
         Autentica um usuário a partir do e-mail e da senha fornecidos.
@@ -210,15 +208,16 @@ class UsusarioDomain:
         :return: Objeto Usuario autenticado ou None se falhar.
         """
         self.logger.debug(f"Autenticando usuario: {email}")
-        user = self.usuario_dto.pegar_por_email(email)
-        if not user or not user.verify_password(password):
+        user = await self.usuario_dto.pegar_por_email(email)
+        if not user or not await asyncio.to_thread(
+                user.verify_password, password):
             self.logger.warning(f"Falha na autenticacao para o "
                                 f"usuario: {email}")
             return None
         self.logger.info(f"Usuario {user.id} autenticado com sucesso.")
         return user
 
-    def usuario_por_id(self, user_id: int) -> Usuario | None:
+    async def usuario_por_id(self, user_id: int) -> Usuario | None:
         """
         Recupera um usuário pelo seu ID numérico.
 
@@ -226,4 +225,4 @@ class UsusarioDomain:
         :return: Objeto Usuario correspondente ou None se não encontrado.
         """
         self.logger.debug(f"Recuperando usuario por ID: {user_id}")
-        return self.usuario_dto.usuario_por_id(user_id)
+        return await self.usuario_dto.usuario_por_id(user_id)
@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.domain.favorito_domain import FavoritoDomain
+from app.api.domain.importacao_domain import ImportacaoClientesDomain
+from app.api.schemas.favorito_schemas import FavoritosStatsResponse
+from app.api.schemas.importacao_schemas import ImportacaoResultado
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db, rotear_leituras
+from app.core.logger import logger
+from app.core.security import pegar_admin_atual
+from app.util.cursor import codificar_cursor_id, id_do_cursor
+
+FORMATOS_IMPORTACAO = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+}
+
+TIPOS_EXPORTACAO = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin (Admin-only)"],
+    dependencies=[Depends(pegar_admin_atual)],
+    responses={
+        403: {"description": "Acesso negado. Apenas administradores."},
+    },
+)
+
+
+@router.post("/clientes/importar", response_model=ImportacaoResultado,
+             openapi_extra={"requestBody": {"content": {
+                 "text/csv": {"schema": {"type": "string"}},
+                 "application/x-ndjson": {"schema": {"type": "string"}}}}})
+async def importar_clientes(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Importa clientes em massa a partir de um CSV ou NDJSON enviado no corpo.
+
+    O formato vem do `Content-Type`: `text/csv` (cabeçalho com as colunas
+    `nome,email,password`) ou `application/x-ndjson` (um objeto JSON com os
+    mesmos campos por linha). O corpo é lido em streaming e gravado em lotes
+    via COPY; cada cliente recebe um usuário com perfil 'cliente'.
+
+    - request: Requisição com o arquivo no corpo.
+
+    - return: Total de linhas, quantidade importada e erros por linha.
+    """
+    tipo = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    formato = FORMATOS_IMPORTACAO.get(tipo)
+    if formato is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Envie o arquivo como text/csv ou application/x-ndjson.")
+
+    logger.info(f"Administrador iniciando importacao de clientes ({formato}).")
+    importacao_domain = ImportacaoClientesDomain(db)
+    return await importacao_domain.importar(request.stream(), formato)
+
+
+@router.get("/favoritos/exportar", response_class=StreamingResponse,
+            responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+            dependencies=[Depends(rotear_leituras("leitura"))])
+async def exportar_favoritos(
+        formato: Literal["ndjson", "csv"] = "ndjson",
+        cliente_id_min: Optional[int] = Query(None, ge=1),
+        cliente_id_max: Optional[int] = Query(None, ge=1),
+        desde: Optional[datetime] = Query(
+            None, description="Criados a partir desta data (inclusiva)"),
+        ate: Optional[datetime] = Query(
+            None, description="Criados antes desta data (exclusiva)")):
+    """
+    Exporta os favoritos em NDJSON ou CSV, em streaming.
+
+    As linhas são lidas com um cursor no servidor e enviadas lote a lote, sem
+    carregar a exportação inteira em memória. A sessão com o banco é aberta
+    somente quando o envio começa e devolvida ao pool assim que termina (ou
+    quando o cliente desconecta). Com réplica configurada, a leitura é feita nela.
+
+    - formato: 'ndjson' (padrão) ou 'csv'.
+    - cliente_id_min / cliente_id_max: Faixa de IDs de cliente (inclusiva).
+    - desde / ate: Faixa de data de criação dos favoritos.
+
+    - return: Arquivo com os favoritos, ordenados por ID.
+    """
+    logger.info(f"Administrador exportando favoritos ({formato}).")
+
+    async def gerar():
+        async with SessionLocal() as db:
+            favorito_domain = FavoritoDomain(db)
+            async for pedaco in favorito_domain.exportar_favoritos(
+                    formato, cliente_id_min, cliente_id_max, desde, ate):
+                yield pedaco
+
+    return StreamingResponse(
+        gerar(), media_type=TIPOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="favoritos.{formato}"'})
+
+
+@router.get("/favoritos/stats", response_model=List[FavoritosStatsResponse])
+async def listar_estatisticas_favoritos(
+        response: Response,
+        limit: int = Query(settings.CLIENTES_PAGINA_PADRAO, ge=1,
+                           le=settings.CLIENTES_PAGINA_MAX),
+        cursor: Optional[str] = Query(
+            None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+        db: AsyncSession = Depends(get_db)):
+    """
+    Lista as estatísticas de favoritos de todos os clientes, paginadas por cursor.
+
+    Cada cliente custa uma linha da tabela 'cliente_favoritos_stats' (mantida
+    por triggers), sem percorrer os favoritos. Clientes sem favoritos aparecem
+    zerados. Quando houver mais, o cursor da próxima página vem no cabeçalho
+    `X-Next-Cursor`.
+
+    - limit: Quantidade máxima de clientes na página.
+    - cursor: Cursor opaco da próxima página.
+
+    - return: Estatísticas por cliente, ordenadas por ID do cliente.
+    """
+    logger.info("Administrador listando estatisticas de favoritos.")
+    apos = id_do_cursor(cursor)
+    favorito_domain = FavoritoDomain(db)
+    estatisticas, proximo = await favorito_domain.listar_estatisticas_favoritos(
+        limite=limit, apos=apos)
+    if proximo is not None:
+        response.headers["X-Next-Cursor"] = codificar_cursor_id(proximo)
+    return estatisticas
@@ -1,7 +1,7 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.domain.usuario_domain import UsusarioDomain
 from app.api.schemas.auth_schemas import LoginRequest, Token
@@ -27,7 +27,7 @@ router = APIRouter(
 @router.post("/registrar", response_model=UsuarioResponse,
              status_code=status.HTTP_201_CREATED)
 async def registrar_usuario(
-        user_in: UsuarioCreate, db: Session = Depends(get_db)):
+        user_in: UsuarioCreate, db: AsyncSession = Depends(get_db)):
     """
     Registra um novo usuário via auto-serviço (público).
     Apenas para clintes e não para administradores.
@@ -54,7 +54,7 @@ async def registrar_usuario(
              status_code=status.HTTP_201_CREATED,
              dependencies=[Depends(pegar_admin_atual)])
 async def registrar_usuario_por_admin(
-        user_in: UsuarioAdminCreate, db: Session = Depends(get_db)
+        user_in: UsuarioAdminCreate, db: AsyncSession = Depends(get_db)
 ):
     """
     Cria um novo usuário (cliente ou admin) por um administrador.
@@ -76,7 +76,7 @@ async def registrar_usuario_por_admin(
 
 @router.post("/logar", response_model=Token)
 async def logar(
-        request_data: LoginRequest, db: Session = Depends(get_db)):
+        request_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     """
     Autentica um usuário com e-mail e senha, retornando um JWT de acesso.
 
@@ -87,7 +87,7 @@ async def logar(
     """
     logger.info(f"Tentativa de login do usuario: {request_data.email}")
     ususario_domain = UsusarioDomain(db)
-    usuario_db = ususario_domain.autenticar_usuario(
+    usuario_db = await ususario_domain.autenticar_usuario(
         request_data.email, request_data.password)
     if not usuario_db:
         logger.warning(f"Falha de login para o usuario: {request_data.email}")
@@ -140,7 +140,7 @@ async def google_login(request: Request):
 
 
 @router.get("/google/callback", response_model=Token)
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Manipula o retorno do login Google OAuth 2.0.
 
@@ -1,14 +1,21 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.domain.cliente_domain import ClienteDomain
 from app.api.schemas.cliente_schemas import (
     ClienteUpdate, ClienteResponse, ClienteCreateWithPassword)
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
 from app.core.logger import logger
 from app.core.security import pegar_admin_atual
+from app.util.cursor import codificar_cursor_posicao, posicao_do_cursor
+from app.util.resposta import resposta_json
+
+LISTA_CLIENTES = TypeAdapter(List[ClienteResponse])
 
 router = APIRouter(
     prefix="/clientes",
@@ -24,7 +31,7 @@ router = APIRouter(
 @router.post("/", response_model=ClienteResponse,
              status_code=status.HTTP_201_CREATED)
 async def registrar_cliente(cliente_data: ClienteCreateWithPassword,
-                            db: Session = Depends(get_db)):
+                            db: AsyncSession = Depends(get_db)):
     """
     Cria um novo cliente e um usuário de login associado para ele.
 
@@ -38,29 +45,41 @@ async def registrar_cliente(cliente_data: ClienteCreateWithPassword,
                 f"{cliente_data.email}")
     cliente_domain = ClienteDomain(db)
 
-    return cliente_domain.registrar_cliente(cliente_data)
+    return await cliente_domain.registrar_cliente(cliente_data)
 
 
 @router.get("/", response_model=List[ClienteResponse])
-def listar_todos_clientes(a_partir: int = 0, limite: int = 100,
-                          db: Session = Depends(get_db)):
+async def listar_todos_clientes(
+        limit: int = Query(settings.CLIENTES_PAGINA_PADRAO, ge=1,
+                           le=settings.CLIENTES_PAGINA_MAX),
+        cursor: Optional[str] = Query(
+            None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+        db: AsyncSession = Depends(get_db)):
     """
-    Lista todos os clientes, com paginação opcional.
+    Lista os clientes, paginados por cursor e ordenados por data de criação.
+
+    Quando houver mais clientes, o cursor da próxima página é retornado no
+    cabeçalho `X-Next-Cursor`.
 
-    - a_partir: Índice inicial para a listagem.
-    - limite: Quantidade máxima de clientes a retornar.
+    - limit: Quantidade máxima de clientes a retornar.
+    - cursor: Cursor opaco da próxima página.
 
     - return: Lista de objetos Cliente.
     """
-    logger.info(f"Administrador solicitando todos os clientes "
-                f"(a_partir={a_partir}, limit={limite}).")
+    logger.info(f"Administrador solicitando clientes (limit={limit}).")
+    apos = posicao_do_cursor(cursor)
     cliente_domain = ClienteDomain(db)
-    clientes = cliente_domain.todos_clientes(a_partir=a_partir, limite=limite)
-    return clientes
+    clientes, proximo = await cliente_domain.todos_clientes(
+        limite=limit, apos=apos)
+    headers = {}
+    if proximo is not None:
+        headers["X-Next-Cursor"] = codificar_cursor_posicao(*proximo)
+    return resposta_json(LISTA_CLIENTES, clientes, headers)
 
 
 @router.get("/{cliente_id}", response_model=ClienteResponse)
-def ler_cliente_por_id(cliente_id: int, db: Session = Depends(get_db)):
+async def ler_cliente_por_id(cliente_id: int,
+                             db: AsyncSession = Depends(get_db)):
     """
     Retorna os dados do cliente correspondente ao ID informado.
 
@@ -71,7 +90,7 @@ def ler_cliente_por_id(cliente_id: int, db: Session = Depends(get_db)):
     logger.info(f"Administrador solicitando detalhes do "
                 f"cliente para ID: {cliente_id}.")
     cliente_domain = ClienteDomain(db)
-    db_client = cliente_domain.cliente_por_id(cliente_id=cliente_id)
+    db_client = await cliente_domain.cliente_por_id(cliente_id=cliente_id)
     if db_client is None:
         logger.warning(f"Admin requested client ID {cliente_id} not found.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
@@ -80,8 +99,8 @@ def ler_cliente_por_id(cliente_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{cliente_id}", response_model=ClienteResponse)
-def atualizar_cliente(cliente_id: int, cliente_update: ClienteUpdate,
-                      db: Session = Depends(get_db)):
+async def atualizar_cliente(cliente_id: int, cliente_update: ClienteUpdate,
+                            db: AsyncSession = Depends(get_db)):
     """
     Atualiza os dados do cliente identificado pelo ID.
 
@@ -92,7 +111,8 @@ def atualizar_cliente(cliente_id: int, cliente_update: ClienteUpdate,
     """
     logger.info(f"Administrador atualizando ID do cliente: {cliente_id}.")
     cliente_domain = ClienteDomain(db)
-    db_cliente = cliente_domain.atualizar_cliente(cliente_id, cliente_update)
+    db_cliente = await cliente_domain.atualizar_cliente(
+        cliente_id, cliente_update)
     if db_cliente is None:
         logger.warning(f"O administrador tentou atualizar um ID de "
                        f"cliente inexistente: {cliente_id}.")
@@ -101,21 +121,36 @@ def atualizar_cliente(cliente_id: int, cliente_update: ClienteUpdate,
     return db_cliente
 
 
-@router.delete("/{cliente_id}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_cliente(cliente_id: int, db: Session = Depends(get_db)):
+async def _excluir_cliente_em_segundo_plano(cliente_id: int) -> None:
+    # Roda depois da resposta, com a própria sessão (a da requisição já foi fechada).
+    async with SessionLocal() as db:
+        await ClienteDomain(db).excluir_cliente_em_lotes(cliente_id)
+
+
+@router.delete("/{cliente_id}", status_code=status.HTTP_204_NO_CONTENT,
+               responses={202: {"description": "Exclusão agendada em segundo plano."}})
+async def deletar_cliente(cliente_id: int, background_tasks: BackgroundTasks,
+                          db: AsyncSession = Depends(get_db)):
     """
-    Remove o cliente identificado pelo ID.
+    Remove o cliente identificado pelo ID, com o usuário e os favoritos dele.
+
+    Clientes com muitos favoritos (acima de `CLIENTE_EXCLUSAO_LIMITE_SINCRONO`)
+    são excluídos em segundo plano, em lotes; nesse caso a resposta é 202.
 
     - cliente_id: ID do cliente a ser removido.
 
-    - return: Mensagem de confirmação da remoção.
+    - return: 204 se removido, 202 se a exclusão foi agendada.
     """
     logger.info(f"Administrador excluindo ID do cliente: {cliente_id}.")
     cliente_domain = ClienteDomain(db)
-    success = cliente_domain.deletar_cliente(cliente_id)
-    if not success:
+    resultado = await cliente_domain.deletar_cliente(cliente_id)
+    if resultado is None:
         logger.warning(f"O administrador tentou excluir um "
                        f"ID de cliente inexistente: {cliente_id}.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="Cliente não encontrado.")
-    return {"message": "Cliente removido com sucesso."}
+    if resultado == "agendado":
+        background_tasks.add_task(_excluir_cliente_em_segundo_plano, cliente_id)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED,
+                            content={"message": "Exclusão do cliente agendada."})
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 from app.core.database import get_db
 from app.core.security import pegar_usuario_atual
-from app.api.schemas.favorito_schemas import FavoritoCreate, FavoritoResponse
+from app.api.schemas.favorito_schemas import (FavoritoCreate, FavoritoLoteCreate,
+                                             FavoritoLoteItem, FavoritoResponse,
+                                             FavoritosStatsResponse)
 from app.db.models.usuario_model import Usuario
 from app.api.domain.favorito_domain import FavoritoDomain
+from app.core.config import settings
 from app.core.logger import logger
+from app.util.cursor import (codificar_cursor, codificar_cursor_posicao,
+                             deslocamento_do_cursor, posicao_do_cursor)
+from app.util.etag import gerar_etag, resposta_nao_modificada
 from app.util.metrics import FAVORITES_ADDED_TOTAL
+from app.util.resposta import resposta_json, resposta_json_pronta
+
+CACHE_CONTROL_FAVORITOS = "private, no-cache"
+
+LISTA_FAVORITOS = TypeAdapter(List[FavoritoResponse])
 
 router = APIRouter(
     prefix="/clientes/{cliente_id}/favoritos",
@@ -26,7 +38,7 @@ router = APIRouter(
 async def criar_favorito(
         cliente_id: int,
         favorito_data: FavoritoCreate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         usuario_atual: Usuario = Depends(pegar_usuario_atual)
 ):
     """
@@ -57,18 +69,76 @@ async def criar_favorito(
     return novo_favorito
 
 
+@router.post("/bulk", response_model=List[FavoritoLoteItem])
+async def criar_favoritos_em_lote(
+        cliente_id: int,
+        lote: FavoritoLoteCreate,
+        db: AsyncSession = Depends(get_db),
+        usuario_atual: Usuario = Depends(pegar_usuario_atual)
+):
+    """
+    Adiciona vários favoritos à lista do cliente em uma única requisição.
+
+    Os detalhes dos produtos são resolvidos em lote e os favoritos gravados com
+    um único INSERT multi-linha. A resposta traz um item por produto: `status`
+    201 com o `favorito` criado, 409 se o produto já era favorito, ou o status
+    e o `erro` do produto (ex: 404 se não existir na Fake Store API).
+
+    - cliente_id: ID do cliente para quem serão adicionados os favoritos.
+    - lote: IDs dos produtos a favoritar.
+    - db: Sessão ativa com o banco de dados.
+    - usuario_atual: Usuário autenticado fazendo a requisição.
+
+    - return: Lista com o resultado de cada produto.
+    """
+    logger.info(f"Usuario {usuario_atual.id} adicionando {len(lote.produto_ids)} "
+                f"favoritos em lote para o ID do cliente {cliente_id}.")
+    if (usuario_atual.perfil == "cliente" and
+            usuario_atual.cliente_id != cliente_id):
+        logger.warning(f"O cliente {usuario_atual.id} tentou adicionar "
+                       f"favoritos para outro cliente {cliente_id}.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Clientes só podem adicionar favoritos à sua própria lista."
+        )
+
+    favorito_domain = FavoritoDomain(db)
+    resultado = await favorito_domain.adicionar_favoritos_em_lote(
+        cliente_id, lote.produto_ids)
+    criados = sum(1 for item in resultado
+                  if item["status"] == status.HTTP_201_CREATED)
+    if criados:
+        FAVORITES_ADDED_TOTAL.inc(criados)
+    return resultado
+
+
 @router.get("/", response_model=List[FavoritoResponse])
-def ler_favoritos_por_cliente(
+async def ler_favoritos_por_cliente(
         cliente_id: int,
-        a_partir: int = 0,
-        db: Session = Depends(get_db),
+        request: Request,
+        limit: int = Query(settings.FAVORITOS_PAGINA_PADRAO, ge=1,
+                           le=settings.FAVORITOS_PAGINA_MAX),
+        cursor: Optional[str] = Query(
+            None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+        db: AsyncSession = Depends(get_db),
         usuario_atual: Usuario = Depends(pegar_usuario_atual)
 ):
     """
-    Retorna a lista de favoritos do cliente, com paginação opcional.
+    Retorna a lista de favoritos do cliente, paginada por cursor.
+
+    Os favoritos vêm ordenados por data de criação; quando houver mais, o
+    cursor da próxima página é retornado no cabeçalho `X-Next-Cursor`.
+
+    A resposta traz um ETag calculado a partir da versão da lista do cliente.
+    Se o cliente enviar `If-None-Match` com o ETag atual, a resposta é 304 e os
+    favoritos nem chegam a ser buscados no banco.
+
+    Com 'listagem' em `FAVORITOS_JSON_NO_BANCO`, o JSON é montado pelo Postgres
+    e repassado como veio.
 
     - cliente_id: ID do cliente cujos favoritos serão listados.
-    - a_partir: Índice inicial para paginação.
+    - limit: Quantidade máxima de favoritos na página.
+    - cursor: Cursor opaco da próxima página.
     - db: Sessão ativa com o banco de dados.
     - usuario_atual: Usuário autenticado fazendo a requisição.
 
@@ -84,16 +154,127 @@ def ler_favoritos_por_cliente(
             detail="Clientes só podem visualizar seus próprios favoritos."
         )
 
+    apos = posicao_do_cursor(cursor)
     favorito_domain = FavoritoDomain(db)
-    favoritos = favorito_domain.favoritos_por_cliente(cliente_id, a_partir=a_partir)
+    # versao_favoritos já responde 404 se o cliente não existir.
+    versao = await favorito_domain.versao_favoritos(cliente_id)
+    etag = gerar_etag("favoritos", cliente_id, versao, request.url.query)
+    nao_modificada = resposta_nao_modificada(request, etag, CACHE_CONTROL_FAVORITOS)
+    if nao_modificada is not None:
+        logger.debug(f"Favoritos do cliente {cliente_id} nao modificados (304).")
+        return nao_modificada
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL_FAVORITOS}
+    if "listagem" in settings.FAVORITOS_JSON_NO_BANCO:
+        corpo, proximo = await favorito_domain.favoritos_por_cliente_json(
+            cliente_id, limite=limit, apos=apos, cliente_existe=True)
+        if proximo is not None:
+            headers["X-Next-Cursor"] = codificar_cursor_posicao(*proximo)
+        return resposta_json_pronta(corpo, headers)
+
+    favoritos, proximo = await favorito_domain.favoritos_por_cliente(
+        cliente_id, limite=limit, apos=apos, cliente_existe=True)
+    if proximo is not None:
+        headers["X-Next-Cursor"] = codificar_cursor_posicao(*proximo)
+    return resposta_json(LISTA_FAVORITOS, favoritos, headers)
+
+
+@router.get("/search", response_model=List[FavoritoResponse])
+async def buscar_favoritos_por_cliente(
+        cliente_id: int,
+        response: Response,
+        q: str = Query(..., min_length=1,
+                       description="Texto procurado no título e na review"),
+        limit: int = Query(settings.FAVORITOS_PAGINA_PADRAO, ge=1,
+                           le=settings.FAVORITOS_PAGINA_MAX),
+        cursor: Optional[str] = Query(
+            None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+        db: AsyncSession = Depends(get_db),
+        usuario_atual: Usuario = Depends(pegar_usuario_atual)
+):
+    """
+    Busca favoritos do cliente por texto, ordenados por relevância.
+
+    A busca é feita no banco, sobre a coluna `busca` (tsvector com índice GIN)
+    gerada a partir do título e da review. Aceita a sintaxe de busca web do
+    Postgres (aspas para frases, `or` e `-termo`). Quando houver mais
+    resultados, o cursor da próxima página é retornado no cabeçalho `X-Next-Cursor`.
+    Com 'busca' em `FAVORITOS_JSON_NO_BANCO`, o JSON é montado pelo Postgres e
+    repassado como veio.
+
+    - cliente_id: ID do cliente cujos favoritos serão buscados.
+    - q: Texto da busca.
+    - limit: Quantidade máxima de favoritos na página.
+    - cursor: Cursor opaco da próxima página.
+    - db: Sessão ativa com o banco de dados.
+    - usuario_atual: Usuário autenticado fazendo a requisição.
+
+    - return: Lista de favoritos encontrados.
+    """
+    logger.info(f"Usuario {usuario_atual.id} buscando favoritos do "
+                f"ID do cliente {cliente_id}.")
+    if usuario_atual.perfil == "cliente" and usuario_atual.cliente_id != cliente_id:
+        logger.warning(f"O cliente {usuario_atual.id} tentou buscar nos "
+                       f"favoritos de outro cliente {cliente_id}.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Clientes só podem visualizar seus próprios favoritos."
+        )
+
+    deslocamento = deslocamento_do_cursor(cursor)
+    favorito_domain = FavoritoDomain(db)
+    if "busca" in settings.FAVORITOS_JSON_NO_BANCO:
+        corpo, proximo = await favorito_domain.buscar_favoritos_json(
+            cliente_id, q, limite=limit, deslocamento=deslocamento)
+        headers = {}
+        if proximo is not None:
+            headers["X-Next-Cursor"] = codificar_cursor({"o": proximo})
+        return resposta_json_pronta(corpo, headers)
+
+    favoritos, proximo = await favorito_domain.buscar_favoritos(
+        cliente_id, q, limite=limit, deslocamento=deslocamento)
+    if proximo is not None:
+        response.headers["X-Next-Cursor"] = codificar_cursor({"o": proximo})
     return favoritos
 
 
+@router.get("/stats", response_model=FavoritosStatsResponse)
+async def estatisticas_favoritos_por_cliente(
+        cliente_id: int,
+        db: AsyncSession = Depends(get_db),
+        usuario_atual: Usuario = Depends(pegar_usuario_atual)
+):
+    """
+    Retorna as estatísticas dos favoritos do cliente.
+
+    Quantidade de favoritos, valor total da lista e data da última inclusão
+    ou remoção, lidos de uma única linha mantida pelo banco.
+
+    - cliente_id: ID do cliente.
+    - db: Sessão ativa com o banco de dados.
+    - usuario_atual: Usuário autenticado fazendo a requisição.
+
+    - return: Estatísticas dos favoritos do cliente.
+    """
+    logger.info(f"Usuario {usuario_atual.id} solicitando estatisticas dos "
+                f"favoritos do ID do cliente {cliente_id}.")
+    if usuario_atual.perfil == "cliente" and usuario_atual.cliente_id != cliente_id:
+        logger.warning(f"O cliente {usuario_atual.id} tentou visualizar as "
+                       f"estatisticas de outro cliente {cliente_id}.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Clientes só podem visualizar seus próprios favoritos."
+        )
+
+    favorito_domain = FavoritoDomain(db)
+    return await favorito_domain.estatisticas_favoritos(cliente_id)
+
+
 @router.get("/{favorito_id}", response_model=FavoritoResponse)
-def ler_favorito_id(
+async def ler_favorito_id(
         cliente_id: int,
         favorito_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         usuario_atual: Usuario = Depends(pegar_usuario_atual)
 ):
     """
@@ -119,7 +300,7 @@ def ler_favorito_id(
         )
 
     favorito_domain = FavoritoDomain(db)
-    favorito = favorito_domain.favorito_por_id(cliente_id, favorito_id)
+    favorito = await favorito_domain.favorito_por_id(cliente_id, favorito_id)
     if favorito is None:
         logger.warning(f"Favorito {favorito_id} nao encontrado ou "
                        f"não pertence ao cliente {cliente_id}.")
@@ -130,10 +311,10 @@ def ler_favorito_id(
 
 
 @router.delete("/{favorito_id}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_favorito_por_cliente(
+async def deletar_favorito_por_cliente(
         cliente_id: int,
         favorito_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         usuario_atual: Usuario = Depends(pegar_usuario_atual)
 ):
     """
@@ -158,7 +339,7 @@ def deletar_favorito_por_cliente(
         )
 
     favorito_domain = FavoritoDomain(db)
-    success = favorito_domain.remove_favorito(cliente_id, favorito_id)
+    success = await favorito_domain.remove_favorito(cliente_id, favorito_id)
     if not success:
         logger.warning(f"Falha na exclusao: Favorito {favorito_id} nao "
                        f"encontrado ou nao pertence ao cliente {cliente_id}.")
@@ -1,10 +1,14 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.api.schemas.produto_schemas import ProdutoLoteRequest, ProdutoLoteItem
+from app.core.config import settings
 from app.core.logger import logger
 from app.core.security import pegar_usuario_atual
 from app.services.product_service import ProdutoService
+from app.util.cursor import codificar_cursor, deslocamento_do_cursor
+from app.util.etag import gerar_etag, resposta_nao_modificada
 
 router = APIRouter(
     prefix="/produtos",
@@ -18,19 +22,148 @@ router = APIRouter(
 )
 
 
+def _converter_ids(ids: str) -> List[int]:
+    """
+    Converte o parâmetro `ids` ("1,2,3") em uma lista de inteiros.
+
+    :raises HTTPException: 422 se algum ID for inválido ou o limite for excedido.
+    """
+    try:
+        produto_ids = [int(produto_id) for produto_id in ids.split(",")
+                       if produto_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O parâmetro 'ids' deve conter IDs inteiros separados por vírgula."
+        )
+    if not produto_ids or len(produto_ids) > settings.PRODUTOS_LOTE_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Informe entre 1 e {settings.PRODUTOS_LOTE_MAX_IDS} IDs."
+        )
+    return produto_ids
+
+
 @router.get("/", response_model=List[Dict[str, Any]])
 async def listar_produtos(
+        request: Request,
+        response: Response,
+        ids: Optional[str] = Query(
+            None, description="IDs separados por vírgula para consulta em lote (ex: 1,2,3)"),
+        limit: int = Query(settings.PRODUTOS_PAGINA_PADRAO, ge=1,
+                           le=settings.PRODUTOS_PAGINA_MAX),
+        cursor: Optional[str] = Query(
+            None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+        category: Optional[str] = None,
+        min_price: Optional[float] = Query(None, ge=0),
+        max_price: Optional[float] = Query(None, ge=0),
+        sort: Optional[Literal["price", "title"]] = None,
+        q: Optional[str] = Query(None, min_length=1,
+                                 description="Termos no título ou na descrição"),
         produto_service: ProdutoService = Depends(ProdutoService)
 ):
     """
-    Retorna a lista de produtos disponíveis.
+    Retorna a lista paginada de produtos disponíveis.
+
+    Filtros, ordenação e paginação são respondidos a partir de um índice em
+    memória sobre o catálogo em cache. Quando houver mais produtos, o cursor da
+    próxima página é retornado no cabeçalho `X-Next-Cursor`.
+
+    A resposta traz um ETag calculado a partir da versão do snapshot do catálogo;
+    com `If-None-Match` igual ao ETag atual, a resposta é 304 sem corpo.
 
+    Quando `ids` é informado, retorna apenas esses produtos, com um resultado
+    por ID (`produto` ou `erro`), no mesmo formato de `POST /produtos/lote`.
+
+    - ids: IDs separados por vírgula (opcional).
+    - limit: Quantidade máxima de produtos na página.
+    - cursor: Cursor opaco da próxima página.
+    - category: Filtra por categoria.
+    - min_price / max_price: Faixa de preço (inclusiva).
+    - sort: Ordenação por `price` ou `title`.
+    - q: Termos procurados no título ou na descrição.
     - produto_service: Serviço que realiza a chamada à API externa de produtos.
 
     - return: Lista de dicionários contendo informações dos produtos.
     """
-    logger.info(f"Solicitacao para listar produtos")
-    return await produto_service.pegar_produtos_api()
+    if ids is not None:
+        produto_ids = _converter_ids(ids)
+        logger.info(f"Solicitacao para obter {len(produto_ids)} produtos em lote.")
+        return await produto_service.pegar_produtos_por_ids(produto_ids)
+
+    deslocamento = deslocamento_do_cursor(cursor)
+    logger.info(f"Solicitacao para listar produtos (limit={limit}, "
+                f"category={category}, sort={sort}).")
+    indice = await produto_service.pegar_indice_catalogo()
+    etag = gerar_etag("produtos", indice.versao, request.url.query)
+    cache_control = f"private, max-age={settings.PRODUTOS_CACHE_CONTROL_MAX_AGE}"
+    nao_modificada = resposta_nao_modificada(request, etag, cache_control)
+    if nao_modificada is not None:
+        return nao_modificada
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    produtos, proximo = indice.consultar(
+        limite=limit, deslocamento=deslocamento, categoria=category,
+        preco_min=min_price, preco_max=max_price, ordenacao=sort, texto=q)
+    if proximo is not None:
+        response.headers["X-Next-Cursor"] = codificar_cursor({"o": proximo})
+    return produtos
+
+
+@router.get("/search", response_model=List[Dict[str, Any]])
+async def buscar_produtos(
+        response: Response,
+        q: str = Query(..., min_length=1,
+                       description="Termos procurados no título ou na descrição"),
+        limit: int = Query(settings.PRODUTOS_PAGINA_PADRAO, ge=1,
+                           le=settings.PRODUTOS_PAGINA_MAX),
+        cursor: Optional[str] = Query(
+            None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+        produto_service: ProdutoService = Depends(ProdutoService)
+):
+    """
+    Busca produtos por texto, ordenados por relevância.
+
+    A busca usa o índice invertido montado sobre o snapshot do catálogo em cache.
+    Cada termo casa por prefixo, e todos os termos precisam aparecer no produto;
+    ocorrências no título pesam mais que na descrição. Quando houver mais
+    resultados, o cursor da próxima página é retornado no cabeçalho `X-Next-Cursor`.
+
+    - q: Termos da busca.
+    - limit: Quantidade máxima de produtos na página.
+    - cursor: Cursor opaco da próxima página.
+    - produto_service: Serviço que resolve o catálogo (cache, réplica local e API externa).
+
+    - return: Lista de produtos encontrados, do mais para o menos relevante.
+    """
+    deslocamento = deslocamento_do_cursor(cursor)
+    logger.info(f"Solicitacao para buscar produtos (q={q}, limit={limit}).")
+    indice = await produto_service.pegar_indice_catalogo()
+    produtos, proximo = indice.buscar(q, limite=limit, deslocamento=deslocamento)
+    if proximo is not None:
+        response.headers["X-Next-Cursor"] = codificar_cursor({"o": proximo})
+    return produtos
+
+
+@router.post("/lote", response_model=List[ProdutoLoteItem])
+async def produtos_em_lote(
+        lote: ProdutoLoteRequest,
+        produto_service: ProdutoService = Depends(ProdutoService)
+):
+    """
+    Retorna vários produtos em uma única requisição.
+
+    Variante de `GET /produtos?ids=` para listas longas. Cada ID tem seu próprio
+    resultado, então IDs inexistentes não fazem a requisição inteira falhar.
+
+    - ids: Lista de IDs dos produtos.
+    - produto_service: Serviço que resolve os produtos (cache, réplica local e API externa).
+
+    - return: Lista com um item por ID contendo o produto ou o erro.
+    """
+    logger.info(f"Solicitacao para obter {len(lote.ids)} produtos em lote.")
+    return await produto_service.pegar_produtos_por_ids(lote.ids)
 
 
 @router.get("/{produto_id}", response_model=Dict[str, Any])
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, PositiveInt
+from typing import List, Optional
 from datetime import datetime
 
+from app.core.config import settings
+
 
 class FavoritoBase(BaseModel):
     """
@@ -33,3 +35,37 @@ class FavoritoResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class FavoritoLoteCreate(BaseModel):
+    """
+    Schema para adicionar vários favoritos em uma única requisição.
+    """
+    produto_ids: List[PositiveInt] = Field(
+        ..., min_length=1, max_length=settings.PRODUTOS_LOTE_MAX_IDS,
+        description="IDs dos produtos da Fake Store API")
+
+
+class FavoritoLoteItem(BaseModel):
+    """
+    Schema para o resultado de um produto na criação em lote.
+    Traz o favorito criado (status 201), ou o status e a mensagem de erro
+    daquele produto (409 se já era favorito).
+    """
+    produto_id: int
+    status: int
+    favorito: Optional[FavoritoResponse] = None
+    erro: Optional[str] = None
+
+
+class FavoritosStatsResponse(BaseModel):
+    """
+    Schema para as estatísticas dos favoritos de um cliente.
+    """
+    cliente_id: int
+    quantidade: int
+    valor_total: float
+    ultima_atividade: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class ImportacaoErro(BaseModel):
+    """
+    Schema para uma linha rejeitada na importação em massa.
+    """
+    linha: int
+    email: Optional[str] = None
+    erro: str
+
+
+class ImportacaoResultado(BaseModel):
+    """
+    Schema para o resumo da importação em massa de clientes.
+    `erros` traz no máximo IMPORTACAO_MAX_ERROS linhas; as demais são contadas
+    em `erros_omitidos`.
+    """
+    total: int
+    importados: int
+    erros: List[ImportacaoErro]
+    erros_omitidos: int = 0
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+
+class ProdutoLoteRequest(BaseModel):
+    """
+    Schema para consulta de vários produtos em uma única requisição.
+    """
+    ids: List[int] = Field(..., min_length=1, max_length=settings.PRODUTOS_LOTE_MAX_IDS,
+                           description="IDs dos produtos da Fake Store API")
+
+
+class ProdutoLoteItem(BaseModel):
+    """
+    Schema para o resultado de um produto na consulta em lote.
+    Traz o produto quando encontrado, ou o status e a mensagem de erro daquele ID.
+    """
+    id: int
+    status: int
+    produto: Optional[Dict[str, Any]] = None
+    erro: Optional[str] = None
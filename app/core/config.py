@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional, Set
 
 
 class Settings(BaseSettings):
@@ -9,9 +9,91 @@ class Settings(BaseSettings):
     # Configurações do Banco de Dados
     DATABASE_URL: str = "postgresql+psycopg2://postgres:postgres@db:5432/aiqfome_db"
 
+    # Pool de conexões com o banco (por processo/worker do uvicorn)
+    DB_POOL_TAMANHO: int = 10
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SEGUNDOS: float = 5.0
+    DB_POOL_RECICLAR_SEGUNDOS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Prepared statements guardados por conexão pelo asyncpg (0 desliga, ex.: PgBouncer
+    # em modo transaction) e SQL compilado guardado pelo SQLAlchemy por engine
+    DB_CACHE_PREPARED_STATEMENTS: int = 500
+    DB_CACHE_CONSULTAS_COMPILADAS: int = 1000
+
+    # Réplica de leitura (opcional). Sem ela todas as consultas vão ao primário.
+    DATABASE_READ_URL: Optional[str] = None
+    # Depois de uma escrita, as leituras do mesmo cliente HTTP ficam no primário
+    # por este tempo (cookie), cobrindo o atraso de replicação
+    DB_LEITURA_JANELA_PRIMARIO_SEGUNDOS: int = 5
+
     # URL da Fake Store API
     FAKE_STORE_API_BASE_URL: str = "https://fakestoreapi.com"
 
+    # Cliente HTTP compartilhado para a API externa (pool de conexões)
+    HTTP_POOL_MAX_CONEXOES: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRACAO: float = 30.0
+    HTTP_TIMEOUT_CONEXAO: float = 3.0
+    HTTP_TIMEOUT_LEITURA: float = 10.0
+    HTTP_TIMEOUT_ESCRITA: float = 5.0
+    HTTP_TIMEOUT_POOL: float = 2.0
+    HTTP2_HABILITADO: bool = True
+    HTTP_AQUECER_CONEXOES: bool = True
+
+    # Novas tentativas e circuit breaker da API externa
+    HTTP_RETRY_TENTATIVAS: int = 2
+    HTTP_RETRY_BACKOFF_BASE: float = 0.1
+    HTTP_RETRY_BACKOFF_MAX: float = 1.0
+    CIRCUITO_LIMITE_FALHAS: int = 5
+    CIRCUITO_TEMPO_ABERTO_SEGUNDOS: float = 30.0
+
+    # Cache em memória do catálogo de produtos
+    PRODUTOS_CACHE_TTL_SEGUNDOS: float = 300.0
+    PRODUTOS_CACHE_STALE_SEGUNDOS: float = 600.0
+    PRODUTOS_CACHE_MAX_ITENS: int = 1000
+
+    # Paginação do catálogo de produtos
+    PRODUTOS_PAGINA_PADRAO: int = 50
+    PRODUTOS_PAGINA_MAX: int = 200
+    PRODUTOS_CACHE_CONTROL_MAX_AGE: int = 60
+
+    # Paginação da listagem de clientes
+    CLIENTES_PAGINA_PADRAO: int = 100
+    CLIENTES_PAGINA_MAX: int = 500
+
+    # Paginação da listagem e da busca de favoritos
+    FAVORITOS_PAGINA_PADRAO: int = 50
+    FAVORITOS_PAGINA_MAX: int = 200
+    # Endpoints de favoritos cujo JSON é montado pelo Postgres (string_agg) e
+    # repassado sem objetos Python, ex.: '["listagem", "busca"]'
+    FAVORITOS_JSON_NO_BANCO: Set[Literal["listagem", "busca"]] = set()
+
+    # Consulta de produtos em lote
+    PRODUTOS_LOTE_MAX_IDS: int = 100
+    PRODUTOS_LOTE_CONCORRENCIA: int = 10
+
+    # Sincronização da réplica local do catálogo (0 desabilita)
+    PRODUTOS_SYNC_INTERVALO_SEGUNDOS: float = 900.0
+    # Produtos por comando INSERT ... ON CONFLICT na sincronização (9 parâmetros
+    # por produto; o Postgres aceita até 32767 por comando)
+    PRODUTOS_SYNC_TAMANHO_LOTE: int = 1000
+    # Produtos por comando UPDATE ao atualizar os dados copiados nos favoritos
+    FAVORITOS_REFRESH_TAMANHO_LOTE: int = 500
+
+    # Importação em massa de clientes (POST /admin/clientes/importar)
+    IMPORTACAO_TAMANHO_LOTE: int = 1000
+    IMPORTACAO_HASH_WORKERS: int = 4
+    IMPORTACAO_MAX_ERROS: int = 1000
+    IMPORTACAO_MAX_TAMANHO_LINHA: int = 64 * 1024
+
+    # Exportação de favoritos (linhas buscadas por vez no cursor do servidor)
+    EXPORTACAO_TAMANHO_LOTE: int = 2000
+
+    # Exclusão de clientes: acima deste número de favoritos a exclusão vai para
+    # segundo plano, removendo os favoritos em lotes antes do cliente
+    CLIENTE_EXCLUSAO_LIMITE_SINCRONO: int = 10000
+    CLIENTE_EXCLUSAO_TAMANHO_LOTE: int = 5000
+
     # Configurações JWT
     JWT_SECRET_KEY: str = "your_super_secret_jwt_key_please_change_this"
     JWT_ALGORITHM: str = "HS256"
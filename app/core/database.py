@@ -1,24 +1,246 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Literal, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession, async_sessionmaker,
+                                    create_async_engine)
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
 
 from app.core.config import settings
+from app.core.logger import logger
+from app.util.metrics import (DB_POOL_CONEXOES, DB_POOL_ESPERA_SEGUNDOS,
+                              DB_POOL_TIMEOUTS_TOTAL, DB_POOL_USO_SEGUNDOS,
+                              DB_ROTEAMENTO_TOTAL)
+
+# Opção de execução das consultas que podem ser atendidas pela réplica.
+LEITURA_REPLICA = {"replica": True}
+
+# Destino das leituras na requisição atual: None segue a marcação de cada
+# consulta; "principal" ou "leitura" forçam o banco para todas as leituras.
+_destino_leituras: ContextVar[Optional[str]] = ContextVar("destino_leituras", default=None)
+
+
+def url_assincrona(url: str) -> str:
+    """
+    Converte a URL do banco para o driver assíncrono (asyncpg).
+
+    Mantém compatibilidade com `DATABASE_URL` no formato antigo
+    (`postgresql://` ou `postgresql+psycopg2://`).
+
+    :param url: URL de conexão configurada.
+    :return: URL usando `postgresql+asyncpg`.
+    """
+    url_banco = make_url(url)
+    if url_banco.get_backend_name() == "postgresql":
+        url_banco = url_banco.set(drivername="postgresql+asyncpg")
+    return url_banco.render_as_string(hide_password=False)
+
+
+class PoolInstrumentado(AsyncAdaptedQueuePool):
+    """
+    Pool de conexões que mede o tempo de checkout e conta os timeouts.
+
+    Os eventos de pool do SQLAlchemy só disparam depois que a conexão já foi
+    entregue, então a espera na fila é medida em volta de `connect()`.
+    """
+    nome = "principal"
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS_TOTAL.labels(pool=self.nome).inc()
+            logger.warning(f"Timeout ao obter conexao do pool {self.nome} "
+                           f"({self.checkedout()} em uso).")
+            raise
+        finally:
+            DB_POOL_ESPERA_SEGUNDOS.labels(pool=self.nome).observe(
+                time.perf_counter() - inicio)
+
+    def recreate(self):
+        # `engine.dispose()` recria o pool; o nome precisa acompanhar.
+        novo = super().recreate()
+        novo.nome = self.nome
+        return novo
+
+
+def instrumentar_pool(engine: AsyncEngine, nome: str) -> None:
+    """
+    Registra os eventos e as métricas Prometheus do pool de um engine.
+
+    - Gauges de conexões em uso, ociosas e em overflow (lidas na coleta).
+    - Histograma do tempo em que cada conexão ficou emprestada (checkout -> checkin).
+
+    :param engine: Engine assíncrono cujo pool será observado.
+    :param nome: Nome do pool, usado como label nas métricas.
+    """
+    sync_engine = engine.sync_engine
+    sync_engine.pool.nome = nome
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_conexao, registro, proxy):
+        registro.info["checkout_em"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_conexao, registro):
+        checkout_em = registro.info.pop("checkout_em", None)
+        if checkout_em is not None:
+            DB_POOL_USO_SEGUNDOS.labels(pool=nome).observe(
+                time.perf_counter() - checkout_em)
+
+    DB_POOL_CONEXOES.labels(pool=nome, estado="em_uso").set_function(
+        lambda: sync_engine.pool.checkedout())
+    DB_POOL_CONEXOES.labels(pool=nome, estado="ociosas").set_function(
+        lambda: sync_engine.pool.checkedin())
+    DB_POOL_CONEXOES.labels(pool=nome, estado="overflow").set_function(
+        lambda: max(0, sync_engine.pool.overflow()))
+
+
+def criar_engine(url: str, nome: str = "principal") -> AsyncEngine:
+    """
+    Cria um engine assíncrono com o pool configurado em `Settings` e instrumentado.
+
+    Cada worker do uvicorn tem o próprio pool, então o total de conexões no
+    banco chega a `workers * (DB_POOL_TAMANHO + DB_POOL_MAX_OVERFLOW)`.
+
+    Com asyncpg cada consulta vira um prepared statement no servidor, reaproveitado
+    pela conexão enquanto estiver no cache (`DB_CACHE_PREPARED_STATEMENTS`).
+
+    :param url: URL de conexão com o banco.
+    :param nome: Nome do pool, usado como label nas métricas.
+    :return: Engine assíncrono do SQLAlchemy.
+    """
+    url_banco = url_assincrona(url)
+    connect_args = {}
+    if make_url(url_banco).get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = settings.DB_CACHE_PREPARED_STATEMENTS
+    engine = create_async_engine(
+        url_banco,
+        connect_args=connect_args,
+        query_cache_size=settings.DB_CACHE_CONSULTAS_COMPILADAS,
+        poolclass=PoolInstrumentado,
+        pool_size=settings.DB_POOL_TAMANHO,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SEGUNDOS,
+        pool_recycle=settings.DB_POOL_RECICLAR_SEGUNDOS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    instrumentar_pool(engine, nome)
+    return engine
 
-engine = create_engine(settings.DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def definir_destino_leituras(destino: Optional[Literal["principal", "leitura"]]) -> None:
+    """
+    Define para onde vão as leituras no contexto atual (requisição ou tarefa).
+
+    :param destino: 'principal', 'leitura' ou None para seguir a marcação das consultas.
+    """
+    _destino_leituras.set(destino)
+
+
+def rotear_leituras(destino: Literal["principal", "leitura"]):
+    """
+    Cria uma dependência FastAPI que força o banco das leituras de uma rota.
+
+    Ex.: `dependencies=[Depends(rotear_leituras("leitura"))]` manda todas as
+    leituras da rota para a réplica, marcadas ou não.
+
+    :param destino: 'principal' ou 'leitura'.
+    :return: Dependência assíncrona.
+    """
+    async def _rotear():
+        definir_destino_leituras(destino)
+    return _rotear
+
+
+class SessaoRoteada(Session):
+    """
+    Sessão que envia leituras para a réplica e todo o resto para o primário.
+
+    Vão para a réplica (`info["engine_leitura"]`) as consultas marcadas com
+    `LEITURA_REPLICA`, ou todas as leituras quando a rota força 'leitura'.
+    Escritas, flush e qualquer consulta depois de uma escrita na mesma sessão
+    (read-your-writes) ficam no primário.
+    """
+
+    def get_bind(self, mapper=None, clause=None, replica: bool = False, **kw):
+        engine_leitura = self.info.get("engine_leitura")
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["escreveu"] = True
+        elif engine_leitura is not None and not self.info.get("escreveu"):
+            destino = _destino_leituras.get()
+            if destino == "leitura" or (destino is None and replica):
+                DB_ROTEAMENTO_TOTAL.labels(destino="leitura").inc()
+                return engine_leitura
+        DB_ROTEAMENTO_TOTAL.labels(destino="principal").inc()
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
 
+@event.listens_for(SessaoRoteada, "do_orm_execute")
+def _marcar_replica(estado: ORMExecuteState) -> None:
+    # A marcação pode vir na consulta ou em `execution_options=` (ex.: `get`);
+    # o get_bind só recebe os bind_arguments.
+    if estado.execution_options.get("replica"):
+        estado.bind_arguments["replica"] = True
 
-def get_db():
+
+def criar_sessionmaker(engine_principal: AsyncEngine,
+                       engine_leitura: AsyncEngine | None = None) -> async_sessionmaker:
+    """
+    Cria a fábrica de sessões com roteamento entre primário e réplica.
+
+    :param engine_principal: Engine do banco primário.
+    :param engine_leitura: Engine da réplica de leitura, se houver.
+    :return: Fábrica de AsyncSession.
+    """
+    info = {"engine_leitura": engine_leitura.sync_engine} if engine_leitura else {}
+    return async_sessionmaker(
+        bind=engine_principal, sync_session_class=SessaoRoteada, info=info,
+        autoflush=False, expire_on_commit=False)
+
+
+engine = criar_engine(settings.DATABASE_URL)
+engine_leitura = (criar_engine(settings.DATABASE_READ_URL, nome="leitura")
+                  if settings.DATABASE_READ_URL else None)
+
+SessionLocal = criar_sessionmaker(engine, engine_leitura)
+
+
+async def get_db():
     """
     Responsavel pela sessão do banco de dados para uso em requisições FastAPI.
 
-    Esta função é utilizada como dependência para sessão (Session)
+    Esta função é utilizada como dependência para sessão (AsyncSession)
     nas rotas e serviços, garantindo que não fique presa no database.
+    As consultas não bloqueiam o event loop enquanto aguardam o banco.
+
+    :yield: Sessão assíncrona de banco de dados (SQLAlchemy AsyncSession).
+    """
+    async with SessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def unidade_de_trabalho(db: AsyncSession):
+    """
+    Agrupa as escritas de uma operação em uma única transação (unit of work).
+
+    Os DTOs apenas fazem `flush` (INSERT/UPDATE ... RETURNING devolve as colunas
+    geradas pelo banco); o commit acontece uma única vez na saída do bloco e
+    qualquer exceção desfaz tudo, sem gravações parciais.
 
-    :yield: Sessão de banco de dados (SQLAlchemy Session).
+    :param db: Sessão assíncrona da requisição.
+    :yield: A própria sessão.
     """
-    db = SessionLocal()
     try:
         yield db
-    finally:
-        db.close()
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
@@ -0,0 +1,127 @@
+import httpx
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.util.metrics import HTTP_POOL_CONEXOES, HTTP_POOL_AGUARDANDO
+
+try:
+    import h2  # noqa: F401
+    HTTP2_DISPONIVEL = True
+except ImportError:
+    HTTP2_DISPONIVEL = False
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def criar_http_client() -> httpx.AsyncClient:
+    """
+    Cria o cliente HTTP assíncrono usado nas chamadas à API externa.
+
+    O cliente mantém um pool de conexões keep-alive com limites configuráveis,
+    timeouts separados por fase (conexão, leitura, escrita e espera no pool)
+    e HTTP/2 quando o pacote `h2` estiver instalado.
+
+    :return: Instância de httpx.AsyncClient configurada.
+    """
+    limites = httpx.Limits(
+        max_connections=settings.HTTP_POOL_MAX_CONEXOES,
+        max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRACAO,
+    )
+    timeout = httpx.Timeout(
+        connect=settings.HTTP_TIMEOUT_CONEXAO,
+        read=settings.HTTP_TIMEOUT_LEITURA,
+        write=settings.HTTP_TIMEOUT_ESCRITA,
+        pool=settings.HTTP_TIMEOUT_POOL,
+    )
+    http2 = settings.HTTP2_HABILITADO and HTTP2_DISPONIVEL
+    if settings.HTTP2_HABILITADO and not HTTP2_DISPONIVEL:
+        logger.warning("Pacote 'h2' nao instalado. Cliente HTTP usando HTTP/1.1.")
+    return httpx.AsyncClient(limits=limites, timeout=timeout, http2=http2)
+
+
+def pegar_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP compartilhado da aplicação.
+
+    Normalmente o cliente é criado no startup da aplicação. Caso seja usado
+    fora do ciclo de vida do app (scripts, testes), é criado sob demanda.
+
+    :return: Instância compartilhada de httpx.AsyncClient.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = criar_http_client()
+    return _http_client
+
+
+def estatisticas_pool() -> dict:
+    """
+    Retorna as estatísticas atuais do pool de conexões do cliente HTTP.
+
+    O httpx não expõe o estado do pool: a leitura usa atributos internos do
+    httpx/httpcore (`_transport._pool`, `_requests`), validados nas versões
+    fixadas no requirements.txt. Se uma atualização mudar esses internos, as
+    métricas passam a zerar em vez de quebrar a coleta do Prometheus.
+
+    :return: Dicionário com conexões ativas, ociosas e requisições aguardando.
+    """
+    estatisticas = {"ativas": 0, "ociosas": 0, "aguardando": 0}
+    if _http_client is None or _http_client.is_closed:
+        return estatisticas
+
+    try:
+        pool = _http_client._transport._pool
+        ativas = ociosas = 0
+        for conexao in pool.connections:
+            if conexao.is_idle():
+                ociosas += 1
+            else:
+                ativas += 1
+        aguardando = sum(1 for requisicao in pool._requests if requisicao.is_queued())
+    except AttributeError:
+        logger.debug("Internos do pool do httpx indisponiveis. Metricas do pool zeradas.")
+        return estatisticas
+
+    estatisticas.update(ativas=ativas, ociosas=ociosas, aguardando=aguardando)
+    return estatisticas
+
+
+HTTP_POOL_CONEXOES.labels(estado="ativas").set_function(
+    lambda: estatisticas_pool()["ativas"])
+HTTP_POOL_CONEXOES.labels(estado="ociosas").set_function(
+    lambda: estatisticas_pool()["ociosas"])
+HTTP_POOL_AGUARDANDO.set_function(lambda: estatisticas_pool()["aguardando"])
+
+
+async def iniciar_http_client() -> None:
+    """
+    Cria o cliente HTTP compartilhado e aquece a conexão com a API externa.
+
+    O aquecimento abre a conexão (DNS, TCP e TLS) no startup, para que a
+    primeira requisição dos usuários não pague esse custo. Falhas no
+    aquecimento apenas geram log, sem impedir a subida da aplicação.
+    """
+    client = pegar_http_client()
+    logger.info(f"Cliente HTTP compartilhado criado (http2="
+                f"{settings.HTTP2_HABILITADO and HTTP2_DISPONIVEL}).")
+
+    if not settings.HTTP_AQUECER_CONEXOES:
+        return
+
+    try:
+        await client.head(settings.FAKE_STORE_API_BASE_URL)
+        logger.info("Conexao com a API externa aquecida com sucesso.")
+    except httpx.HTTPError as e:
+        logger.warning(f"Falha ao aquecer conexao com a API externa: {e}")
+
+
+async def fechar_http_client() -> None:
+    """
+    Fecha o cliente HTTP compartilhado, liberando as conexões do pool.
+    """
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.info("Cliente HTTP compartilhado encerrado.")
+    _http_client = None
@@ -4,7 +4,7 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials  # Usaremos HTTPBearer
 import jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
@@ -40,14 +40,14 @@ def criar_token_acesso(data: dict, expires_delta: Optional[timedelta] = None):
 
 async def pegar_usuario_atual(
         credenciais: HTTPAuthorizationCredentials = Depends(http_bearer_scheme),
-        db: Session = Depends(get_db)):
+        db: AsyncSession = Depends(get_db)):
     """
     Decodifica o token JWT e retorna o usuário autenticado.
 
     A função valida o token, extrai o ID do usuário e o busca no banco de dados.
 
     :param credenciais: Credenciais extraídas do header Authorization (Bearer token).
-    :param db: Sessão ativa do banco de dados.
+    :param db: Sessão assíncrona ativa do banco de dados.
     :return: Objeto Usuario autenticado.
     :raises HTTPException: 401 se o token for inválido, expirado ou o usuário não existir.
     """
@@ -84,7 +84,7 @@ async def pegar_usuario_atual(
 
     from app.db.dto.usuario_dto import UsuarioDTO
     user_dto = UsuarioDTO(db)
-    user = user_dto.usuario_por_id(usuario_id=token_data.usuario_id)
+    user = await user_dto.usuario_por_id(usuario_id=token_data.usuario_id)
 
     if user is None:
         raise excessao_credencial
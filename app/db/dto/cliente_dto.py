@@ -1,33 +1,67 @@
-from typing import Type
+from datetime import datetime
+from typing import List, Set, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (Column, Integer, MetaData, String, Table, bindparam, delete,
+                        exists, literal, select, tuple_, update)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
 
+from app.core.database import LEITURA_REPLICA
 from app.core.logger import logger
 from app.db.models.cliente_model import Cliente
+from app.db.models.usuario_model import Usuario
+
+# Consulta quente montada uma única vez: a cada chamada só o parâmetro muda e o
+# SQL compilado sai do cache do SQLAlchemy.
+_CLIENTE_POR_ID = (select(Cliente).where(Cliente.id == bindparam("cliente_id"))
+                   .execution_options(**LEITURA_REPLICA))
+
+# Colunas da resposta da listagem (ClienteResponse), lidas como linhas do Core.
+COLUNAS_RESPOSTA = (Cliente.id, Cliente.nome, Cliente.email,
+                    Cliente.created_at, Cliente.updated_at)
+
+# Tabela temporária que recebe cada lote da importação via COPY.
+importacao_clientes = Table(
+    "importacao_clientes", MetaData(),
+    Column("linha", Integer),
+    Column("nome", String),
+    Column("email", String),
+    Column("hashed_password", String),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
 
 
 class ClienteDTO:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Inicializa o DTO (Data Transfer Object) responsável pela manipulação
         direta de registros da tavela 'clientes' no banco de dados.
 
-        :param db: Sessão ativa do SQLAlchemy.
+        :param db: Sessão assíncrona ativa do SQLAlchemy.
         """
         self.db = db
         self.logger = logger
 
-    def pegar_por_id(self, cliente_id: int) -> Cliente | None:
+    async def pegar_por_id(self, cliente_id: int) -> Cliente | None:
         """
-        Recupera um cliente a partir do seu ID único.
+        Recupera um cliente a partir do seu ID único. Pode ser atendida pela réplica.
+
+        Usa a consulta pronta em vez de `db.get`: sem o identity map populado
+        (caso de toda requisição hoje) ela é mais barata, mas sempre vai ao
+        banco, mesmo que o cliente já esteja carregado na sessão. Um fluxo que
+        busque o mesmo ID mais de uma vez na sessão deve usar `db.get`
+        (ver benchmarks/consultas_dto.py).
 
         :param cliente_id: Identificador do cliente.
         :return: Objeto Cliente ou None se não encontrado.
         """
         self.logger.debug(f"Obtendo cliente por ID: {cliente_id}")
-        return self.db.query(Cliente).filter(Cliente.id == cliente_id).first()
+        return await self.db.scalar(_CLIENTE_POR_ID, {"cliente_id": cliente_id})
 
-    def pegar_por_email(self, email: str) -> Cliente | None:
+    async def pegar_por_email(self, email: str) -> Cliente | None:
         """
         Recupera um cliente com base em seu e-mail.
 
@@ -35,22 +69,58 @@ class ClienteDTO:
         :return: Objeto Cliente ou None se não encontrado.
         """
         self.logger.debug(f"Obtendo cliente por e-mail: {email}")
-        return self.db.query(Cliente).filter(Cliente.email == email).first()
+        return await self.db.scalar(
+            select(Cliente).where(Cliente.email == email).limit(1))
 
-    def pegar_todos(self, a_partir: int = 0, limite: int = 100) -> (
-            list)[Type[Cliente]]:
+    async def pegar_todos(
+            self, limite: int = 100,
+            apos: Tuple[datetime, int] | None = None) -> List[Row]:
         """
-        Retorna uma lista paginada de clientes existentes no sistema.
+        Retorna uma página de clientes ordenada por (created_at, id).
+
+        A paginação é por keyset: a página seguinte começa depois da posição
+        do último cliente entregue, usando o índice ix_clientes_created_at_id,
+        então o custo não cresce com a profundidade da página. Só as colunas da
+        resposta são lidas, como linhas (sem objetos ORM nem identity map). Pode
+        ser atendida pela réplica.
 
-        :param a_partir: Quantidade de registros a ignorar (offset).
         :param limite: Quantidade máxima de clientes a retornar.
-        :return: Lista de objetos Cliente.
+        :param apos: Posição (created_at, id) do último cliente da página anterior.
+        :return: Linhas com as colunas de `COLUNAS_RESPOSTA`.
+        """
+        self.logger.debug(f"Obtendo clientes com limite={limite}, apos={apos}")
+        consulta = select(*COLUNAS_RESPOSTA)
+        if apos is not None:
+            consulta = consulta.where(
+                tuple_(Cliente.created_at, Cliente.id) > tuple_(*apos))
+        resultado = await self.db.execute(
+            consulta.order_by(Cliente.created_at, Cliente.id).limit(limite),
+            execution_options=LEITURA_REPLICA)
+        return list(resultado.all())
+
+    async def incrementar_versao_favoritos(self, cliente_id: int) -> None:
         """
-        self.logger.debug(f"Obtendo todos os clientes com "
-                          f"a_partir={a_partir}, limite={limite}")
-        return self.db.query(Cliente).offset(a_partir).limit(limite).all()
+        Incrementa o contador de versão da lista de favoritos do cliente.
+
+        O contador compõe o ETag da listagem de favoritos e deve mudar a cada
+        inclusão ou remoção.
+
+        :param cliente_id: ID do cliente.
+        :raises Exception: Em caso de erro na atualização.
+        """
+        self.logger.debug(f"Incrementando versao dos favoritos do "
+                          f"cliente {cliente_id}")
+        try:
+            await self.db.execute(
+                update(Cliente)
+                .where(Cliente.id == cliente_id)
+                .values(favoritos_versao=Cliente.favoritos_versao + 1))
+        except Exception as e:
+            self.logger.error(f"Erro ao incrementar versao dos favoritos do "
+                              f"cliente {cliente_id}: {e}", exc_info=True)
+            raise
 
-    def registrar(self, cliente_data: dict) -> Cliente:
+    async def registrar(self, cliente_data: dict) -> Cliente:
         """
         Cria um novo registro de cliente no banco de dados.
 
@@ -63,8 +133,7 @@ class ClienteDTO:
         try:
             db_cliente = Cliente(**cliente_data)
             self.db.add(db_cliente)
-            self.db.commit()
-            self.db.refresh(db_cliente)
+            await self.db.flush()
             self.logger.info(f"Cliente criado com sucesso com "
                              f"ID: {db_cliente.id}")
             return db_cliente
@@ -72,7 +141,7 @@ class ClienteDTO:
             self.logger.error(f"Erro ao criar cliente: {e}", exc_info=True)
             raise
 
-    def atualizar(self, db_cliente: Cliente, data: dict) -> Cliente:
+    async def atualizar(self, db_cliente: Cliente, data: dict) -> Cliente:
         """
         Atualiza os dados de um cliente existente com os campos fornecidos.
 
@@ -86,8 +155,7 @@ class ClienteDTO:
             for key, value in data.items():
                 setattr(db_cliente, key, value)
             self.db.add(db_cliente)
-            self.db.commit()
-            self.db.refresh(db_cliente)
+            await self.db.flush()
             self.logger.info(f"Cliente atualizado com sucesso: "
                              f"{db_cliente.id}")
             return db_cliente
@@ -96,20 +164,70 @@ class ClienteDTO:
                               f"{db_cliente.id}: {e}", exc_info=True)
             raise
 
-    def deletar(self, cliente: Cliente) -> None:
+    async def deletar(self, cliente_id: int) -> bool:
         """
-        Remove um cliente do banco de dados.
+        Remove um cliente do banco de dados com um único DELETE.
+
+        O usuário e os favoritos do cliente são removidos pelo próprio banco
+        (ON DELETE CASCADE), sem serem carregados na sessão.
 
-        :param cliente: Objeto Cliente a ser removido.
-        :return: None.
+        :param cliente_id: ID do cliente a ser removido.
+        :return: True se o cliente existia e foi removido, False caso contrário.
         :raises Exception: Em caso de erro durante a exclusão.
         """
-        self.logger.info(f"Excluindo cliente com ID: {cliente.id}")
+        self.logger.info(f"Excluindo cliente com ID: {cliente_id}")
         try:
-            self.db.delete(cliente)
-            self.db.commit()
-            self.logger.info(f"Cliente excluído com sucesso: {cliente.id}")
+            resultado = await self.db.execute(
+                delete(Cliente).where(Cliente.id == cliente_id)
+                .returning(Cliente.id)
+                .execution_options(synchronize_session=False))
+            removido = resultado.scalar_one_or_none() is not None
+            if removido:
+                self.logger.info(f"Cliente excluído com sucesso: {cliente_id}")
+            return removido
         except Exception as e:
             self.logger.error(f"Erro ao excluir o ID "
-                              f"do cliente {cliente.id}: {e}", exc_info=True)
+                              f"do cliente {cliente_id}: {e}", exc_info=True)
+            raise
+
+    async def importar_lote(self, registros: List[tuple]) -> Set[str]:
+        """
+        Carrega um lote de clientes (e seus usuários) com COPY e merge em conjunto.
+
+        As linhas vão por `COPY` para uma tabela temporária e são inseridas em
+        `clientes` e `usuarios` por um único comando (INSERT ... SELECT com CTE).
+        E-mails já cadastrados em clientes ou usuários são ignorados pelo banco.
+        O commit fica com quem chama.
+
+        :param registros: Tuplas (linha, nome, email, hashed_password).
+        :return: E-mails efetivamente importados.
+        :raises Exception: Em caso de erro na carga.
+        """
+        self.logger.info(f"Importando lote de {len(registros)} clientes via COPY.")
+        try:
+            await self.db.execute(CreateTable(importacao_clientes))
+            conexao = await self.db.connection()
+            bruta = await conexao.get_raw_connection()
+            await bruta.driver_connection.copy_records_to_table(
+                importacao_clientes.name, records=registros,
+                columns=[coluna.name for coluna in importacao_clientes.columns])
+
+            stage = importacao_clientes.c
+            novos = insert(Cliente).from_select(
+                ["nome", "email"],
+                select(stage.nome, stage.email).where(
+                    ~exists().where(Usuario.email == stage.email))
+            ).on_conflict_do_nothing(
+                index_elements=[Cliente.email]
+            ).returning(Cliente.id, Cliente.email).cte("novos")
+            resultado = await self.db.scalars(
+                insert(Usuario).from_select(
+                    ["email", "hashed_password", "perfil", "cliente_id"],
+                    select(stage.email, stage.hashed_password,
+                           literal("cliente"), novos.c.id)
+                    .join(novos, novos.c.email == stage.email)
+                ).returning(Usuario.email))
+            return set(resultado.all())
+        except Exception as e:
+            self.logger.error(f"Erro ao importar lote de clientes: {e}", exc_info=True)
             raise
@@ -1,21 +1,124 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Collection, Dict, List, Sequence, Tuple
 
+from sqlalchemy import (Float, Integer, Numeric, String, Text, bindparam, case, cast,
+                        column, delete, func, literal, literal_column, or_, select,
+                        tuple_, type_coerce, update, values)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import LEITURA_REPLICA
 from app.core.logger import logger
+from app.db.models.cliente_favoritos_stats_model import ClienteFavoritosStats
+from app.db.models.cliente_model import Cliente
 from app.db.models.favorito_model import Favorito
+from app.db.models.produto_model import Produto
+
+# Configuração textual do Postgres usada na coluna favoritos.busca.
+CONFIGURACAO_BUSCA = "simple"
+
+# Consulta quente montada uma única vez: a cada chamada só os parâmetros mudam e
+# o SQL compilado sai do cache do SQLAlchemy.
+_FAVORITO_POR_CLIENTE_PRODUTO = select(Favorito).where(
+    Favorito.cliente_id == bindparam("cliente_id"),
+    Favorito.produto_id == bindparam("produto_id")
+).limit(1)
+
+# Colunas da resposta das listagens (FavoritoResponse), lidas como linhas do Core,
+# sem objetos ORM; o preço já vem como float, o tipo do schema.
+COLUNAS_RESPOSTA = (Favorito.id, Favorito.cliente_id, Favorito.produto_id,
+                    Favorito.titulo, Favorito.imagem,
+                    type_coerce(Favorito.preco, Numeric(10, 2, asdecimal=False)).label("preco"),
+                    Favorito.review, Favorito.created_at, Favorito.updated_at)
+
+# Colunas da exportação de favoritos, na ordem do CSV.
+COLUNAS_EXPORTACAO = (Favorito.id, Favorito.cliente_id, Favorito.produto_id,
+                      Favorito.titulo, Favorito.imagem, Favorito.preco,
+                      Favorito.review, Favorito.created_at, Favorito.updated_at)
+
+
+# JSON montado pelo Postgres byte a byte igual ao `TypeAdapter.dump_json` dos
+# schemas (compacto, sem espaços), para as duas formas de montar a listagem
+# servirem o mesmo corpo sob o mesmo ETag. O json_build_object/json_agg do
+# Postgres escreve `"chave" : valor` e números sem casa decimal, então cada
+# valor é convertido para o texto que o pydantic gera e os objetos são
+# concatenados com string_agg.
+_FORMATO_DATA_SEGUNDOS = literal_column("""'YYYY-MM-DD"T"HH24:MI:SS"Z"'""")
+_FORMATO_DATA_MICROSSEGUNDOS = literal_column("""'YYYY-MM-DD"T"HH24:MI:SS.US"Z"'""")
+_ASPAS = literal_column("""'"'""")
+_NULL_JSON = literal_column("'null'")
+
+
+def _data_json(coluna):
+    # Datas em UTC, com frações de segundo só quando existem. O `||` com NULL
+    # dá NULL, que vira `null`.
+    em_utc = func.timezone(literal_column("'UTC'"), coluna)
+    data = case((coluna == func.date_trunc(literal_column("'second'"), coluna),
+                 func.to_char(em_utc, _FORMATO_DATA_SEGUNDOS)),
+                else_=func.to_char(em_utc, _FORMATO_DATA_MICROSSEGUNDOS))
+    return func.coalesce(_ASPAS.op("||")(data).op("||")(_ASPAS), _NULL_JSON)
+
+
+def _preco_json(coluna):
+    # Float do pydantic: 10.0, 10.5 e 10.55 (NUMERIC(10, 2) cabe sem expoente).
+    return case((coluna == func.trunc(coluna),
+                 cast(func.trunc(coluna), Text).op("||")(literal_column("'.0'"))),
+                else_=func.rtrim(cast(coluna, Text), literal_column("'0'")))
+
+
+def _valor_json(nome: str, coluna):
+    if nome in ("created_at", "updated_at"):
+        return _data_json(coluna)
+    if nome == "preco":
+        return _preco_json(coluna)
+    if isinstance(coluna.type, Integer):
+        return cast(coluna, Text)
+    return func.coalesce(cast(func.to_json(coluna), Text), _NULL_JSON)
+
+
+def _pagina_em_json(pagina, ultima: int):
+    """
+    Agrega uma página de favoritos em um único array JSON no formato de
+    List[FavoritoResponse], montado pelo Postgres com os mesmos bytes que o
+    `TypeAdapter.dump_json` do schema gera.
+
+    `pagina` é uma subconsulta com as colunas de COLUNAS_RESPOSTA e a posição
+    `n` de cada linha na ordenação; só entram no array as linhas até `ultima`,
+    a excedente apenas indica que há mais resultados.
+
+    :return: Consulta com o array (texto), a quantidade de linhas da página e
+             (created_at, id) da última linha do array.
+    """
+    partes = []
+    for nome in (coluna.name for coluna in COLUNAS_RESPOSTA):
+        separador = "{" if not partes else ","
+        partes.extend((literal_column(f"""'{separador}"{nome}":'"""),
+                       _valor_json(nome, pagina.c[nome])))
+    objeto = func.concat(*partes, literal_column("'}'"))
+    favoritos = func.string_agg(
+        objeto, aggregate_order_by(literal_column("','"), pagina.c.n)
+    ).filter(pagina.c.n <= ultima)
+    return select(
+        func.concat(literal_column("'['"), favoritos, literal_column("']'")).label("favoritos"),
+        func.count().label("quantidade"),
+        func.max(pagina.c.created_at).filter(pagina.c.n == ultima).label("created_at"),
+        func.max(pagina.c.id).filter(pagina.c.n == ultima).label("id"))
 
 
 class FavoritoDTO:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Inicializa o DTO (Data Transfer Object) responsável pelas operações
         diretas com a tabela de 'favoritos' no banco de dados.
 
-        :param db: Sessão ativa do banco de dados.
+        :param db: Sessão assíncrona ativa do banco de dados.
         """
         self.db = db
         self.logger = logger
 
-    def pegar_id(self, favorito_id: int) -> Favorito | None:
+    async def pegar_id(self, favorito_id: int) -> Favorito | None:
         """
         Busca um favorito pelo seu ID único.
 
@@ -23,24 +126,207 @@ class FavoritoDTO:
         :return: Objeto Favorito se encontrado, ou None.
         """
         self.logger.debug(f"Obtendo favorito por ID: {favorito_id}")
-        return self.db.query(Favorito).filter(
-            Favorito.id == favorito_id).first()
+        return await self.db.get(Favorito, favorito_id)
+
+    async def todos_por_cliente(
+            self, cliente_id: int, limite: int,
+            apos: Tuple[datetime, int] | None = None) -> List[Row]:
+        """
+        Retorna uma página dos favoritos de um cliente ordenada por (created_at, id).
+
+        A paginação é por keyset sobre o índice ix_favoritos_cliente_created_at_id,
+        então o custo de cada página é constante, independente da profundidade.
+        Só as colunas da resposta são lidas, como linhas (sem objetos ORM nem
+        identity map). Pode ser atendida pela réplica.
+
+        :param cliente_id: ID do cliente.
+        :param limite: Quantidade máxima de favoritos retornados.
+        :param apos: Posição (created_at, id) do último favorito da página anterior.
+        :return: Linhas com as colunas de `COLUNAS_RESPOSTA`.
+        """
+        self.logger.debug(f"Obtendo favoritos para o ID do cliente "
+                          f"{cliente_id} com limite={limite}, apos={apos}")
+        resultado = await self.db.execute(
+            self._consulta_por_cliente(cliente_id, limite, apos),
+            execution_options=LEITURA_REPLICA)
+        return list(resultado.all())
+
+    async def todos_por_cliente_json(
+            self, cliente_id: int, limite: int,
+            apos: Tuple[datetime, int] | None = None) -> Row:
+        """
+        Retorna uma página dos favoritos de um cliente já serializada em JSON
+        pelo Postgres, na mesma ordem e paginação de `todos_por_cliente`.
+
+        Uma única ida ao banco devolve o array pronto, sem montar objetos em
+        Python. Pode ser atendida pela réplica.
+
+        :param cliente_id: ID do cliente.
+        :param limite: Quantidade máxima de favoritos no array.
+        :param apos: Posição (created_at, id) do último favorito da página anterior.
+        :return: Linha com `favoritos` (array JSON como texto), `quantidade` de
+                 linhas lidas (até limite + 1) e `created_at`/`id` do último
+                 favorito do array.
+        """
+        self.logger.debug(f"Obtendo favoritos em JSON para o ID do cliente "
+                          f"{cliente_id} com limite={limite}, apos={apos}")
+        ordem = (Favorito.created_at, Favorito.id)
+        pagina = self._consulta_por_cliente(
+            cliente_id, limite + 1, apos,
+            func.row_number().over(order_by=ordem).label("n")).subquery()
+        resultado = await self.db.execute(
+            _pagina_em_json(pagina, limite), execution_options=LEITURA_REPLICA)
+        return resultado.one()
+
+    @staticmethod
+    def _consulta_por_cliente(cliente_id: int, limite: int,
+                              apos: Tuple[datetime, int] | None, *extras):
+        consulta = select(*COLUNAS_RESPOSTA, *extras).where(
+            Favorito.cliente_id == cliente_id)
+        if apos is not None:
+            consulta = consulta.where(
+                tuple_(Favorito.created_at, Favorito.id) > tuple_(*apos))
+        return consulta.order_by(Favorito.created_at, Favorito.id).limit(limite)
 
-    def todos_por_cliente(
-            self, cliente_id: int, a_partir: int = 0) -> list[Favorito]:
+    async def estatisticas_por_cliente(self, cliente_id: int) -> Row | None:
         """
-        Retorna todos os favoritos de um cliente específico.
+        Retorna as estatísticas de favoritos de um cliente, lidas da tabela
+        'cliente_favoritos_stats' (uma linha por cliente, mantida por triggers).
+
+        Clientes sem favoritos aparecem com quantidade e valor zerados. Pode ser
+        atendida pela réplica.
+
+        :param cliente_id: ID do cliente.
+        :return: Linha (cliente_id, quantidade, valor_total, ultima_atividade),
+                 ou None se o cliente não existir.
+        """
+        self.logger.debug(f"Obtendo estatisticas de favoritos do cliente {cliente_id}")
+        resultado = await self.db.execute(
+            self._consulta_estatisticas().where(Cliente.id == cliente_id),
+            execution_options=LEITURA_REPLICA)
+        return resultado.one_or_none()
+
+    async def estatisticas(self, limite: int, apos: int | None = None) -> List[Row]:
+        """
+        Retorna uma página das estatísticas de favoritos dos clientes, ordenada
+        por ID do cliente (keyset). Pode ser atendida pela réplica.
+
+        :param limite: Quantidade máxima de clientes.
+        :param apos: ID do último cliente da página anterior.
+        :return: Linhas (cliente_id, quantidade, valor_total, ultima_atividade).
+        """
+        self.logger.debug(f"Obtendo estatisticas de favoritos com limite={limite}, apos={apos}")
+        consulta = self._consulta_estatisticas()
+        if apos is not None:
+            consulta = consulta.where(Cliente.id > apos)
+        resultado = await self.db.execute(
+            consulta.order_by(Cliente.id).limit(limite),
+            execution_options=LEITURA_REPLICA)
+        return list(resultado.all())
+
+    @staticmethod
+    def _consulta_estatisticas():
+        return select(
+            Cliente.id.label("cliente_id"),
+            func.coalesce(ClienteFavoritosStats.quantidade, 0).label("quantidade"),
+            func.coalesce(ClienteFavoritosStats.valor_total, 0).label("valor_total"),
+            ClienteFavoritosStats.ultima_atividade,
+        ).outerjoin(ClienteFavoritosStats, ClienteFavoritosStats.cliente_id == Cliente.id)
+
+    async def exportar(self, cliente_id_min: int | None = None,
+                       cliente_id_max: int | None = None,
+                       desde: datetime | None = None, ate: datetime | None = None,
+                       tamanho_lote: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """
+        Percorre os favoritos com um cursor no servidor, em lotes de linhas.
+
+        As linhas vêm como tuplas (sem objetos ORM nem identity map) e só
+        `tamanho_lote` delas ficam em memória por vez.
+
+        :param cliente_id_min: Menor ID de cliente (inclusivo).
+        :param cliente_id_max: Maior ID de cliente (inclusivo).
+        :param desde: Data de criação mínima (inclusiva).
+        :param ate: Data de criação máxima (exclusiva).
+        :param tamanho_lote: Linhas buscadas no banco por vez.
+        :return: Iterador assíncrono de lotes de linhas, ordenadas por ID.
+        """
+        self.logger.info(f"Exportando favoritos (clientes {cliente_id_min}-"
+                         f"{cliente_id_max}, desde={desde}, ate={ate}).")
+        consulta = select(*COLUNAS_EXPORTACAO).order_by(Favorito.id)
+        if cliente_id_min is not None:
+            consulta = consulta.where(Favorito.cliente_id >= cliente_id_min)
+        if cliente_id_max is not None:
+            consulta = consulta.where(Favorito.cliente_id <= cliente_id_max)
+        if desde is not None:
+            consulta = consulta.where(Favorito.created_at >= desde)
+        if ate is not None:
+            consulta = consulta.where(Favorito.created_at < ate)
+
+        resultado = await self.db.stream(
+            consulta.execution_options(yield_per=tamanho_lote))
+        async for linhas in resultado.partitions():
+            yield linhas
+
+    async def buscar_por_cliente(self, cliente_id: int, texto: str, limite: int,
+                           deslocamento: int = 0) -> list[Favorito]:
+        """
+        Busca os favoritos de um cliente por texto no título e na review.
+
+        Usa a coluna `busca` (tsvector com índice GIN) e ordena os resultados
+        pela relevância calculada com `ts_rank_cd`.
 
         :param cliente_id: ID do cliente.
-        :param a_partir: A partir de qual registro iniciar.
-        :return: Lista de objetos Favorito.
+        :param texto: Texto da busca (sintaxe de `websearch_to_tsquery`).
+        :param limite: Quantidade máxima de favoritos retornados.
+        :param deslocamento: Quantidade de resultados a pular.
+        :return: Lista de objetos Favorito, do mais para o menos relevante.
+        """
+        self.logger.debug(f"Buscando favoritos do cliente {cliente_id} "
+                          f"por '{texto}' (limite={limite}, "
+                          f"deslocamento={deslocamento})")
+        consulta = func.websearch_to_tsquery(CONFIGURACAO_BUSCA, texto)
+        resultado = await self.db.scalars(
+            select(Favorito).where(
+                Favorito.cliente_id == cliente_id,
+                Favorito.busca.bool_op("@@")(consulta)
+            ).order_by(*self._ordem_busca(consulta)).offset(deslocamento).limit(limite))
+        return list(resultado.all())
+
+    async def buscar_por_cliente_json(self, cliente_id: int, texto: str, limite: int,
+                                      deslocamento: int = 0) -> Row:
         """
-        self.logger.debug(f"Obtendo favoritos para o ID do "
-                          f"cliente {cliente_id} com a_partir={a_partir}")
-        return self.db.query(Favorito).filter(
-            Favorito.cliente_id == cliente_id).offset(a_partir).all()
+        Busca os favoritos de um cliente por texto e devolve a página já
+        serializada em JSON pelo Postgres, na mesma ordem de `buscar_por_cliente`.
+        Pode ser atendida pela réplica.
 
-    def por_cliente_produto_id(
+        :param cliente_id: ID do cliente.
+        :param texto: Texto da busca (sintaxe de `websearch_to_tsquery`).
+        :param limite: Quantidade máxima de favoritos no array.
+        :param deslocamento: Quantidade de resultados a pular.
+        :return: Linha com `favoritos` (array JSON como texto) e `quantidade` de
+                 linhas lidas (até limite + 1).
+        """
+        self.logger.debug(f"Buscando favoritos em JSON do cliente {cliente_id} "
+                          f"por '{texto}' (limite={limite}, "
+                          f"deslocamento={deslocamento})")
+        consulta = func.websearch_to_tsquery(CONFIGURACAO_BUSCA, texto)
+        ordem = self._ordem_busca(consulta)
+        # A posição é calculada antes do OFFSET, então a página começa em deslocamento + 1.
+        pagina = select(
+            *COLUNAS_RESPOSTA, func.row_number().over(order_by=ordem).label("n")
+        ).where(
+            Favorito.cliente_id == cliente_id,
+            Favorito.busca.bool_op("@@")(consulta)
+        ).order_by(*ordem).offset(deslocamento).limit(limite + 1).subquery()
+        resultado = await self.db.execute(_pagina_em_json(pagina, deslocamento + limite),
+                                          execution_options=LEITURA_REPLICA)
+        return resultado.one()
+
+    @staticmethod
+    def _ordem_busca(consulta):
+        return func.ts_rank_cd(Favorito.busca, consulta).desc(), Favorito.id
+
+    async def por_cliente_produto_id(
             self, cliente_id: int, produto_id: int) -> Favorito | None:
         """
         Verifica se um produto já está na lista de favoritos de um cliente.
@@ -51,36 +337,134 @@ class FavoritoDTO:
         """
         self.logger.debug(f"Verificando favorito existente para ID do "
                           f"cliente {cliente_id}, ID do produto {produto_id}")
-        return self.db.query(Favorito).filter(
-            Favorito.cliente_id == cliente_id,
-            Favorito.produto_id == produto_id
-        ).first()
+        return await self.db.scalar(
+            _FAVORITO_POR_CLIENTE_PRODUTO,
+            {"cliente_id": cliente_id, "produto_id": produto_id})
 
-    def registrar(self, favorito_data: dict) -> Favorito:
+    async def produtos_favoritados(
+            self, cliente_id: int, produto_ids: List[int]) -> set[int]:
         """
-        Registra um favorito no banco de dados.
+        Retorna quais dos produtos informados já estão nos favoritos do cliente.
 
-        :param favorito_data: Dicionário com os dados do favorito.
-        :return: Objeto Favorito criado.
+        :param cliente_id: ID do cliente.
+        :param produto_ids: IDs dos produtos a verificar.
+        :return: Conjunto com os IDs já favoritados.
+        """
+        self.logger.debug(f"Verificando {len(produto_ids)} favoritos existentes "
+                          f"para o ID do cliente {cliente_id}")
+        resultado = await self.db.scalars(
+            select(Favorito.produto_id).where(
+                Favorito.cliente_id == cliente_id,
+                Favorito.produto_id.in_(produto_ids)))
+        return set(resultado.all())
+
+    async def por_produto_id(self, produto_id: int) -> Favorito | None:
+        """
+        Busca o favorito mais recente de um produto, de qualquer cliente.
+
+        Usado como fonte degradada dos dados do produto (titulo, imagem, preco)
+        quando a API externa está indisponível.
+
+        :param produto_id: ID do produto.
+        :return: Objeto Favorito se encontrado, ou None.
+        """
+        self.logger.debug(f"Obtendo favorito mais recente do produto {produto_id}")
+        return await self.db.scalar(
+            select(Favorito).where(
+                Favorito.produto_id == produto_id
+            ).order_by(Favorito.id.desc()).limit(1))
+
+    async def registrar_do_catalogo(self, cliente_id: int, produto_id: int) -> Favorito | None:
+        """
+        Registra um favorito copiando os dados do produto da réplica local do
+        catálogo, em um único `INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING`.
+
+        Não retorna nada quando o produto já é favorito do cliente ou quando não
+        está na réplica local. Se o cliente não existir, o banco recusa a linha
+        pela chave estrangeira (IntegrityError).
+
+        :param cliente_id: ID do cliente.
+        :param produto_id: ID do produto.
+        :return: Objeto Favorito criado, ou None se nenhuma linha foi inserida.
         :raises Exception: Em caso de erro durante a criação.
         """
+        self.logger.info(f"Criando favorito do catalogo para ID do cliente: "
+                         f"{cliente_id}, ID do produto: {produto_id}")
+        dados_produto = select(
+            literal(cliente_id, Integer), Produto.id, Produto.titulo,
+            func.coalesce(Produto.imagem, ""), Produto.preco,
+            func.coalesce(Produto.descricao, "")
+        ).where(Produto.id == produto_id)
+        try:
+            return await self.db.scalar(
+                insert(Favorito).from_select(
+                    ["cliente_id", "produto_id", "titulo", "imagem", "preco", "review"],
+                    dados_produto)
+                .on_conflict_do_nothing(
+                    index_elements=[Favorito.cliente_id, Favorito.produto_id])
+                .returning(Favorito))
+        except Exception as e:
+            self.logger.error(f"Erro ao criar favorito: {e}", exc_info=True)
+            raise
+
+    async def registrar(self, favorito_data: dict) -> Favorito | None:
+        """
+        Registra um favorito com `INSERT ... ON CONFLICT DO NOTHING RETURNING`.
+
+        :param favorito_data: Dicionário com os dados do favorito.
+        :return: Objeto Favorito criado, ou None se o produto já era favorito
+                 do cliente (inclusive por uma requisição concorrente).
+        :raises Exception: Em caso de erro durante a criação (ex.: cliente
+                           inexistente viola a chave estrangeira).
+        """
         self.logger.info(
             f"Criando novo favorito para ID do cliente: "
             f"{favorito_data.get('cliente_id')}, ID do produto: "
             f"{favorito_data.get('produto_id')}")
         try:
-            db_favorito = Favorito(**favorito_data)
-            self.db.add(db_favorito)
-            self.db.commit()
-            self.db.refresh(db_favorito)
-            self.logger.info(f"Favorito criado com sucesso "
-                             f"com ID: {db_favorito.id}")
+            db_favorito = await self.db.scalar(
+                insert(Favorito).values(favorito_data)
+                .on_conflict_do_nothing(
+                    index_elements=[Favorito.cliente_id, Favorito.produto_id])
+                .returning(Favorito))
+            if db_favorito is not None:
+                self.logger.info(f"Favorito criado com sucesso "
+                                 f"com ID: {db_favorito.id}")
             return db_favorito
         except Exception as e:
             self.logger.error(f"Erro ao criar favorito: {e}", exc_info=True)
             raise
 
-    def deletar(self, favorito: Favorito) -> None:
+    async def registrar_varios(self, favoritos_data: List[dict]) -> List[Favorito]:
+        """
+        Registra vários favoritos em um único `INSERT ... ON CONFLICT DO NOTHING
+        RETURNING`.
+
+        Produtos que o cliente já favoritou (inclusive por uma requisição
+        concorrente) são ignorados pelo banco e não aparecem no retorno.
+
+        :param favoritos_data: Lista de dicionários com os dados dos favoritos.
+        :return: Objetos Favorito efetivamente criados.
+        :raises Exception: Em caso de erro durante a criação.
+        """
+        if not favoritos_data:
+            return []
+        self.logger.info(f"Criando {len(favoritos_data)} favoritos em lote para "
+                         f"ID do cliente: {favoritos_data[0].get('cliente_id')}")
+        try:
+            resultado = await self.db.scalars(
+                insert(Favorito).values(favoritos_data)
+                .on_conflict_do_nothing(
+                    index_elements=[Favorito.cliente_id, Favorito.produto_id])
+                .returning(Favorito))
+            criados = list(resultado.all())
+            self.logger.info(f"{len(criados)} favoritos criados em lote.")
+            return criados
+        except Exception as e:
+            self.logger.error(f"Erro ao criar favoritos em lote: {e}", exc_info=True)
+            raise
+
+    async def deletar(self, favorito: Favorito) -> None:
         """
         Remove um favorito do banco de dados.
 
@@ -90,10 +474,139 @@ class FavoritoDTO:
         """
         self.logger.info(f"Excluindo favorito com ID: {favorito.id}")
         try:
-            self.db.delete(favorito)
-            self.db.commit()
+            await self.db.delete(favorito)
+            await self.db.flush()
             self.logger.info(f"Favorito excluído com sucesso: {favorito.id}")
         except Exception as e:
             self.logger.error(f"Erro ao excluir o ID do "
                               f"favorito {favorito.id}: {e}", exc_info=True)
             raise
+
+    async def quantidade_excede(self, cliente_id: int, limite: int) -> bool:
+        """
+        Indica se o cliente tem mais de `limite` favoritos.
+
+        A contagem para em `limite + 1` linhas, então o custo não cresce com o
+        total de favoritos do cliente.
+
+        :param cliente_id: ID do cliente.
+        :param limite: Quantidade de referência.
+        :return: True se o cliente tiver mais de `limite` favoritos.
+        """
+        amostra = (select(Favorito.id).where(Favorito.cliente_id == cliente_id)
+                   .limit(limite + 1).subquery())
+        quantidade = await self.db.scalar(select(func.count()).select_from(amostra))
+        return quantidade > limite
+
+    async def deletar_lote_por_cliente(self, cliente_id: int, tamanho_lote: int) -> int:
+        """
+        Remove até `tamanho_lote` favoritos de um cliente com um único DELETE.
+
+        :param cliente_id: ID do cliente.
+        :param tamanho_lote: Máximo de favoritos removidos.
+        :return: Quantidade de favoritos removidos.
+        :raises Exception: Em caso de falha na exclusão.
+        """
+        lote = (select(Favorito.id).where(Favorito.cliente_id == cliente_id)
+                .limit(tamanho_lote).scalar_subquery())
+        try:
+            resultado = await self.db.execute(
+                delete(Favorito).where(Favorito.id.in_(lote))
+                .execution_options(synchronize_session=False))
+            return resultado.rowcount
+        except Exception as e:
+            self.logger.error(f"Erro ao excluir favoritos do cliente "
+                              f"{cliente_id}: {e}", exc_info=True)
+            raise
+
+    @staticmethod
+    def _dados_produto(produto: Dict[str, Any]) -> tuple:
+        return (produto.get("title") or "", produto.get("image") or "",
+                Decimal(str(produto.get("price") or 0)).quantize(Decimal("0.01")))
+
+    async def produtos_desatualizados(
+            self, produtos: List[Dict[str, Any]],
+            produto_ids: Collection[int] | None = None,
+            tamanho_lote: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Compara o catálogo atual com os dados copiados nos favoritos.
+
+        Lê apenas as combinações distintas de (produto_id, titulo, imagem, preco)
+        já gravadas, sem carregar os favoritos em si. Com `produto_ids` a leitura
+        fica restrita a esses produtos (índice em produto_id, em consultas de até
+        `tamanho_lote` IDs), e o custo acompanha o que mudou no catálogo, não o
+        tamanho da tabela de favoritos.
+
+        :param produtos: Lista de produtos no formato da Fake Store API.
+        :param produto_ids: IDs dos produtos a comparar; None compara todos.
+        :param tamanho_lote: Máximo de IDs por consulta.
+        :return: Valores atuais (produto_id, titulo, imagem, preco) dos produtos
+                 favoritados cujos dados mudaram no catálogo.
+        """
+        atuais = {produto["id"]: self._dados_produto(produto) for produto in produtos
+                  if isinstance(produto, dict) and "id" in produto}
+        consulta = select(
+            Favorito.produto_id, Favorito.titulo, Favorito.imagem, Favorito.preco
+        ).distinct()
+        if produto_ids is None:
+            gravados = (await self.db.execute(consulta)).all()
+        else:
+            ids = sorted(set(produto_ids) & atuais.keys())
+            gravados = []
+            for inicio in range(0, len(ids), tamanho_lote):
+                gravados += (await self.db.execute(consulta.where(
+                    Favorito.produto_id.in_(ids[inicio:inicio + tamanho_lote])))).all()
+
+        desatualizados = {produto_id for produto_id, *dados in gravados
+                          if produto_id in atuais and tuple(dados) != atuais[produto_id]}
+        self.logger.debug(f"{len(desatualizados)} produtos favoritados "
+                          f"com dados desatualizados.")
+        return [{"produto_id": produto_id, "titulo": atuais[produto_id][0],
+                 "imagem": atuais[produto_id][1], "preco": atuais[produto_id][2]}
+                for produto_id in sorted(desatualizados)]
+
+    async def atualizar_dados_produtos(self, linhas: List[Dict[str, Any]]) -> int:
+        """
+        Atualiza titulo, imagem e preco dos favoritos em um único comando
+        `UPDATE ... FROM (VALUES ...)`.
+
+        Somente as linhas cujo conteúdo realmente difere são escritas. A versão
+        da lista de favoritos dos clientes afetados também é incrementada, para
+        que o ETag da listagem mude. Os dois UPDATEs vão em um único comando
+        (CTEs que modificam dados): os IDs dos clientes não passam pela
+        aplicação, então um produto favoritado por muitos clientes não estoura
+        o limite de parâmetros por comando.
+
+        :param linhas: Valores atuais (produto_id, titulo, imagem, preco).
+        :return: Quantidade de favoritos atualizados.
+        :raises Exception: Em caso de erro na atualização.
+        """
+        if not linhas:
+            return 0
+        novos = values(
+            column("produto_id", Integer), column("titulo", String),
+            column("imagem", String), column("preco", Numeric(10, 2)),
+            name="novos"
+        ).data([(linha["produto_id"], linha["titulo"], linha["imagem"], linha["preco"])
+                for linha in linhas])
+        atualizados = (
+            update(Favorito.__table__)
+            .where(Favorito.produto_id == novos.c.produto_id,
+                   or_(Favorito.titulo.is_distinct_from(novos.c.titulo),
+                       Favorito.imagem.is_distinct_from(novos.c.imagem),
+                       Favorito.preco.is_distinct_from(novos.c.preco)))
+            .values(titulo=novos.c.titulo, imagem=novos.c.imagem, preco=novos.c.preco)
+            .returning(Favorito.cliente_id)
+            .cte("atualizados"))
+        versoes = (
+            update(Cliente.__table__)
+            .where(Cliente.id.in_(select(atualizados.c.cliente_id)))
+            .values(favoritos_versao=Cliente.favoritos_versao + 1)
+            .cte("versoes"))
+        try:
+            return await self.db.scalar(
+                select(func.count()).select_from(atualizados).add_cte(versoes))
+        except Exception as e:
+            self.logger.error(f"Erro ao atualizar dados dos produtos "
+                              f"nos favoritos: {e}", exc_info=True)
+            raise
@@ -0,0 +1,156 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.core.logger import logger
+from app.db.models.produto_model import Produto
+
+
+class ProdutoDTO:
+    def __init__(self, db: AsyncSession):
+        """
+        Inicializa o DTO (Data Transfer Object) responsável pela réplica local
+        do catálogo de produtos na tabela 'produtos'.
+
+        :param db: Sessão assíncrona ativa do SQLAlchemy.
+        """
+        self.db = db
+        self.logger = logger
+
+    @staticmethod
+    def de_api(dados_produto: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte um produto no formato da Fake Store API para as colunas da tabela.
+
+        O hash do conteúdo permite detectar, na sincronização, quais linhas mudaram.
+
+        :param dados_produto: Dicionário do produto vindo da API externa.
+        :return: Dicionário com os valores das colunas.
+        """
+        avaliacao = dados_produto.get("rating") or {}
+        hash_conteudo = hashlib.md5(json.dumps(
+            dados_produto, sort_keys=True, default=str).encode()).hexdigest()
+        return {
+            "id": dados_produto["id"],
+            "titulo": dados_produto.get("title") or "",
+            "preco": dados_produto.get("price") or 0,
+            "descricao": dados_produto.get("description"),
+            "categoria": dados_produto.get("category"),
+            "imagem": dados_produto.get("image"),
+            "avaliacao_nota": avaliacao.get("rate"),
+            "avaliacao_contagem": avaliacao.get("count"),
+            "hash_conteudo": hash_conteudo,
+        }
+
+    @staticmethod
+    def para_dict(produto: Produto) -> Dict[str, Any]:
+        """
+        Converte um registro da réplica para o formato da Fake Store API.
+
+        :param produto: Objeto Produto.
+        :return: Dicionário no mesmo formato retornado pela API externa.
+        """
+        return {
+            "id": produto.id,
+            "title": produto.titulo,
+            "price": float(produto.preco),
+            "description": produto.descricao,
+            "category": produto.categoria,
+            "image": produto.imagem,
+            "rating": {
+                "rate": float(produto.avaliacao_nota)
+                if produto.avaliacao_nota is not None else None,
+                "count": produto.avaliacao_contagem,
+            },
+        }
+
+    async def todos(self) -> List[Produto]:
+        """
+        Retorna todos os produtos da réplica local, ordenados por ID.
+
+        :return: Lista de objetos Produto.
+        """
+        self.logger.debug("Obtendo todos os produtos da replica local.")
+        resultado = await self.db.scalars(select(Produto).order_by(Produto.id))
+        return list(resultado.all())
+
+    async def pegar_por_id(self, produto_id: int) -> Produto | None:
+        """
+        Busca um produto da réplica local pelo ID.
+
+        :param produto_id: ID do produto.
+        :return: Objeto Produto ou None se não encontrado.
+        """
+        self.logger.debug(f"Obtendo produto da replica por ID: {produto_id}")
+        return await self.db.get(Produto, produto_id)
+
+    async def pegar_por_ids(self, produto_ids: List[int]) -> List[Produto]:
+        """
+        Busca vários produtos da réplica local em uma única consulta.
+
+        :param produto_ids: Lista de IDs dos produtos.
+        :return: Lista de objetos Produto encontrados (os ausentes são omitidos).
+        """
+        self.logger.debug(f"Obtendo {len(produto_ids)} produtos da replica por ID.")
+        resultado = await self.db.scalars(
+            select(Produto).where(Produto.id.in_(produto_ids)))
+        return list(resultado.all())
+
+    async def sincronizar(self, produtos: List[Dict[str, Any]],
+                          tamanho_lote: int = 1000) -> Tuple[Dict[str, int], List[int]]:
+        """
+        Insere ou atualiza em lote os produtos recebidos da API externa.
+
+        Apenas linhas novas ou com conteúdo diferente são escritas; as demais são
+        ignoradas pela comparação do hash do conteúdo. As linhas alteradas vão em
+        comandos de até `tamanho_lote` produtos, para não passar do limite de
+        32767 parâmetros por comando do Postgres (9 por produto).
+
+        :param produtos: Lista de produtos no formato da Fake Store API.
+        :param tamanho_lote: Produtos por comando INSERT ... ON CONFLICT.
+        :return: Contagem de linhas inseridas, atualizadas e inalteradas, e os
+                 IDs dos produtos inseridos ou atualizados.
+        :raises Exception: Em caso de erro na gravação.
+        """
+        linhas = [self.de_api(produto) for produto in produtos
+                  if isinstance(produto, dict) and "id" in produto]
+        existentes = dict((await self.db.execute(
+            select(Produto.id, Produto.hash_conteudo))).all())
+
+        alteradas = [linha for linha in linhas
+                     if existentes.get(linha["id"]) != linha["hash_conteudo"]]
+        contagem = {
+            "inseridos": sum(1 for linha in alteradas
+                             if linha["id"] not in existentes),
+            "atualizados": sum(1 for linha in alteradas
+                               if linha["id"] in existentes),
+            "inalterados": len(linhas) - len(alteradas),
+        }
+        ids_alterados = [linha["id"] for linha in alteradas]
+        if not alteradas:
+            return contagem, ids_alterados
+
+        self.logger.info(f"Sincronizando {len(alteradas)} produtos "
+                         f"alterados na replica local.")
+        try:
+            for inicio in range(0, len(alteradas), tamanho_lote):
+                lote = alteradas[inicio:inicio + tamanho_lote]
+                stmt = insert(Produto).values(lote)
+                colunas = {coluna: stmt.excluded[coluna]
+                           for coluna in lote[0] if coluna != "id"}
+                colunas["sincronizado_em"] = func.now()
+                colunas["updated_at"] = func.now()
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Produto.id],
+                    set_=colunas,
+                    where=Produto.hash_conteudo != stmt.excluded.hash_conteudo)
+                await self.db.execute(stmt)
+            return contagem, ids_alterados
+        except Exception as e:
+            self.logger.error(f"Erro ao sincronizar produtos: {e}", exc_info=True)
+            raise
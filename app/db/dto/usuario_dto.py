@@ -1,21 +1,28 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import LEITURA_REPLICA
 from app.core.logger import logger
 from app.db.models.usuario_model import Usuario
 
+# Consulta montada uma única vez (roda em toda requisição autenticada): a cada
+# chamada só o parâmetro muda e o SQL compilado sai do cache do SQLAlchemy.
+_USUARIO_POR_ID = (select(Usuario).where(Usuario.id == bindparam("usuario_id"))
+                   .execution_options(**LEITURA_REPLICA))
+
 
 class UsuarioDTO:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Inicializa o DTO (Data Transfer Object) responsável pelas operações
         relacionadas à entidade Usuario no banco de dados.
 
-        :param db: Sessão ativa do SQLAlchemy.
+        :param db: Sessão assíncrona ativa do SQLAlchemy.
         """
         self.db = db
         self.logger = logger
 
-    def pegar_por_email(self, email: str) -> Usuario | None:
+    async def pegar_por_email(self, email: str) -> Usuario | None:
         """
         Busca usuário por e-mail.
 
@@ -23,19 +30,23 @@ class UsuarioDTO:
         :return: Objeto Usuario se encontrado, ou None.
         """
         self.logger.debug(f"Obtendo usuario por e-mail: {email}")
-        return self.db.query(Usuario).filter(Usuario.email == email).first()
+        return await self.db.scalar(
+            select(Usuario).where(Usuario.email == email).limit(1))
 
-    def usuario_por_id(self, usuario_id: int) -> Usuario | None:
+    async def usuario_por_id(self, usuario_id: int) -> Usuario | None:
         """
-        Busca usuário por ID.
+        Busca usuário por ID. Pode ser atendida pela réplica.
+
+        Assim como `ClienteDTO.pegar_por_id`, troca o atalho do identity map do
+        `db.get` por uma consulta pronta, mais barata na primeira busca da sessão.
 
         :param usuario_id: ID do usuário.
         :return: Objeto Usuario se encontrado, ou None.
         """
         self.logger.debug(f"Obtendo usuario por ID: {usuario_id}")
-        return self.db.query(Usuario).filter(Usuario.id == usuario_id).first()
+        return await self.db.scalar(_USUARIO_POR_ID, {"usuario_id": usuario_id})
 
-    def pegar_por_cliente_id(self, cliente_id: int) -> Usuario | None:
+    async def pegar_por_cliente_id(self, cliente_id: int) -> Usuario | None:
         """
         Recupera usuário por um cliente específico.
 
@@ -43,10 +54,10 @@ class UsuarioDTO:
         :return: Objeto Usuario vinculado ao cliente, ou None.
         """
         self.logger.debug(f"Obtendo usuario por ID do cliente: {cliente_id}")
-        return self.db.query(Usuario).filter(
-            Usuario.cliente_id == cliente_id).first()
+        return await self.db.scalar(
+            select(Usuario).where(Usuario.cliente_id == cliente_id).limit(1))
 
-    def registrar(self, usuario_data: dict) -> Usuario:
+    async def registrar(self, usuario_data: dict) -> Usuario:
         """
         Registra usuário no banco de dados.
 
@@ -59,8 +70,7 @@ class UsuarioDTO:
         try:
             db_user = Usuario(**usuario_data)
             self.db.add(db_user)
-            self.db.commit()
-            self.db.refresh(db_user)
+            await self.db.flush()
             self.logger.info(f"Usuario criado com sucesso com ID: "
                              f"{db_user.id}")
             return db_user
@@ -68,7 +78,7 @@ class UsuarioDTO:
             self.logger.error(f"Erro ao criar usuário: {e}", exc_info=True)
             raise
 
-    def deletar(self, usuario: Usuario) -> None:
+    async def deletar(self, usuario: Usuario) -> None:
         """
         Exclui usuário do banco de dados.
 
@@ -78,15 +88,15 @@ class UsuarioDTO:
         """
         self.logger.info(f"Excluindo usuario com ID: {usuario.id}")
         try:
-            self.db.delete(usuario)
-            self.db.commit()
+            await self.db.delete(usuario)
+            await self.db.flush()
             self.logger.info(f"Usuario excluido com sucesso: {usuario.id}")
         except Exception as e:
             self.logger.error(f"Erro ao excluir o ID do usuário "
                               f"{usuario.id}: {e}", exc_info=True)
             raise
 
-    def aualizacao(self, db_usuario: Usuario, update_data: dict) -> Usuario:
+    async def aualizacao(self, db_usuario: Usuario, update_data: dict) -> Usuario:
         """
         Atualiza os dados de usuário existente.
 
@@ -100,8 +110,7 @@ class UsuarioDTO:
             for key, value in update_data.items():
                 setattr(db_usuario, key, value)
             self.db.add(db_usuario)
-            self.db.commit()
-            self.db.refresh(db_usuario)
+            await self.db.flush()
             self.logger.info(f"Usuario atualizado com sucesso: "
                              f"{db_usuario.id}")
             return db_usuario
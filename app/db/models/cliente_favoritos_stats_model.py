@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric
+from app.db.models.base import Base
+
+
+class ClienteFavoritosStats(Base):
+    """
+    Modelo ORM para a tabela 'cliente_favoritos_stats'.
+    Estatísticas dos favoritos de cada cliente (quantidade, valor total e
+    última atividade), mantidas por triggers no banco a cada alteração em
+    'favoritos' (ver init.sql); a aplicação apenas lê.
+    """
+    __tablename__ = "cliente_favoritos_stats"
+
+    cliente_id = Column(Integer, ForeignKey("clientes.id", ondelete="CASCADE"), primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0, server_default="0")
+    valor_total = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    ultima_atividade = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, Index, null
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.models.base import Base
@@ -16,8 +16,23 @@ class Cliente(Base):
 
     nome = Column(String, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    favoritos_versao = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
-    usuario = relationship("Usuario", back_populates="cliente")
-    favoritos = relationship("Favorito", back_populates="cliente", cascade="all, delete-orphan")
+    # Colunas geradas pelo banco (created_at, updated_at) voltam no próprio
+    # INSERT/UPDATE ... RETURNING, sem um refresh depois do flush. O NULL
+    # explícito de updated_at no INSERT entra no RETURNING; sem ele o
+    # eager_defaults faria um SELECT extra para carregar a coluna.
+    __mapper_args__ = {"eager_defaults": True}
+
+    # passive_deletes: ao excluir o cliente, usuario e favoritos são removidos
+    # pelo ON DELETE CASCADE das chaves estrangeiras, sem carregá-los na sessão.
+    usuario = relationship("Usuario", back_populates="cliente", passive_deletes=True)
+    favoritos = relationship("Favorito", back_populates="cliente",
+                             cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # Paginação por cursor (keyset) em (created_at, id).
+        Index('ix_clientes_created_at_id', 'created_at', 'id'),
+    )
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Numeric, String, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, DateTime, ForeignKey, Index, Numeric, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.db.models.base import Base
 
@@ -18,11 +19,19 @@ class Favorito(Base):
     imagem = Column(String, nullable=False)
     preco = Column(Numeric(10, 2), nullable=False)
     review = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Documento da busca textual, gerado pelo banco a partir de titulo e review.
+    busca = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', coalesce(titulo, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(review, '')), 'B')",
+        persisted=True)))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     cliente = relationship("Cliente", back_populates="favoritos")
 
     __table_args__ = (
         UniqueConstraint('cliente_id', 'produto_id', name='uq_cliente_produto'),
+        Index('ix_favoritos_busca', 'busca', postgresql_using='gin'),
+        # Paginação por cursor (keyset) dos favoritos de cada cliente.
+        Index('ix_favoritos_cliente_created_at_id', 'cliente_id', 'created_at', 'id'),
     )
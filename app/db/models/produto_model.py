@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, DateTime, Numeric, String
+from sqlalchemy.sql import func
+from app.db.models.base import Base
+
+
+class Produto(Base):
+    """
+    Modelo ORM para a tabela 'produtos'.
+    Réplica local do catálogo da Fake Store API, mantida pela sincronização periódica.
+    O ID é o mesmo do produto na API externa.
+    """
+    __tablename__ = "produtos"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    titulo = Column(String, nullable=False)
+    preco = Column(Numeric(10, 2), nullable=False)
+    descricao = Column(String, nullable=True)
+    categoria = Column(String, index=True, nullable=True)
+    imagem = Column(String, nullable=True)
+    avaliacao_nota = Column(Numeric(3, 2), nullable=True)
+    avaliacao_contagem = Column(Integer, nullable=True)
+    hash_conteudo = Column(String(32), nullable=False)
+    sincronizado_em = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, null
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.models.base import Base, pwd_context
@@ -18,12 +18,18 @@ class Usuario(Base):
     cliente_id = Column(Integer, ForeignKey("clientes.id",
                                             ondelete="CASCADE"),
                         unique=True, nullable=True)
+    # Sem "refresh-expire": com AsyncSession o cliente expirado por um refresh
+    # do usuário não pode ser recarregado de forma preguiçosa.
     cliente = relationship("Cliente", back_populates="usuario",
-                           uselist=False, cascade="all, delete-orphan",
+                           uselist=False,
+                           cascade="save-update, merge, delete, delete-orphan",
                            single_parent=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # NULL explícito no INSERT: updated_at volta no RETURNING (ver Cliente).
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
+
+    __mapper_args__ = {"eager_defaults": True}
 
     def verify_password(self, password: str):
         """Verifica se a senha fornecida corresponde à senha hasheada."""
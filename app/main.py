@@ -4,9 +4,14 @@ from fastapi import FastAPI, Request
 from fastapi.responses import PlainTextResponse
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.api.routers import auth_router, clientes_router, favoritos_router, produtos_router
+from app.api.routers import (admin_router, auth_router, clientes_router, favoritos_router,
+                             produtos_router)
 from app.core.config import settings
+from app.core.database import definir_destino_leituras, engine, engine_leitura
+from app.core.http_client import iniciar_http_client, fechar_http_client
 from app.core.logger import logger
+from app.services.catalogo_sync_service import (iniciar_sincronizacao_catalogo,
+                                                parar_sincronizacao_catalogo)
 from app.util.metrics import REQUESTS_TOTAL, REQUEST_DURATION_SECONDS, generate_latest
 
 logger.info("Aplicativo iniciando. Inicializacao do banco de dados tratada por init.sql.")
@@ -21,6 +26,10 @@ app = FastAPI(
 
 app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY_SESSION)
 
+# Cookie que mantém as leituras no primário logo depois de uma escrita.
+COOKIE_LEITURA_PRIMARIO = "db_primario"
+METODOS_SEGUROS = {"GET", "HEAD", "OPTIONS"}
+
 
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -53,10 +62,41 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def rotear_leituras_para_replica(request: Request, call_next):
+    """
+    Middleware que decide se as leituras da requisição podem ir à réplica.
+
+    Só atua com `DATABASE_READ_URL` configurada.
+
+    - Requisições de escrita (POST, PUT, DELETE...) usam apenas o primário.
+    - Depois de uma escrita bem-sucedida, o cookie `db_primario` mantém as leituras
+      do mesmo cliente no primário por `DB_LEITURA_JANELA_PRIMARIO_SEGUNDOS`
+      (read-your-writes enquanto a réplica alcança o primário).
+
+    - request: Objeto da requisição HTTP.
+    - call_next: Função para passar a requisição para o próximo handler.
+
+    - return: Resposta HTTP, com o cookie após escritas.
+    """
+    if engine_leitura is None:
+        return await call_next(request)
+
+    escrita = request.method not in METODOS_SEGUROS
+    if escrita or request.cookies.get(COOKIE_LEITURA_PRIMARIO):
+        definir_destino_leituras("principal")
+    response = await call_next(request)
+    if escrita and response.status_code < 400:
+        response.set_cookie(COOKIE_LEITURA_PRIMARIO, "1", httponly=True, samesite="lax",
+                            max_age=settings.DB_LEITURA_JANELA_PRIMARIO_SEGUNDOS)
+    return response
+
+
 app.include_router(auth_router.router)
 app.include_router(clientes_router.router)
 app.include_router(favoritos_router.router)
 app.include_router(produtos_router.router)
+app.include_router(admin_router.router)
 
 
 @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
@@ -89,11 +129,14 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     """
-    Evento disparado quando a aplicação é encerrada.
+    Evento disparado quando a aplicação é iniciada.
 
-    Ideal para liberar recursos, encerrar conexões com banco de dados ou fazer flush de logs.
+    Cria o cliente HTTP compartilhado, aquece a conexão com a API externa e
+    agenda a sincronização periódica da réplica local do catálogo.
     """
-    logger.info("Aplicacaoo iniciada.")
+    await iniciar_http_client()
+    iniciar_sincronizacao_catalogo()
+    logger.info("Aplicacao iniciada.")
 
 
 @app.on_event("shutdown")
@@ -102,5 +145,12 @@ async def shutdown_event():
     Evento disparado quando a aplicação é encerrada.
 
     Ideal para liberar recursos, encerrar conexões com banco de dados ou flush de logs.
+    Encerra a sincronização do catálogo, fecha o cliente HTTP compartilhado e
+    as conexões do pool do banco.
     """
+    await parar_sincronizacao_catalogo()
+    await fechar_http_client()
+    await engine.dispose()
+    if engine_leitura is not None:
+        await engine_leitura.dispose()
     logger.info("Aplicacao finalizada.")
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+PESO_TITULO = 3.0
+PESO_DESCRICAO = 1.0
+
+
+def _preco(produto: Dict[str, Any]) -> float:
+    try:
+        return float(produto.get("price") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _texto(valor: Any) -> str:
+    return str(valor or "").casefold()
+
+
+def _termos(valor: Any) -> List[str]:
+    """
+    Quebra um texto em termos normalizados (minúsculos e sem acentos).
+    """
+    texto = unicodedata.normalize("NFKD", _texto(valor))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return re.findall(r"\w+", texto)
+
+
+class CatalogoIndice:
+    def __init__(self, produtos: List[Dict[str, Any]]):
+        """
+        Índice em memória sobre um snapshot do catálogo de produtos.
+
+        Pré-calcula, uma única vez por snapshot, os buckets por categoria, as
+        listas ordenadas por preço e por título e um índice invertido de termos
+        do título e da descrição, para que filtros, busca, ordenação e paginação
+        sejam respondidos sem percorrer e ordenar o catálogo inteiro a cada
+        requisição.
+
+        :param produtos: Lista de produtos no formato da Fake Store API.
+        """
+        self.produtos = produtos
+        self.versao = hashlib.md5(json.dumps(
+            produtos, sort_keys=True, default=str).encode()).hexdigest()
+
+        self.por_categoria: Dict[str, List[Dict[str, Any]]] = {}
+        for produto in produtos:
+            self.por_categoria.setdefault(
+                _texto(produto.get("category")), []).append(produto)
+
+        self.ordenado_preco = sorted(
+            produtos, key=lambda p: (_preco(p), p.get("id") or 0))
+        self._precos = [_preco(produto) for produto in self.ordenado_preco]
+        self.ordenado_titulo = sorted(
+            produtos, key=lambda p: (_texto(p.get("title")), p.get("id") or 0))
+
+        self.indice_invertido: Dict[str, Dict[int, float]] = {}
+        for posicao, produto in enumerate(produtos):
+            for campo, peso in (("title", PESO_TITULO),
+                                ("description", PESO_DESCRICAO)):
+                for termo in _termos(produto.get(campo)):
+                    ocorrencias = self.indice_invertido.setdefault(termo, {})
+                    ocorrencias[posicao] = ocorrencias.get(posicao, 0.0) + peso
+        self._vocabulario = sorted(self.indice_invertido)
+
+    def _pontuar(self, texto: str) -> Dict[int, float]:
+        """
+        Pontua os produtos que contêm todos os termos do texto.
+
+        Cada termo da consulta casa por prefixo com o vocabulário do índice
+        (busca binária), e a pontuação soma os pesos das ocorrências no título
+        e na descrição.
+
+        :return: Dicionário posição do produto -> pontuação.
+        """
+        pontuacao: Optional[Dict[int, float]] = None
+        for termo in set(_termos(texto)):
+            do_termo: Dict[int, float] = {}
+            inicio = bisect_left(self._vocabulario, termo)
+            for vocabulo in islice(self._vocabulario, inicio, None):
+                if not vocabulo.startswith(termo):
+                    break
+                for posicao, peso in self.indice_invertido[vocabulo].items():
+                    do_termo[posicao] = do_termo.get(posicao, 0.0) + peso
+
+            if pontuacao is None:
+                pontuacao = do_termo
+            else:
+                pontuacao = {posicao: pontos + do_termo[posicao]
+                             for posicao, pontos in pontuacao.items()
+                             if posicao in do_termo}
+            if not pontuacao:
+                return {}
+        return pontuacao or {}
+
+    def buscar(self, texto: str, limite: int, deslocamento: int = 0
+               ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Busca produtos pelo texto, ordenados por relevância.
+
+        :param texto: Termos procurados no título e na descrição.
+        :param limite: Quantidade máxima de produtos na página.
+        :param deslocamento: Posição inicial dentro do resultado.
+        :return: Tupla com os produtos da página e o deslocamento da próxima
+                 página (None se não houver mais produtos).
+        """
+        pontuacao = self._pontuar(texto)
+        posicoes = sorted(pontuacao, key=lambda posicao: (
+            -pontuacao[posicao], self.produtos[posicao].get("id") or 0))
+        pagina = [self.produtos[posicao]
+                  for posicao in posicoes[deslocamento:deslocamento + limite]]
+        proximo = deslocamento + limite \
+            if len(posicoes) > deslocamento + limite else None
+        return pagina, proximo
+
+    def _sequencia(self, categoria: Optional[str], preco_min: Optional[float],
+                   preco_max: Optional[float], ordenacao: Optional[str]
+                   ) -> Iterable[Dict[str, Any]]:
+        filtrar_preco = True
+        if ordenacao == "price":
+            inicio = bisect_left(self._precos, preco_min) \
+                if preco_min is not None else 0
+            fim = bisect_right(self._precos, preco_max) \
+                if preco_max is not None else len(self._precos)
+            sequencia = self.ordenado_preco[inicio:fim]
+            filtrar_preco = False
+        elif ordenacao == "title":
+            sequencia = self.ordenado_titulo
+        elif categoria is not None:
+            return self._filtrar_preco(
+                self.por_categoria.get(_texto(categoria), []), preco_min, preco_max)
+        else:
+            sequencia = self.produtos
+
+        if categoria is not None:
+            categoria = _texto(categoria)
+            sequencia = (p for p in sequencia
+                         if _texto(p.get("category")) == categoria)
+        if filtrar_preco:
+            sequencia = self._filtrar_preco(sequencia, preco_min, preco_max)
+        return sequencia
+
+    @staticmethod
+    def _filtrar_preco(sequencia: Iterable[Dict[str, Any]],
+                       preco_min: Optional[float], preco_max: Optional[float]
+                       ) -> Iterable[Dict[str, Any]]:
+        if preco_min is not None:
+            sequencia = (p for p in sequencia if _preco(p) >= preco_min)
+        if preco_max is not None:
+            sequencia = (p for p in sequencia if _preco(p) <= preco_max)
+        return sequencia
+
+    def consultar(self, limite: int, deslocamento: int = 0,
+                  categoria: Optional[str] = None,
+                  preco_min: Optional[float] = None,
+                  preco_max: Optional[float] = None,
+                  ordenacao: Optional[str] = None,
+                  texto: Optional[str] = None
+                  ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Retorna uma página do catálogo aplicando filtros e ordenação.
+
+        :param limite: Quantidade máxima de produtos na página.
+        :param deslocamento: Posição inicial dentro do resultado filtrado.
+        :param categoria: Categoria exata (sem diferenciar maiúsculas).
+        :param preco_min: Preço mínimo (inclusivo).
+        :param preco_max: Preço máximo (inclusivo).
+        :param ordenacao: 'price', 'title' ou None (ordem do catálogo).
+        :param texto: Termos procurados no título ou na descrição.
+        :return: Tupla com os produtos da página e o deslocamento da próxima
+                 página (None se não houver mais produtos).
+        """
+        sequencia = self._sequencia(categoria, preco_min, preco_max, ordenacao)
+        if texto:
+            encontrados: Set[int] = {id(self.produtos[posicao])
+                                     for posicao in self._pontuar(texto)}
+            sequencia = (p for p in sequencia if id(p) in encontrados)
+
+        pagina = list(islice(sequencia, deslocamento, deslocamento + limite + 1))
+        proximo = deslocamento + limite if len(pagina) > limite else None
+        return pagina[:limite], proximo
@@ -0,0 +1,201 @@
+import asyncio
+import math
+import time
+from typing import Any, Collection, Dict, List, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import SessionLocal, unidade_de_trabalho
+from app.core.logger import logger
+from app.db.dto.favorito_dto import FavoritoDTO
+from app.db.dto.produto_dto import ProdutoDTO
+from app.services.product_service import (ProdutoService, cache_lista_produtos,
+                                          cache_produto)
+from app.util.metrics import (CATALOGO_SYNC_DURACAO_SEGUNDOS,
+                              CATALOGO_SYNC_LINHAS_TOTAL,
+                              CATALOGO_SYNC_ATRASO_SEGUNDOS,
+                              FAVORITOS_REFRESH_DURACAO_SEGUNDOS,
+                              FAVORITOS_REFRESH_LINHAS_TOTAL)
+
+_ultimo_sucesso: float | None = None
+_tarefa_sincronizacao: asyncio.Task | None = None
+# Produtos alterados no catálogo cujos favoritos ainda não foram atualizados.
+# None até a primeira atualização bem-sucedida do processo, que compara todos.
+_favoritos_pendentes: Set[int] | None = None
+
+
+def atraso_sincronizacao() -> float:
+    """
+    Retorna quantos segundos se passaram desde a última sincronização com sucesso.
+
+    :return: Atraso em segundos, ou NaN se nenhuma sincronização foi concluída.
+    """
+    if _ultimo_sucesso is None:
+        return math.nan
+    return time.time() - _ultimo_sucesso
+
+
+CATALOGO_SYNC_ATRASO_SEGUNDOS.set_function(atraso_sincronizacao)
+
+
+class CatalogoSyncService:
+    def __init__(self):
+        """
+        Serviço responsável por manter a réplica local do catálogo (tabela 'produtos')
+        sincronizada com a Fake Store API.
+
+        A cada execução o catálogo é buscado em lote na API externa e apenas as
+        linhas novas ou alteradas são gravadas. Se a API externa estiver fora,
+        a réplica continua servindo os dados da última sincronização.
+
+        Em seguida os dados de produto copiados nos favoritos (titulo, imagem e
+        preco) são atualizados a partir do mesmo catálogo.
+        """
+        self.produto_service = ProdutoService()
+        self.logger = logger
+
+    async def sincronizar(self) -> Dict[str, int]:
+        """
+        Executa uma sincronização completa do catálogo.
+
+        :return: Contagem de linhas inseridas, atualizadas e inalteradas.
+        :raises HTTPException: Em caso de erro na API externa.
+        :raises SQLAlchemyError: Em caso de erro ao gravar na réplica ou nos favoritos.
+        """
+        global _ultimo_sucesso
+        inicio = time.perf_counter()
+        resultado = "erro"
+        try:
+            produtos = await self.produto_service.buscar_produtos_api()
+            contagem, alterados = await self._gravar(produtos)
+            resultado = "sucesso"
+        finally:
+            CATALOGO_SYNC_DURACAO_SEGUNDOS.labels(resultado=resultado).observe(
+                time.perf_counter() - inicio)
+
+        _ultimo_sucesso = time.time()
+        for operacao, quantidade in contagem.items():
+            CATALOGO_SYNC_LINHAS_TOTAL.labels(operacao=operacao).inc(quantidade)
+
+        if contagem["inseridos"] or contagem["atualizados"]:
+            cache_lista_produtos.invalidar()
+            cache_produto.invalidar()
+
+        self.logger.info(f"Sincronizacao do catalogo concluida em "
+                         f"{time.perf_counter() - inicio:.2f}s: {contagem}")
+
+        await self.atualizar_favoritos(produtos, alterados)
+        return contagem
+
+    async def _gravar(self, produtos: List[Dict[str, Any]]) -> Tuple[Dict[str, int], List[int]]:
+        async with SessionLocal() as db, unidade_de_trabalho(db):
+            return await ProdutoDTO(db).sincronizar(
+                produtos, tamanho_lote=settings.PRODUTOS_SYNC_TAMANHO_LOTE)
+
+    async def atualizar_favoritos(self, produtos: List[Dict[str, Any]],
+                                  alterados: Collection[int] | None = None) -> int:
+        """
+        Atualiza titulo, imagem e preco copiados nos favoritos a partir do catálogo.
+
+        Os produtos favoritados com dados divergentes são atualizados em lotes de
+        `FAVORITOS_REFRESH_TAMANHO_LOTE`, um comando `UPDATE ... FROM (VALUES ...)`
+        por lote, sem carregar os favoritos na aplicação.
+
+        Só são comparados os produtos alterados na sincronização, somados aos de
+        atualizações anteriores que falharam. A primeira atualização do processo
+        (ou uma chamada sem `alterados`) compara todos os produtos favoritados.
+
+        :param produtos: Lista de produtos no formato da Fake Store API.
+        :param alterados: IDs dos produtos inseridos ou atualizados na réplica.
+        :return: Quantidade de favoritos atualizados.
+        :raises SQLAlchemyError: Em caso de erro ao gravar nos favoritos.
+        """
+        global _favoritos_pendentes
+        produto_ids = None
+        if _favoritos_pendentes is not None and alterados is not None:
+            _favoritos_pendentes.update(alterados)
+            produto_ids = set(_favoritos_pendentes)
+
+        inicio = time.perf_counter()
+        resultado = "erro"
+        try:
+            linhas = await self._atualizar_favoritos(produtos, produto_ids)
+            resultado = "sucesso"
+        finally:
+            FAVORITOS_REFRESH_DURACAO_SEGUNDOS.labels(resultado=resultado).observe(
+                time.perf_counter() - inicio)
+
+        if produto_ids is None:
+            _favoritos_pendentes = set()
+        else:
+            _favoritos_pendentes -= produto_ids
+        FAVORITOS_REFRESH_LINHAS_TOTAL.inc(linhas)
+        self.logger.info(f"Atualizacao dos favoritos concluida em "
+                         f"{time.perf_counter() - inicio:.2f}s: {linhas} linhas.")
+        return linhas
+
+    async def _atualizar_favoritos(self, produtos: List[Dict[str, Any]],
+                                   produto_ids: Set[int] | None) -> int:
+        tamanho = settings.FAVORITOS_REFRESH_TAMANHO_LOTE
+        if produto_ids is not None and not produto_ids:
+            return 0
+        async with SessionLocal() as db:
+            favorito_dto = FavoritoDTO(db)
+            desatualizados = await favorito_dto.produtos_desatualizados(
+                produtos, produto_ids, tamanho_lote=tamanho)
+            linhas = 0
+            # Uma transação por lote, para não segurar locks durante o refresh inteiro.
+            for inicio in range(0, len(desatualizados), tamanho):
+                async with unidade_de_trabalho(db):
+                    linhas += await favorito_dto.atualizar_dados_produtos(
+                        desatualizados[inicio:inicio + tamanho])
+            return linhas
+
+    async def executar_periodicamente(self, intervalo: float) -> None:
+        """
+        Executa a sincronização em laço, aguardando `intervalo` segundos entre execuções.
+
+        Falhas são registradas em log e não interrompem o laço.
+
+        :param intervalo: Intervalo em segundos entre sincronizações.
+        """
+        while True:
+            try:
+                await self.sincronizar()
+            except (HTTPException, SQLAlchemyError) as e:
+                self.logger.error(f"Falha na sincronizacao do catalogo: {e}")
+            except Exception as e:
+                self.logger.critical(f"Erro nao tratado na sincronizacao "
+                                     f"do catalogo: {e}", exc_info=True)
+            await asyncio.sleep(intervalo)
+
+
+def iniciar_sincronizacao_catalogo() -> None:
+    """
+    Agenda a sincronização periódica do catálogo, se habilitada em `Settings`.
+    """
+    global _tarefa_sincronizacao
+    intervalo = settings.PRODUTOS_SYNC_INTERVALO_SEGUNDOS
+    if intervalo <= 0:
+        logger.info("Sincronizacao periodica do catalogo desabilitada.")
+        return
+    _tarefa_sincronizacao = asyncio.create_task(
+        CatalogoSyncService().executar_periodicamente(intervalo))
+    logger.info(f"Sincronizacao do catalogo agendada a cada {intervalo}s.")
+
+
+async def parar_sincronizacao_catalogo() -> None:
+    """
+    Cancela a sincronização periódica do catálogo, se estiver em execução.
+    """
+    global _tarefa_sincronizacao
+    if _tarefa_sincronizacao is None:
+        return
+    _tarefa_sincronizacao.cancel()
+    try:
+        await _tarefa_sincronizacao
+    except asyncio.CancelledError:
+        pass
+    _tarefa_sincronizacao = None
@@ -1,11 +1,50 @@
+import asyncio
 import json
+import math
+import random
 from typing import Dict, Any, List
 
 import httpx
 from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.http_client import pegar_http_client
 from app.core.logger import logger
+from app.db.dto.favorito_dto import FavoritoDTO
+from app.db.dto.produto_dto import ProdutoDTO
+from app.services.catalogo_indice import CatalogoIndice
+from app.util.cache import CacheTTL
+from app.util.circuit_breaker import CircuitBreaker
+from app.util.metrics import HTTP_RETENTATIVAS_TOTAL
+from app.util.single_flight import SingleFlight
+
+CHAVE_LISTA_PRODUTOS = "todos"
+
+cache_lista_produtos = CacheTTL(
+    "produtos_lista", max_itens=1,
+    ttl=settings.PRODUTOS_CACHE_TTL_SEGUNDOS,
+    stale=settings.PRODUTOS_CACHE_STALE_SEGUNDOS)
+
+cache_produto = CacheTTL(
+    "produto", max_itens=settings.PRODUTOS_CACHE_MAX_ITENS,
+    ttl=settings.PRODUTOS_CACHE_TTL_SEGUNDOS,
+    stale=settings.PRODUTOS_CACHE_STALE_SEGUNDOS)
+
+voo_lista_produtos = SingleFlight("produtos_lista")
+voo_produto = SingleFlight("produto")
+
+circuito_fake_store = CircuitBreaker(
+    "fake_store_api",
+    limite_falhas=settings.CIRCUITO_LIMITE_FALHAS,
+    tempo_aberto=settings.CIRCUITO_TEMPO_ABERTO_SEGUNDOS)
+
+# Último catálogo completo obtido com sucesso, usado como fallback em falhas.
+_ultimo_catalogo: List[Dict[str, Any]] = []
+
+# Índice do snapshot atual do catálogo, reconstruído quando o snapshot muda.
+_indice_catalogo: CatalogoIndice | None = None
 
 
 class ProdutoService:
@@ -14,17 +53,299 @@ class ProdutoService:
         pass
 
     async def pegar_produtos_api(self) -> List[Dict[str, Any]]:
+        """
+        Retorna o catálogo completo de produtos, servido a partir do cache em memória.
+
+        Em caso de miss o catálogo é lido da réplica local (tabela 'produtos') e,
+        se ela ainda estiver vazia, buscado na API externa, com chamadas
+        concorrentes agrupadas em uma única requisição. Cada produto da lista
+        também alimenta o cache individual usado por `pegar_produto_por_id_api`.
+
+        :return: Lista de dicionários com os produtos.
+        :raises HTTPException: Em caso de erro na API externa.
+        """
+        return await cache_lista_produtos.pegar_ou_carregar(
+            CHAVE_LISTA_PRODUTOS,
+            lambda: voo_lista_produtos.executar(
+                CHAVE_LISTA_PRODUTOS, self._carregar_produtos))
+
+    async def pegar_indice_catalogo(self) -> CatalogoIndice:
+        """
+        Retorna o índice em memória do snapshot atual do catálogo.
+
+        O índice é reconstruído apenas quando o cache entrega um snapshot novo.
+
+        :return: Objeto CatalogoIndice.
+        :raises HTTPException: Em caso de erro ao carregar o catálogo.
+        """
+        global _indice_catalogo
+        produtos = await self.pegar_produtos_api()
+        if _indice_catalogo is None or _indice_catalogo.produtos is not produtos:
+            self.logger.debug(f"Reconstruindo indice do catalogo "
+                              f"({len(produtos)} produtos).")
+            _indice_catalogo = CatalogoIndice(produtos)
+        return _indice_catalogo
+
+    async def pegar_produto_por_id_api(self, produto_id: int) -> Dict[str, Any]:
+        """
+        Retorna um produto pelo ID, servido a partir do cache em memória.
+
+        Em caso de miss o produto é lido da réplica local e, se não estiver lá,
+        buscado na API externa. Buscas concorrentes pelo mesmo produto aguardam
+        a mesma requisição.
+
+        :param produto_id: ID do produto na API externa.
+        :return: Dicionário com os dados do produto.
+        :raises HTTPException: 404 se o produto não existir, ou erro da API externa.
+        """
+        return await cache_produto.pegar_ou_carregar(
+            produto_id,
+            lambda: voo_produto.executar(
+                produto_id,
+                lambda: self._carregar_produto(produto_id)))
+
+    async def pegar_produtos_por_ids(
+            self, produto_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Resolve vários produtos em uma única chamada, com resultado por ID.
+
+        Os IDs são resolvidos primeiro pelo cache em memória, depois por uma única
+        consulta na réplica local e, para os restantes, por chamadas concorrentes
+        à API externa limitadas por `PRODUTOS_LOTE_CONCORRENCIA`.
+
+        :param produto_ids: Lista de IDs dos produtos (duplicados são ignorados).
+        :return: Lista com um item por ID contendo `produto` ou `erro` e `status`.
+        """
+        ids = list(dict.fromkeys(produto_ids))
+        resultados: Dict[int, Dict[str, Any]] = {}
+
+        faltantes = []
+        for produto_id in ids:
+            produto = cache_produto.pegar(produto_id)
+            if produto is not None:
+                resultados[produto_id] = produto
+            else:
+                faltantes.append(produto_id)
+
+        if faltantes:
+            da_replica = await self._produtos_replica_por_ids(faltantes)
+            for produto in da_replica:
+                cache_produto.definir(produto["id"], produto)
+                resultados[produto["id"]] = produto
+            faltantes = [produto_id for produto_id in faltantes
+                         if produto_id not in resultados]
+
+        erros: Dict[int, HTTPException] = {}
+        if faltantes:
+            self.logger.info(f"Buscando {len(faltantes)} produtos do lote "
+                             f"na API externa.")
+            semaforo = asyncio.Semaphore(settings.PRODUTOS_LOTE_CONCORRENCIA)
+
+            async def buscar(produto_id: int) -> None:
+                async with semaforo:
+                    try:
+                        produto = await voo_produto.executar(
+                            produto_id,
+                            lambda: self._buscar_produto_por_id_api(produto_id))
+                        cache_produto.definir(produto_id, produto)
+                        resultados[produto_id] = produto
+                    except HTTPException as e:
+                        erros[produto_id] = e
+
+            await asyncio.gather(*[buscar(produto_id) for produto_id in faltantes])
+
+        lote = []
+        for produto_id in ids:
+            if produto_id in resultados:
+                lote.append({"id": produto_id, "status": status.HTTP_200_OK,
+                             "produto": resultados[produto_id]})
+            else:
+                erro = erros.get(produto_id)
+                lote.append({
+                    "id": produto_id,
+                    "status": erro.status_code if erro
+                    else status.HTTP_404_NOT_FOUND,
+                    "erro": erro.detail if erro else "Produto não encontrado."
+                })
+        return lote
+
+    async def _carregar_produtos(self) -> List[Dict[str, Any]]:
+        global _ultimo_catalogo
+        produtos = await self._produtos_replica()
+        if not produtos:
+            self.logger.info("Replica local de produtos vazia. "
+                             "Buscando catalogo na API externa.")
+            try:
+                produtos = await self.buscar_produtos_api()
+            except HTTPException as e:
+                if e.status_code < 500 or not _ultimo_catalogo:
+                    raise
+                self.logger.warning(f"API externa indisponivel ({e.status_code}). "
+                                    f"Servindo o ultimo catalogo conhecido.")
+                return _ultimo_catalogo
+        _ultimo_catalogo = produtos
+        for produto in produtos:
+            if isinstance(produto, dict) and "id" in produto:
+                cache_produto.definir(produto["id"], produto)
+        return produtos
+
+    async def _carregar_produto(self, produto_id: int) -> Dict[str, Any]:
+        produto = await self._produto_replica(produto_id)
+        if produto is not None:
+            return produto
+        try:
+            return await self._buscar_produto_por_id_api(produto_id)
+        except HTTPException as e:
+            if e.status_code < 500:
+                raise
+            produto = await self._produto_degradado(produto_id)
+            if produto is None:
+                raise
+            self.logger.warning(f"API externa indisponivel ({e.status_code}). "
+                                f"Servindo o produto {produto_id} em modo degradado.")
+            return produto
+
+    async def _produto_degradado(self, produto_id: int) -> Dict[str, Any] | None:
+        """
+        Busca o produto no último catálogo conhecido ou, se não houver, nas colunas
+        replicadas em 'favoritos' (titulo, imagem, preco, review).
+        """
+        for produto in _ultimo_catalogo:
+            if produto.get("id") == produto_id:
+                return produto
+        return await self._produto_de_favoritos(produto_id)
+
+    async def _produto_de_favoritos(self, produto_id: int) -> Dict[str, Any] | None:
+        try:
+            async with SessionLocal() as db:
+                favorito = await FavoritoDTO(db).por_produto_id(produto_id)
+                if favorito is None:
+                    return None
+                return {
+                    "id": favorito.produto_id,
+                    "title": favorito.titulo,
+                    "price": float(favorito.preco),
+                    "description": favorito.review,
+                    "image": favorito.imagem,
+                }
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Falha ao ler o produto {produto_id} "
+                                f"dos favoritos: {e}")
+            return None
+
+    async def _get(self, url: str) -> httpx.Response:
+        """
+        Faz um GET na API externa protegido pelo circuit breaker.
+
+        Erros de conexão e respostas 5xx são repetidos até `HTTP_RETRY_TENTATIVAS`
+        vezes, com backoff exponencial e jitter. Com o circuito aberto a chamada
+        falha na hora com 503 e o cabeçalho `Retry-After`. A sondagem do circuito
+        meio aberto é uma tentativa só, e só o resultado dela fecha ou reabre o
+        circuito.
+
+        :param url: URL completa do recurso.
+        :return: Resposta HTTP (o status ainda deve ser verificado).
+        :raises HTTPException: 503 se o circuito estiver aberto.
+        :raises httpx.RequestError: Se todas as tentativas falharem por conexão.
+        """
+        if not circuito_fake_store.permitir():
+            retry_after = math.ceil(circuito_fake_store.segundos_para_tentar()) or 1
+            self.logger.warning(f"Circuito da API externa aberto. "
+                                f"Recusando chamada para {url}.")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="API externa de produtos temporariamente indisponível.",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+        sondagem = circuito_fake_store.estado == CircuitBreaker.MEIO_ABERTO
+        client = pegar_http_client()
+        tentativas = 0 if sondagem else settings.HTTP_RETRY_TENTATIVAS
+        try:
+            for tentativa in range(tentativas + 1):
+                try:
+                    response = await client.get(url)
+                except httpx.RequestError as e:
+                    if tentativa < tentativas:
+                        HTTP_RETENTATIVAS_TOTAL.labels(motivo="conexao").inc()
+                        await self._aguardar_backoff(tentativa, url, e)
+                        continue
+                    circuito_fake_store.registrar_falha(sondagem)
+                    raise
+
+                if response.status_code >= 500:
+                    if tentativa < tentativas:
+                        HTTP_RETENTATIVAS_TOTAL.labels(motivo="status_5xx").inc()
+                        await self._aguardar_backoff(
+                            tentativa, url, response.status_code)
+                        continue
+                    circuito_fake_store.registrar_falha(sondagem)
+                else:
+                    circuito_fake_store.registrar_sucesso(sondagem)
+                return response
+        finally:
+            # Cancelamento ou erro inesperado não registram resultado; sem isso a
+            # vaga de sondagem ficaria ocupada e o circuito nunca mais fecharia.
+            if sondagem:
+                circuito_fake_store.abandonar_sondagem()
+
+    async def _aguardar_backoff(self, tentativa: int, url: str, motivo) -> None:
+        espera = random.uniform(0, min(settings.HTTP_RETRY_BACKOFF_MAX,
+                                       settings.HTTP_RETRY_BACKOFF_BASE * 2 ** tentativa))
+        self.logger.warning(f"Falha ao chamar {url} ({motivo}). Nova tentativa "
+                            f"{tentativa + 1} em {espera:.2f}s.")
+        await asyncio.sleep(espera)
+
+    async def _produtos_replica(self) -> List[Dict[str, Any]]:
+        try:
+            async with SessionLocal() as db:
+                return [ProdutoDTO.para_dict(produto)
+                        for produto in await ProdutoDTO(db).todos()]
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Falha ao ler a replica local de produtos: {e}")
+            return []
+
+    async def _produtos_replica_por_ids(
+            self, produto_ids: List[int]) -> List[Dict[str, Any]]:
+        try:
+            async with SessionLocal() as db:
+                produtos = await ProdutoDTO(db).pegar_por_ids(produto_ids)
+                return [ProdutoDTO.para_dict(produto) for produto in produtos]
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Falha ao ler produtos em lote "
+                                f"da replica local: {e}")
+            return []
+
+    async def _produto_replica(self, produto_id: int) -> Dict[str, Any] | None:
+        try:
+            async with SessionLocal() as db:
+                produto = await ProdutoDTO(db).pegar_por_id(produto_id)
+                return ProdutoDTO.para_dict(produto) if produto else None
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Falha ao ler o produto {produto_id} "
+                                f"da replica local: {e}")
+            return None
+
+    async def buscar_produtos_api(self) -> List[Dict[str, Any]]:
+        """
+        Busca o catálogo completo diretamente na API externa, sem cache.
+
+        Usado pela sincronização da réplica local e como fallback quando ela
+        ainda não foi populada.
+
+        :return: Lista de dicionários com os produtos.
+        :raises HTTPException: Em caso de erro na API externa.
+        """
         self.logger.debug(f"Listando produtos a partir da API externa.")
         url = f"{settings.FAKE_STORE_API_BASE_URL}/products"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                dados_produto = response.json()
-                self.logger.info(f"Produtos {len(dados_produto)} "
-                                 f"obtidos da API externa.")
-                return dados_produto
+            response = await self._get(url)
+            response.raise_for_status()
+            dados_produto = response.json()
+            self.logger.info(f"Produtos {len(dados_produto)} "
+                             f"obtidos da API externa.")
+            return dados_produto
         except httpx.HTTPStatusError as e:
             self.logger.error(
                 f"Erro HTTP ao buscar produtos da API externa: "
@@ -42,29 +363,28 @@ class ProdutoService:
                 detail=f"Não foi possível conectar à API externa de produtos: {e}"
             )
 
-    async def pegar_produto_por_id_api(self, produto_id: int) -> Dict[str, Any]:
+    async def _buscar_produto_por_id_api(self, produto_id: int) -> Dict[str, Any]:
         self.logger.debug(f"Buscando o produto {produto_id} da API externa.")
         url = f"{settings.FAKE_STORE_API_BASE_URL}/products/{produto_id}"
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                try:
-                    dados_produto = response.json()
-                except json.JSONDecodeError as e:
-                    self.logger.error(
-                        f"JSONDecodeError ao parsear a resposta da API externa para produto {produto_id}. "
-                        f"Conteúdo recebido: '{response.text[:200]}...'. Erro: {e}",
-                        exc_info=True
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Resposta inválida da API externa "
-                               f"({response.status_code} - JSONDecodeError "
-                               f"- Produto não encontrado)."
-                    )
-                self.logger.info(f"Produto {produto_id} obtido com sucesso da API externa.")
-                return dados_produto
+            response = await self._get(url)
+            response.raise_for_status()
+            try:
+                dados_produto = response.json()
+            except json.JSONDecodeError as e:
+                self.logger.error(
+                    f"JSONDecodeError ao parsear a resposta da API externa para produto {produto_id}. "
+                    f"Conteúdo recebido: '{response.text[:200]}...'. Erro: {e}",
+                    exc_info=True
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Resposta inválida da API externa "
+                           f"({response.status_code} - JSONDecodeError "
+                           f"- Produto não encontrado)."
+                )
+            self.logger.info(f"Produto {produto_id} obtido com sucesso da API externa.")
+            return dados_produto
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 self.logger.warning(f"Produto {produto_id} não encontrado na API externa.")
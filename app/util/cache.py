@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core.logger import logger
+from app.util.metrics import CACHE_CONSULTAS_TOTAL
+
+
+class _EntradaCache:
+    __slots__ = ("valor", "criado_em")
+
+    def __init__(self, valor: Any, criado_em: float):
+        self.valor = valor
+        self.criado_em = criado_em
+
+
+class CacheTTL:
+    def __init__(self, nome: str, max_itens: int, ttl: float, stale: float = 0.0):
+        """
+        Cache em memória com expiração (TTL), descarte LRU e stale-while-revalidate.
+
+        Entradas com idade menor que `ttl` são servidas normalmente. Entre `ttl` e
+        `ttl + stale` a entrada antiga continua sendo servida enquanto uma única
+        atualização roda em segundo plano. Depois disso a entrada é descartada.
+
+        :param nome: Nome do cache, usado como label nas métricas.
+        :param max_itens: Quantidade máxima de entradas mantidas (LRU).
+        :param ttl: Tempo em segundos em que a entrada é considerada fresca.
+        :param stale: Janela extra em segundos em que a entrada antiga ainda é servida.
+        """
+        self.nome = nome
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.stale = stale
+        self._itens: OrderedDict[Hashable, _EntradaCache] = OrderedDict()
+        self._revalidando: dict[Hashable, asyncio.Task] = {}
+        self.logger = logger
+
+    def _entrada(self, chave: Hashable) -> tuple[_EntradaCache | None, bool]:
+        """
+        Retorna a entrada da chave e se ela ainda está fresca.
+
+        Entradas além da janela de stale são removidas e tratadas como ausentes.
+        """
+        entrada = self._itens.get(chave)
+        if entrada is None:
+            return None, False
+
+        idade = time.monotonic() - entrada.criado_em
+        if idade > self.ttl + self.stale:
+            del self._itens[chave]
+            return None, False
+
+        self._itens.move_to_end(chave)
+        return entrada, idade <= self.ttl
+
+    def pegar(self, chave: Hashable) -> Any | None:
+        """
+        Retorna o valor em cache se ainda estiver fresco, sem disparar carga.
+
+        :param chave: Chave da entrada.
+        :return: Valor armazenado ou None.
+        """
+        entrada, fresca = self._entrada(chave)
+        return entrada.valor if entrada is not None and fresca else None
+
+    def definir(self, chave: Hashable, valor: Any) -> None:
+        """
+        Armazena um valor no cache, descartando as entradas menos usadas se necessário.
+
+        :param chave: Chave da entrada.
+        :param valor: Valor a ser armazenado.
+        """
+        self._itens[chave] = _EntradaCache(valor, time.monotonic())
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+
+    def invalidar(self, chave: Hashable | None = None) -> None:
+        """
+        Remove uma entrada do cache, ou todas se nenhuma chave for informada.
+
+        :param chave: Chave a ser removida (opcional).
+        """
+        if chave is None:
+            self._itens.clear()
+        else:
+            self._itens.pop(chave, None)
+
+    async def pegar_ou_carregar(
+            self, chave: Hashable, carregar: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Retorna o valor da chave, carregando-o se necessário.
+
+        - Entrada fresca: retorna direto (hit).
+        - Entrada antiga dentro da janela de stale: retorna o valor antigo e agenda
+          uma única atualização em segundo plano (stale).
+        - Sem entrada: aguarda `carregar()` e armazena o resultado (miss).
+
+        :param chave: Chave da entrada.
+        :param carregar: Função assíncrona que busca o valor atualizado.
+        :return: Valor em cache ou recém-carregado.
+        """
+        entrada, fresca = self._entrada(chave)
+        if entrada is not None and fresca:
+            CACHE_CONSULTAS_TOTAL.labels(cache=self.nome, resultado="hit").inc()
+            return entrada.valor
+
+        if entrada is not None:
+            CACHE_CONSULTAS_TOTAL.labels(cache=self.nome, resultado="stale").inc()
+            if chave not in self._revalidando:
+                self._revalidando[chave] = asyncio.create_task(
+                    self._revalidar(chave, carregar))
+            return entrada.valor
+
+        CACHE_CONSULTAS_TOTAL.labels(cache=self.nome, resultado="miss").inc()
+        valor = await carregar()
+        self.definir(chave, valor)
+        return valor
+
+    async def _revalidar(
+            self, chave: Hashable, carregar: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Atualiza uma entrada antiga em segundo plano.
+
+        Em caso de falha a entrada antiga é mantida até expirar a janela de stale.
+        """
+        try:
+            self.definir(chave, await carregar())
+            self.logger.debug(f"Cache {self.nome}: chave {chave} revalidada.")
+        except Exception as e:
+            self.logger.warning(f"Cache {self.nome}: falha ao revalidar "
+                                f"a chave {chave}: {e}")
+        finally:
+            self._revalidando.pop(chave, None)
@@ -0,0 +1,110 @@
+import time
+
+from app.core.logger import logger
+from app.util.metrics import CIRCUITO_ESTADO
+
+
+class CircuitBreaker:
+    FECHADO = "fechado"
+    MEIO_ABERTO = "meio_aberto"
+    ABERTO = "aberto"
+
+    _VALOR_METRICA = {FECHADO: 0, MEIO_ABERTO: 1, ABERTO: 2}
+
+    def __init__(self, nome: str, limite_falhas: int, tempo_aberto: float):
+        """
+        Circuit breaker para chamadas a serviços externos.
+
+        - Fechado: as chamadas passam normalmente; falhas consecutivas são contadas.
+        - Aberto: após `limite_falhas` falhas seguidas, as chamadas falham na hora
+          durante `tempo_aberto` segundos, sem tocar o serviço externo.
+        - Meio aberto: passado esse tempo, uma única chamada de sondagem é liberada.
+          Se ela der certo o circuito fecha; se falhar, abre novamente.
+
+        Fora do estado fechado só o resultado da sondagem conta: chamadas que
+        começaram antes de o circuito abrir e terminam depois são ignoradas.
+
+        :param nome: Nome do circuito, usado como label nas métricas.
+        :param limite_falhas: Falhas consecutivas para abrir o circuito.
+        :param tempo_aberto: Segundos que o circuito permanece aberto.
+        """
+        self.nome = nome
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.estado = self.FECHADO
+        self._falhas = 0
+        self._aberto_ate = 0.0
+        self._sondando = False
+        self.logger = logger
+        CIRCUITO_ESTADO.labels(circuito=nome).set_function(
+            lambda: self._VALOR_METRICA[self.estado])
+
+    def permitir(self) -> bool:
+        """
+        Indica se uma chamada pode ser feita agora.
+
+        No estado meio aberto apenas uma sondagem é liberada por vez.
+
+        :return: True se a chamada pode prosseguir.
+        """
+        if self.estado == self.ABERTO:
+            if time.monotonic() < self._aberto_ate:
+                return False
+            self.estado = self.MEIO_ABERTO
+            self._sondando = False
+            self.logger.info(f"Circuito {self.nome} meio aberto: liberando sondagem.")
+
+        if self.estado == self.MEIO_ABERTO:
+            if self._sondando:
+                return False
+            self._sondando = True
+        return True
+
+    def registrar_sucesso(self, sondagem: bool = False) -> None:
+        """
+        Registra uma chamada bem-sucedida, fechando o circuito se estava em sondagem.
+
+        :param sondagem: True se a chamada ocupava a vaga de sondagem.
+        """
+        if self.estado != self.FECHADO:
+            if not sondagem:
+                return
+            self.logger.info(f"Circuito {self.nome} fechado novamente.")
+        self.estado = self.FECHADO
+        self._falhas = 0
+        self._sondando = False
+
+    def registrar_falha(self, sondagem: bool = False) -> None:
+        """
+        Registra uma falha, abrindo o circuito ao atingir o limite ou se a sondagem falhar.
+
+        :param sondagem: True se a chamada ocupava a vaga de sondagem.
+        """
+        if self.estado != self.FECHADO and not sondagem:
+            return
+        self._falhas += 1
+        if self.estado == self.MEIO_ABERTO or self._falhas >= self.limite_falhas:
+            self.estado = self.ABERTO
+            self._aberto_ate = time.monotonic() + self.tempo_aberto
+            self._sondando = False
+            self.logger.warning(f"Circuito {self.nome} aberto por "
+                                f"{self.tempo_aberto}s após {self._falhas} falhas.")
+
+    def abandonar_sondagem(self) -> None:
+        """
+        Libera a vaga de sondagem quando ela termina sem resultado (ex: a tarefa
+        foi cancelada ou um erro inesperado interrompeu a chamada).
+
+        O circuito continua meio aberto e a próxima chamada vira a nova sondagem.
+        """
+        if self.estado == self.MEIO_ABERTO and self._sondando:
+            self.logger.info(f"Sondagem do circuito {self.nome} abandonada.")
+            self._sondando = False
+
+    def segundos_para_tentar(self) -> float:
+        """
+        Retorna quantos segundos faltam para o circuito liberar uma nova tentativa.
+        """
+        if self.estado != self.ABERTO:
+            return 0.0
+        return max(0.0, self._aberto_ate - time.monotonic())
@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def codificar_cursor(dados: Dict[str, Any]) -> str:
+    """
+    Codifica os dados de posição de uma página em um cursor opaco.
+
+    :param dados: Dicionário serializável em JSON com a posição da página.
+    :return: Cursor em base64 url-safe, sem padding.
+    """
+    bruto = json.dumps(dados, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decodifica um cursor gerado por `codificar_cursor`.
+
+    :param cursor: Cursor recebido do cliente.
+    :return: Dicionário com a posição da página.
+    :raises ValueError: Se o cursor for inválido.
+    """
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        dados = json.loads(bruto)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Cursor inválido: {e}")
+    if not isinstance(dados, dict):
+        raise ValueError("Cursor inválido.")
+    return dados
+
+
+def deslocamento_do_cursor(cursor: Optional[str]) -> int:
+    """
+    Extrai o deslocamento de um cursor de paginação por posição ({"o": n}).
+
+    :param cursor: Cursor recebido do cliente, ou None para a primeira página.
+    :return: Deslocamento dentro do resultado.
+    :raises HTTPException: 400 se o cursor for inválido.
+    """
+    if not cursor:
+        return 0
+    try:
+        deslocamento = int(decodificar_cursor(cursor)["o"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Cursor inválido.")
+    if deslocamento < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Cursor inválido.")
+    return deslocamento
+
+
+def codificar_cursor_posicao(criado_em: datetime, registro_id: int) -> str:
+    """
+    Codifica a posição do último registro de uma página (keyset) em um cursor opaco.
+
+    :param criado_em: Valor de `created_at` do último registro da página.
+    :param registro_id: ID do último registro da página.
+    :return: Cursor em base64 url-safe.
+    """
+    return codificar_cursor({"c": criado_em.isoformat(), "i": registro_id})
+
+
+def posicao_do_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Extrai a posição (created_at, id) de um cursor de paginação por keyset.
+
+    :param cursor: Cursor recebido do cliente, ou None para a primeira página.
+    :return: Tupla (created_at, id) do último registro já entregue, ou None.
+    :raises HTTPException: 400 se o cursor for inválido.
+    """
+    if not cursor:
+        return None
+    try:
+        dados = decodificar_cursor(cursor)
+        return datetime.fromisoformat(dados["c"]), int(dados["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Cursor inválido.")
+
+
+def codificar_cursor_id(registro_id: int) -> str:
+    """
+    Codifica o ID do último registro de uma página (keyset por ID) em um cursor opaco.
+
+    :param registro_id: ID do último registro da página.
+    :return: Cursor em base64 url-safe.
+    """
+    return codificar_cursor({"i": registro_id})
+
+
+def id_do_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Extrai o ID de um cursor de paginação por keyset em ID.
+
+    :param cursor: Cursor recebido do cliente, ou None para a primeira página.
+    :return: ID do último registro já entregue, ou None.
+    :raises HTTPException: 400 se o cursor for inválido.
+    """
+    if not cursor:
+        return None
+    try:
+        return int(decodificar_cursor(cursor)["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Cursor inválido.")
@@ -0,0 +1,51 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def gerar_etag(*partes: Any) -> str:
+    """
+    Gera um ETag forte a partir das partes que identificam a versão do recurso.
+
+    :param partes: Valores que mudam sempre que a representação muda
+                   (ex: ID, contador de versão, parâmetros da consulta).
+    :return: ETag entre aspas, pronto para o cabeçalho.
+    """
+    bruto = ":".join(str(parte) for parte in partes)
+    return f'"{hashlib.md5(bruto.encode()).hexdigest()}"'
+
+
+def etag_corresponde(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Verifica se o cabeçalho If-None-Match corresponde ao ETag atual.
+
+    Usa comparação fraca, como define o RFC 9110 para If-None-Match.
+
+    :param if_none_match: Valor do cabeçalho enviado pelo cliente.
+    :param etag: ETag atual do recurso.
+    :return: True se o cliente já possui a versão atual.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    atual = etag.removeprefix("W/")
+    return any(candidato.strip().removeprefix("W/") == atual
+               for candidato in if_none_match.split(","))
+
+
+def resposta_nao_modificada(
+        request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    Retorna uma resposta 304 se o cliente já possui a versão atual do recurso.
+
+    :param request: Requisição HTTP com o cabeçalho If-None-Match.
+    :param etag: ETag atual do recurso.
+    :param cache_control: Valor do cabeçalho Cache-Control.
+    :return: Resposta 304 ou None se o recurso deve ser enviado.
+    """
+    if etag_corresponde(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
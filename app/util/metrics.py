@@ -28,3 +28,89 @@ FAVORITES_ADDED_TOTAL = Counter(
 ACTIVE_CLIENTS = Gauge(
     'active_clients', 'Number of active clients'
 )
+
+# Conexões abertas no pool do cliente HTTP compartilhado da API externa.
+HTTP_POOL_CONEXOES = Gauge(
+    'http_client_pool_connections', 'Open connections in the outbound HTTP client pool', ['estado']
+)
+
+# Requisições aguardando uma conexão livre no pool do cliente HTTP.
+HTTP_POOL_AGUARDANDO = Gauge(
+    'http_client_pool_waiting_requests', 'Requests waiting for a connection in the outbound HTTP client pool'
+)
+
+# Consultas aos caches em memória, por resultado (hit, stale ou miss).
+CACHE_CONSULTAS_TOTAL = Counter(
+    'cache_lookups_total', 'In-process cache lookups by result', ['cache', 'resultado']
+)
+
+# Chamadas que aguardaram uma busca já em andamento em vez de disparar outra.
+SINGLE_FLIGHT_COALESCIDAS_TOTAL = Counter(
+    'single_flight_coalesced_total', 'Calls coalesced into an in-flight request', ['operacao']
+)
+
+# Duração de cada sincronização da réplica local do catálogo.
+CATALOGO_SYNC_DURACAO_SEGUNDOS = Histogram(
+    'catalog_sync_duration_seconds', 'Duration of the product catalog sync', ['resultado']
+)
+
+# Linhas processadas pela sincronização do catálogo, por operação.
+CATALOGO_SYNC_LINHAS_TOTAL = Counter(
+    'catalog_sync_rows_total', 'Rows processed by the product catalog sync', ['operacao']
+)
+
+# Tempo desde a última sincronização do catálogo concluída com sucesso.
+CATALOGO_SYNC_ATRASO_SEGUNDOS = Gauge(
+    'catalog_sync_lag_seconds', 'Seconds since the last successful product catalog sync'
+)
+
+# Duração da atualização dos dados de produto copiados nos favoritos.
+FAVORITOS_REFRESH_DURACAO_SEGUNDOS = Histogram(
+    'favorites_refresh_duration_seconds', 'Duration of the favorites product data refresh', ['resultado']
+)
+
+# Favoritos reescritos pela atualização dos dados de produto.
+FAVORITOS_REFRESH_LINHAS_TOTAL = Counter(
+    'favorites_refresh_rows_total', 'Favorite rows rewritten by the product data refresh'
+)
+
+# Linhas processadas pela importação em massa de clientes, por resultado.
+IMPORTACAO_CLIENTES_LINHAS_TOTAL = Counter(
+    'clients_import_rows_total', 'Rows processed by the bulk client import', ['resultado']
+)
+
+# Estado dos circuit breakers de serviços externos (0 fechado, 1 meio aberto, 2 aberto).
+CIRCUITO_ESTADO = Gauge(
+    'circuit_breaker_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open)', ['circuito']
+)
+
+# Novas tentativas feitas em chamadas à API externa.
+HTTP_RETENTATIVAS_TOTAL = Counter(
+    'http_client_retries_total', 'Retries of outbound HTTP requests', ['motivo']
+)
+
+# Conexões do pool do banco, por estado (em_uso, ociosas, overflow).
+DB_POOL_CONEXOES = Gauge(
+    'db_pool_connections', 'Database pool connections by state', ['pool', 'estado']
+)
+
+# Tempo para obter uma conexão do pool do banco (espera + abertura/pre-ping).
+DB_POOL_ESPERA_SEGUNDOS = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting to check out a database connection', ['pool'],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+)
+
+# Tempo em que cada conexão ficou emprestada antes de voltar ao pool.
+DB_POOL_USO_SEGUNDOS = Histogram(
+    'db_pool_checkout_held_seconds', 'Time a database connection stayed checked out', ['pool']
+)
+
+# Checkouts que estouraram DB_POOL_TIMEOUT_SEGUNDOS sem conseguir conexão.
+DB_POOL_TIMEOUTS_TOTAL = Counter(
+    'db_pool_checkout_timeouts_total', 'Database connection checkouts that timed out', ['pool']
+)
+
+# Operações da sessão roteadas para cada banco (principal ou leitura).
+DB_ROTEAMENTO_TOTAL = Counter(
+    'db_routed_operations_total', 'Session operations routed to each database', ['destino']
+)
@@ -0,0 +1,35 @@
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def resposta_json(adaptador: TypeAdapter, conteudo: Any,
+                  headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Serializa o conteúdo direto para JSON com o `TypeAdapter` do schema de resposta.
+
+    Para listagens montadas com `model_construct` a partir de linhas do banco:
+    os dados já estão no formato do schema, então a revalidação que o
+    `response_model` da rota faria (modelo -> dict -> modelo -> JSON) é pulada.
+    O `response_model` continua documentando a resposta no OpenAPI.
+
+    :param adaptador: TypeAdapter do tipo da resposta (ex: List[FavoritoResponse]).
+    :param conteudo: Conteúdo já no formato do schema.
+    :param headers: Cabeçalhos adicionais da resposta.
+    :return: Resposta HTTP com o JSON.
+    """
+    return Response(content=adaptador.dump_json(conteudo),
+                    media_type="application/json", headers=headers)
+
+
+def resposta_json_pronta(corpo: str | bytes,
+                         headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Repassa um JSON já serializado (ex: montado pelo banco) sem tocar nos bytes.
+
+    :param corpo: JSON pronto.
+    :param headers: Cabeçalhos adicionais da resposta.
+    :return: Resposta HTTP com o JSON.
+    """
+    return Response(content=corpo, media_type="application/json", headers=headers)
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.util.metrics import SINGLE_FLIGHT_COALESCIDAS_TOTAL
+
+
+class SingleFlight:
+    def __init__(self, nome: str):
+        """
+        Agrupa chamadas concorrentes para a mesma chave em uma única execução.
+
+        Enquanto uma busca está em andamento, novos chamadores com a mesma chave
+        aguardam o mesmo resultado em vez de disparar outra busca. Erros são
+        propagados para todos os que aguardam e a chave é liberada ao final,
+        com sucesso ou falha, para que a próxima chamada busque novamente.
+
+        :param nome: Nome da operação, usado como label nas métricas.
+        """
+        self.nome = nome
+        self._em_voo: dict[Hashable, asyncio.Task] = {}
+
+    async def executar(
+            self, chave: Hashable, funcao: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `funcao` para a chave, ou aguarda a execução já em andamento.
+
+        A execução roda em uma task própria, então o cancelamento de um dos
+        chamadores não cancela a busca dos demais.
+
+        :param chave: Chave que identifica a busca (ex: ID do produto).
+        :param funcao: Função assíncrona que realiza a busca.
+        :return: Resultado da busca.
+        :raises Exception: A mesma exceção lançada pela busca.
+        """
+        tarefa = self._em_voo.get(chave)
+        if tarefa is None:
+            tarefa = asyncio.create_task(funcao())
+            self._em_voo[chave] = tarefa
+            tarefa.add_done_callback(
+                lambda t: self._finalizar(chave, t))
+        else:
+            SINGLE_FLIGHT_COALESCIDAS_TOTAL.labels(operacao=self.nome).inc()
+        return await asyncio.shield(tarefa)
+
+    def _finalizar(self, chave: Hashable, tarefa: asyncio.Task) -> None:
+        if self._em_voo.get(chave) is tarefa:
+            del self._em_voo[chave]
+        if not tarefa.cancelled():
+            # Marca a exceção como consumida mesmo que ninguém mais aguarde.
+            tarefa.exception()
+
+    def em_andamento(self, chave: Hashable) -> bool:
+        """
+        Indica se há uma busca em andamento para a chave.
+        """
+        return chave in self._em_voo
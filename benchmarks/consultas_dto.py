@@ -0,0 +1,123 @@
+"""
+Microbenchmark das consultas quentes dos DTOs.
+
+Compara, por chamada, o custo das buscas feitas em toda requisição autenticada
+ou operação de favorito no formato anterior (`db.get` e `select()` remontado a
+cada chamada) com as consultas montadas uma única vez no módulo do DTO.
+
+A troca de `db.get` pela consulta pronta nas buscas por chave primária abre
+mão do identity map: `db.get` de um objeto já carregado na sessão não vai ao
+banco, a consulta pronta sempre vai. A segunda tabela mede esse caso (mesma
+sessão, sem limpar o identity map); hoje nenhuma requisição repete a busca do
+mesmo ID na sessão, então vale a primeira.
+
+Usa um SQLite em memória (aiosqlite), então a ida ao banco é quase nula e a
+diferença medida é o overhead de Python/SQLAlchemy de cada chamada. Contra o
+Postgres a diferença absoluta é a mesma, somada à latência da rede.
+
+Execução:
+
+    python -m benchmarks.consultas_dto [--iteracoes 5000] [--repeticoes 5]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.main  # noqa: F401  (registra todos os modelos no mapper)
+from app.core.database import LEITURA_REPLICA, criar_sessionmaker
+from app.db.dto.cliente_dto import ClienteDTO
+from app.db.dto.favorito_dto import FavoritoDTO
+from app.db.dto.usuario_dto import UsuarioDTO
+from app.db.models.cliente_model import Cliente
+from app.db.models.favorito_model import Favorito
+from app.db.models.usuario_model import Usuario
+
+Chamada = Callable[[], Awaitable[object]]
+
+
+async def preparar_banco():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Cliente.__table__.create)
+        await conexao.run_sync(Usuario.__table__.create)
+        # A coluna tsvector de favoritos vira texto no SQLite.
+        await conexao.exec_driver_sql(
+            "CREATE TABLE favoritos (id INTEGER PRIMARY KEY, cliente_id INTEGER NOT NULL, "
+            "produto_id INTEGER NOT NULL, titulo TEXT NOT NULL, imagem TEXT NOT NULL, "
+            "preco NUMERIC NOT NULL, review TEXT, busca TEXT, "
+            "created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP)")
+        await conexao.execute(insert(Cliente).values(id=1, nome="Ana", email="ana@example.com"))
+        await conexao.execute(insert(Usuario).values(
+            id=1, email="ana@example.com", hashed_password="x", cliente_id=1))
+        await conexao.execute(insert(Favorito).values(
+            cliente_id=1, produto_id=7, titulo="Mochila", imagem="img", preco=10))
+    return engine
+
+
+def casos(db: AsyncSession) -> List[Tuple[str, Chamada, Chamada]]:
+    usuario_dto, cliente_dto, favorito_dto = UsuarioDTO(db), ClienteDTO(db), FavoritoDTO(db)
+    return [
+        ("UsuarioDTO.usuario_por_id",
+         lambda: db.get(Usuario, 1, execution_options=LEITURA_REPLICA),
+         lambda: usuario_dto.usuario_por_id(1)),
+        ("ClienteDTO.pegar_por_id",
+         lambda: db.get(Cliente, 1, execution_options=LEITURA_REPLICA),
+         lambda: cliente_dto.pegar_por_id(1)),
+        ("FavoritoDTO.por_cliente_produto_id",
+         lambda: db.scalar(select(Favorito).where(
+             Favorito.cliente_id == 1, Favorito.produto_id == 7).limit(1)),
+         lambda: favorito_dto.por_cliente_produto_id(1, 7)),
+    ]
+
+
+async def medir(db: AsyncSession, chamada: Chamada, iteracoes: int, repeticoes: int,
+                limpar_identity_map: bool = True) -> float:
+    """
+    Retorna o melhor tempo médio por chamada, em microssegundos.
+
+    Por padrão o identity map é limpo a cada chamada, como acontece entre
+    requisições; sem limpar, mede buscas repetidas na mesma sessão.
+    """
+    # O identity map guarda referências fracas: o objeto só continua nele
+    # enquanto alguém o referencia, como o domínio faz durante a requisição.
+    carregado = None
+    for _ in range(min(iteracoes, 200)):
+        if limpar_identity_map:
+            db.expunge_all()
+        carregado = await chamada()
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(iteracoes):
+            if limpar_identity_map:
+                db.expunge_all()
+            await chamada()
+        melhor = min(melhor, (time.perf_counter() - inicio) / iteracoes)
+    del carregado
+    return melhor * 1e6
+
+
+async def main(iteracoes: int, repeticoes: int) -> None:
+    engine = await preparar_banco()
+    async with criar_sessionmaker(engine)() as db:
+        for titulo, limpar_identity_map in (("nova sessao", True),
+                                            ("mesma sessao (identity map)", False)):
+            print(f"\n{titulo}\n{'consulta':<38}{'antes (us)':>12}{'depois (us)':>13}{'ganho':>8}")
+            for nome, antes, depois in casos(db):
+                tempo_antes = await medir(db, antes, iteracoes, repeticoes, limpar_identity_map)
+                tempo_depois = await medir(db, depois, iteracoes, repeticoes, limpar_identity_map)
+                print(f"{nome:<38}{tempo_antes:>12.1f}{tempo_depois:>13.1f}"
+                      f"{1 - tempo_depois / tempo_antes:>8.0%}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iteracoes", type=int, default=5000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    argumentos = parser.parse_args()
+    asyncio.run(main(argumentos.iteracoes, argumentos.repeticoes))
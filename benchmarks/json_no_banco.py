@@ -0,0 +1,98 @@
+"""
+Benchmark do JSON de favoritos montado pelo Postgres.
+
+Compara, por requisição, a listagem de favoritos montada em Python (linhas do
+Core, `model_construct` e `TypeAdapter.dump_json`) com o array montado pelo
+banco (`string_agg` dos objetos) e repassado como veio
+(`FAVORITOS_JSON_NO_BANCO`). Mede o tempo de CPU do processo da API
+(`time.process_time`) e o tempo total; o CPU gasto pelo Postgres fica de fora
+do primeiro e dentro do segundo.
+
+Precisa de um Postgres (`DATABASE_URL`, ex.: o do docker-compose): os dados
+são inseridos em uma transação desfeita no fim, sem sobrar nada no banco.
+
+Execução:
+
+    python -m benchmarks.json_no_banco [--linhas 50 200 1000] [--iteracoes 200]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+import app.main  # noqa: F401  (registra todos os modelos no mapper)
+from app.api.domain.favorito_domain import FavoritoDomain
+from app.api.schemas.favorito_schemas import FavoritoResponse
+from app.core.database import criar_sessionmaker, engine
+from app.db.models.cliente_model import Cliente
+from app.db.models.favorito_model import Favorito
+
+Listagem = Callable[[], Awaitable[bytes]]
+
+LISTA_FAVORITOS = TypeAdapter(List[FavoritoResponse])
+
+
+async def preparar_dados(conexao: AsyncConnection, linhas: int) -> int:
+    cliente_id = await conexao.scalar(insert(Cliente).values(
+        nome="Benchmark", email="benchmark-json@example.com").returning(Cliente.id))
+    await conexao.execute(insert(Favorito), [
+        {"cliente_id": cliente_id, "produto_id": i, "titulo": f"Produto {i}",
+         "imagem": f"https://example.com/{i}.jpg", "preco": 10 + i / 100,
+         "review": "Muito bom" if i % 2 else None} for i in range(1, linhas + 1)])
+    return cliente_id
+
+
+def casos(favorito_domain: FavoritoDomain, cliente_id: int,
+          linhas: int) -> Tuple[Listagem, Listagem]:
+    async def em_python():
+        favoritos, _ = await favorito_domain.favoritos_por_cliente(cliente_id, limite=linhas)
+        return LISTA_FAVORITOS.dump_json(favoritos)
+
+    async def no_banco():
+        corpo, _ = await favorito_domain.favoritos_por_cliente_json(cliente_id, limite=linhas)
+        return corpo.encode("utf-8")
+
+    return em_python, no_banco
+
+
+async def medir(listagem: Listagem, iteracoes: int) -> Tuple[float, float]:
+    """
+    Retorna o CPU do processo e o tempo total médios por requisição, em ms.
+    """
+    for _ in range(min(iteracoes, 20)):
+        await listagem()
+    cpu, inicio = time.process_time(), time.perf_counter()
+    for _ in range(iteracoes):
+        await listagem()
+    return ((time.process_time() - cpu) / iteracoes * 1e3,
+            (time.perf_counter() - inicio) / iteracoes * 1e3)
+
+
+async def main(quantidades: List[int], iteracoes: int) -> None:
+    print(f"{'linhas':>7}{'CPU python (ms)':>17}{'CPU banco (ms)':>16}"
+          f"{'total python (ms)':>19}{'total banco (ms)':>18}{'mesmo JSON':>12}")
+    for linhas in quantidades:
+        async with engine.connect() as conexao:
+            transacao = await conexao.begin()
+            cliente_id = await preparar_dados(conexao, linhas)
+            async with criar_sessionmaker(conexao)() as db:
+                em_python, no_banco = casos(FavoritoDomain(db), cliente_id, linhas)
+                mesmo_json = await em_python() == await no_banco()
+                cpu_python, total_python = await medir(em_python, iteracoes)
+                cpu_banco, total_banco = await medir(no_banco, iteracoes)
+            await transacao.rollback()
+        print(f"{linhas:>7}{cpu_python:>17.2f}{cpu_banco:>16.2f}"
+              f"{total_python:>19.2f}{total_banco:>18.2f}{'sim' if mesmo_json else 'NAO':>12}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--iteracoes", type=int, default=200)
+    argumentos = parser.parse_args()
+    asyncio.run(main(argumentos.linhas, argumentos.iteracoes))
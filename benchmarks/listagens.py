@@ -0,0 +1,144 @@
+"""
+Benchmark das listagens de favoritos e de clientes.
+
+Compara, para páginas grandes, o caminho anterior (entidades ORM no identity
+map, validadas pelo `response_model` com `from_attributes` e serializadas via
+`jsonable_encoder`, como o FastAPI faz) com o caminho atual (só as colunas da
+resposta como linhas do Core, `model_construct` e `TypeAdapter.dump_json`).
+
+Mede o tempo da leitura até o corpo JSON e o pico de memória alocada
+(tracemalloc) em um SQLite em memória (aiosqlite).
+
+Execução:
+
+    python -m benchmarks.listagens [--linhas 1000 5000] [--repeticoes 5]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.main  # noqa: F401  (registra todos os modelos no mapper)
+from app.api.domain.cliente_domain import ClienteDomain
+from app.api.domain.favorito_domain import FavoritoDomain
+from app.api.schemas.cliente_schemas import ClienteResponse
+from app.api.schemas.favorito_schemas import FavoritoResponse
+from app.core.database import LEITURA_REPLICA, criar_sessionmaker
+from app.db.models.cliente_model import Cliente
+from app.db.models.favorito_model import Favorito
+
+Listagem = Callable[[], Awaitable[bytes]]
+
+LISTA_FAVORITOS = TypeAdapter(List[FavoritoResponse])
+LISTA_CLIENTES = TypeAdapter(List[ClienteResponse])
+
+
+async def preparar_banco(linhas: int):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    inicio = datetime(2025, 6, 20)
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Cliente.__table__.create)
+        # A coluna tsvector de favoritos vira texto no SQLite.
+        await conexao.exec_driver_sql(
+            "CREATE TABLE favoritos (id INTEGER PRIMARY KEY, cliente_id INTEGER NOT NULL, "
+            "produto_id INTEGER NOT NULL, titulo TEXT NOT NULL, imagem TEXT NOT NULL, "
+            "preco NUMERIC NOT NULL, review TEXT, busca TEXT, "
+            "created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP)")
+        await conexao.execute(insert(Cliente), [
+            {"id": i, "nome": f"Cliente {i}", "email": f"c{i}@example.com",
+             "created_at": inicio + timedelta(seconds=i)} for i in range(1, linhas + 1)])
+        await conexao.execute(insert(Favorito), [
+            {"id": i, "cliente_id": 1, "produto_id": i, "titulo": f"Produto {i}",
+             "imagem": f"https://example.com/{i}.jpg", "preco": 10 + i / 100,
+             "review": "Muito bom", "created_at": inicio + timedelta(seconds=i)}
+            for i in range(1, linhas + 1)])
+    return engine
+
+
+def _corpo_response_model(adaptador: TypeAdapter, objetos) -> bytes:
+    # O que o FastAPI faz com o retorno da rota: valida contra o response_model,
+    # converte para tipos JSON e serializa.
+    validados = adaptador.validate_python(objetos, from_attributes=True)
+    return json.dumps(jsonable_encoder(validados)).encode("utf-8")
+
+
+def casos(db: AsyncSession, linhas: int) -> List[Tuple[str, Listagem, Listagem]]:
+    favorito_domain, cliente_domain = FavoritoDomain(db), ClienteDomain(db)
+
+    async def favoritos_antes():
+        favoritos = await db.scalars(
+            select(Favorito).where(Favorito.cliente_id == 1)
+            .order_by(Favorito.created_at, Favorito.id).limit(linhas + 1),
+            execution_options=LEITURA_REPLICA)
+        return _corpo_response_model(LISTA_FAVORITOS, list(favoritos.all())[:linhas])
+
+    async def favoritos_depois():
+        favoritos, _ = await favorito_domain.favoritos_por_cliente(1, limite=linhas)
+        return LISTA_FAVORITOS.dump_json(favoritos)
+
+    async def clientes_antes():
+        clientes = await db.scalars(
+            select(Cliente).order_by(Cliente.created_at, Cliente.id).limit(linhas + 1),
+            execution_options=LEITURA_REPLICA)
+        return _corpo_response_model(LISTA_CLIENTES, list(clientes.all())[:linhas])
+
+    async def clientes_depois():
+        clientes, _ = await cliente_domain.todos_clientes(limite=linhas)
+        return LISTA_CLIENTES.dump_json(clientes)
+
+    return [
+        ("favoritos_por_cliente", favoritos_antes, favoritos_depois),
+        ("todos_clientes", clientes_antes, clientes_depois),
+    ]
+
+
+async def medir(db: AsyncSession, listagem: Listagem, repeticoes: int) -> Tuple[float, float]:
+    """
+    Retorna o melhor tempo (ms) e o pico de memória alocada (KiB) de uma listagem.
+
+    O identity map é limpo a cada chamada, como acontece entre requisições.
+    """
+    db.expunge_all()
+    await listagem()
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        db.expunge_all()
+        inicio = time.perf_counter()
+        await listagem()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    db.expunge_all()
+    tracemalloc.start()
+    await listagem()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return melhor * 1e3, pico / 1024
+
+
+async def main(quantidades: List[int], repeticoes: int) -> None:
+    print(f"{'listagem':<24}{'linhas':>7}{'antes (ms)':>12}{'depois (ms)':>13}"
+          f"{'antes (KiB)':>13}{'depois (KiB)':>14}")
+    for linhas in quantidades:
+        engine = await preparar_banco(linhas)
+        async with criar_sessionmaker(engine)() as db:
+            for nome, antes, depois in casos(db, linhas):
+                tempo_antes, memoria_antes = await medir(db, antes, repeticoes)
+                tempo_depois, memoria_depois = await medir(db, depois, repeticoes)
+                print(f"{nome:<24}{linhas:>7}{tempo_antes:>12.1f}{tempo_depois:>13.1f}"
+                      f"{memoria_antes:>13.0f}{memoria_depois:>14.0f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    argumentos = parser.parse_args()
+    asyncio.run(main(argumentos.linhas, argumentos.repeticoes))
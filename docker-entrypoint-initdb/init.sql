@@ -5,10 +5,14 @@ CREATE TABLE IF NOT EXISTS clientes (
     id SERIAL PRIMARY KEY,
     nome VARCHAR(100) NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
-    created_at TIMESTAMPTZ DEFAULT NOW(),
+    favoritos_versao INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ
 );
 
+-- Paginação por cursor (keyset) da listagem de clientes
+CREATE INDEX IF NOT EXISTS ix_clientes_created_at_id ON clientes (created_at, id);
+
 -- Criação da tabela usuarios
 CREATE TABLE IF NOT EXISTS usuarios (
     id SERIAL PRIMARY KEY,
@@ -33,7 +37,11 @@ CREATE TABLE IF NOT EXISTS favoritos (
     imagem VARCHAR(255) NOT NULL,
     preco NUMERIC(10, 2) NOT NULL,
     review TEXT,
-    created_at TIMESTAMPTZ DEFAULT NOW(),
+    busca TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(review, '')), 'B')
+    ) STORED,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ,
     CONSTRAINT fk_cliente_favoritos
         FOREIGN KEY(cliente_id)
@@ -42,6 +50,50 @@ CREATE TABLE IF NOT EXISTS favoritos (
     CONSTRAINT unique_cliente_produto UNIQUE (cliente_id, produto_id)
 );
 
+-- Busca textual nos favoritos (titulo e review)
+CREATE INDEX IF NOT EXISTS ix_favoritos_busca ON favoritos USING GIN (busca);
+
+-- Paginação por cursor (keyset) dos favoritos de cada cliente
+CREATE INDEX IF NOT EXISTS ix_favoritos_cliente_created_at_id
+    ON favoritos (cliente_id, created_at, id);
+
+-- Atualização dos dados de produto copiados nos favoritos (só os produtos alterados)
+CREATE INDEX IF NOT EXISTS ix_favoritos_produto_id ON favoritos (produto_id);
+
+-- Estatísticas de favoritos por cliente (quantidade, valor total e última atividade),
+-- mantidas pelo próprio banco a cada INSERT/UPDATE/DELETE em favoritos
+CREATE TABLE IF NOT EXISTS cliente_favoritos_stats (
+    cliente_id INTEGER PRIMARY KEY,
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    valor_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    ultima_atividade TIMESTAMPTZ,
+    CONSTRAINT fk_cliente_favoritos_stats
+        FOREIGN KEY(cliente_id)
+        REFERENCES clientes(id)
+        ON DELETE CASCADE
+);
+
+-- A função e os triggers que mantêm cliente_favoritos_stats ficam em upgrade.sql,
+-- executado logo depois deste script (e reaplicável em bancos já existentes).
+
+-- Criação da tabela produtos (réplica local do catálogo da Fake Store API)
+CREATE TABLE IF NOT EXISTS produtos (
+    id INTEGER PRIMARY KEY,
+    titulo VARCHAR(255) NOT NULL,
+    preco NUMERIC(10, 2) NOT NULL,
+    descricao TEXT,
+    categoria VARCHAR(100),
+    imagem VARCHAR(255),
+    avaliacao_nota NUMERIC(3, 2),
+    avaliacao_contagem INTEGER,
+    hash_conteudo VARCHAR(32) NOT NULL,
+    sincronizado_em TIMESTAMPTZ DEFAULT NOW(),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_produtos_categoria ON produtos (categoria);
+
 -- Inserção de um usuário admin padrão (senha 'favorito@123')
 INSERT INTO usuarios (email, hashed_password, perfil)
 VALUES ('admin@aiqfome.com', '$2b$12$Wekol57XnnS2B1zCqwydx.geHdFBLvuBQTzg0KfIcFg53napGs10S', 'admin')
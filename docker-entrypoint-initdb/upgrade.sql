@@ -0,0 +1,126 @@
+-- docker-entrypoint-initdb/upgrade.sql
+
+-- Atualização idempotente do esquema para bancos criados por versões anteriores
+-- do init.sql. O initdb do Postgres só executa os scripts com o diretório de dados
+-- vazio; em um banco existente aplique este arquivo manualmente (ver README):
+--
+--   docker compose exec -T db psql -U postgres -d aiqfome_db -v ON_ERROR_STOP=1 \
+--       -f /docker-entrypoint-initdb.d/upgrade.sql
+--
+-- Em um banco novo ele roda logo depois do init.sql (ordem alfabética) e só cria
+-- a função e os triggers das estatísticas. Pode ser reaplicado quantas vezes for
+-- preciso. Tudo acontece em uma única transação.
+
+BEGIN;
+
+-- Clientes: versão da lista de favoritos (ETag) e paginação por cursor
+ALTER TABLE clientes ADD COLUMN IF NOT EXISTS favoritos_versao INTEGER NOT NULL DEFAULT 0;
+UPDATE clientes SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE clientes ALTER COLUMN created_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_clientes_created_at_id ON clientes (created_at, id);
+
+-- Favoritos: busca textual (reescreve a tabela na primeira execução) e paginação por cursor
+ALTER TABLE favoritos ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(titulo, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(review, '')), 'B')
+) STORED;
+UPDATE favoritos SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE favoritos ALTER COLUMN created_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_favoritos_busca ON favoritos USING GIN (busca);
+CREATE INDEX IF NOT EXISTS ix_favoritos_cliente_created_at_id
+    ON favoritos (cliente_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_favoritos_produto_id ON favoritos (produto_id);
+
+-- Réplica local do catálogo da Fake Store API
+CREATE TABLE IF NOT EXISTS produtos (
+    id INTEGER PRIMARY KEY,
+    titulo VARCHAR(255) NOT NULL,
+    preco NUMERIC(10, 2) NOT NULL,
+    descricao TEXT,
+    categoria VARCHAR(100),
+    imagem VARCHAR(255),
+    avaliacao_nota NUMERIC(3, 2),
+    avaliacao_contagem INTEGER,
+    hash_conteudo VARCHAR(32) NOT NULL,
+    sincronizado_em TIMESTAMPTZ DEFAULT NOW(),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS ix_produtos_categoria ON produtos (categoria);
+
+-- Estatísticas de favoritos por cliente. Triggers por comando (FOR EACH STATEMENT)
+-- com tabelas de transição: um INSERT em lote de N favoritos atualiza cada
+-- cliente uma única vez, somando os deltas.
+CREATE TABLE IF NOT EXISTS cliente_favoritos_stats (
+    cliente_id INTEGER PRIMARY KEY,
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    valor_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    ultima_atividade TIMESTAMPTZ,
+    CONSTRAINT fk_cliente_favoritos_stats
+        FOREIGN KEY(cliente_id)
+        REFERENCES clientes(id)
+        ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION atualizar_cliente_favoritos_stats() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO cliente_favoritos_stats AS s (cliente_id, quantidade, valor_total, ultima_atividade)
+        SELECT cliente_id, count(*), sum(preco), now() FROM novos GROUP BY cliente_id
+        ON CONFLICT (cliente_id) DO UPDATE
+            SET quantidade = s.quantidade + EXCLUDED.quantidade,
+                valor_total = s.valor_total + EXCLUDED.valor_total,
+                ultima_atividade = EXCLUDED.ultima_atividade;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- Na exclusão em cascata do cliente a linha de estatísticas já saiu junto.
+        UPDATE cliente_favoritos_stats AS s
+            SET quantidade = s.quantidade - d.quantidade,
+                valor_total = s.valor_total - d.valor_total,
+                ultima_atividade = now()
+        FROM (SELECT cliente_id, count(*) AS quantidade, sum(preco) AS valor_total
+              FROM antigos GROUP BY cliente_id) AS d
+        WHERE s.cliente_id = d.cliente_id;
+    ELSE
+        -- UPDATE (ex.: preço atualizado pela sincronização do catálogo): só o valor muda.
+        UPDATE cliente_favoritos_stats AS s
+            SET quantidade = s.quantidade + d.quantidade,
+                valor_total = s.valor_total + d.valor_total
+        FROM (SELECT cliente_id, sum(quantidade) AS quantidade, sum(valor_total) AS valor_total
+              FROM (SELECT cliente_id, 1 AS quantidade, preco AS valor_total FROM novos
+                    UNION ALL
+                    SELECT cliente_id, -1, -preco FROM antigos) AS delta
+              GROUP BY cliente_id
+              HAVING sum(quantidade) <> 0 OR sum(valor_total) <> 0) AS d
+        WHERE s.cliente_id = d.cliente_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bloqueia escritas em favoritos até o fim da transação: nenhum favorito entra
+-- entre a criação dos triggers e a carga inicial das estatísticas.
+LOCK TABLE favoritos IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS tr_favoritos_stats_insert ON favoritos;
+CREATE TRIGGER tr_favoritos_stats_insert
+    AFTER INSERT ON favoritos REFERENCING NEW TABLE AS novos
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_cliente_favoritos_stats();
+
+DROP TRIGGER IF EXISTS tr_favoritos_stats_update ON favoritos;
+CREATE TRIGGER tr_favoritos_stats_update
+    AFTER UPDATE ON favoritos REFERENCING OLD TABLE AS antigos NEW TABLE AS novos
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_cliente_favoritos_stats();
+
+DROP TRIGGER IF EXISTS tr_favoritos_stats_delete ON favoritos;
+CREATE TRIGGER tr_favoritos_stats_delete
+    AFTER DELETE ON favoritos REFERENCING OLD TABLE AS antigos
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_cliente_favoritos_stats();
+
+-- Carga das estatísticas dos favoritos gravados antes dos triggers existirem.
+-- Clientes que já têm linha são mantidos pelos triggers e não são tocados.
+INSERT INTO cliente_favoritos_stats (cliente_id, quantidade, valor_total, ultima_atividade)
+SELECT cliente_id, count(*), sum(preco), max(greatest(created_at, updated_at))
+FROM favoritos GROUP BY cliente_id
+ON CONFLICT (cliente_id) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,184 @@
+"""
+Servidor substituto da Fake Store API para testes de carga.
+
+Serve um catálogo gerado (tamanho configurável) nas mesmas rotas da API real
+(`/products` e `/products/{id}`) e permite injetar latência, erros e timeouts,
+para medir cache, retentativas e concorrência da API de favoritos sem depender
+de https://fakestoreapi.com.
+
+Execução:
+
+    uvicorn loadtest.fake_store_server:app --port 8001
+
+e na API de favoritos: FAKE_STORE_API_BASE_URL="http://localhost:8001".
+
+A configuração inicial vem de variáveis de ambiente com prefixo `FAKE_STORE_`
+(veja `ConfiguracaoFakeStore`) e pode ser alterada em tempo de execução via
+`PUT /_config`, por exemplo para simular uma queda no meio de um teste.
+"""
+import asyncio
+import random
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import Body, FastAPI, Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+CATEGORIAS = ["men's clothing", "jewelery", "electronics", "women's clothing"]
+ADJETIVOS = ["Classic", "Slim", "Premium", "Casual", "Vintage", "Ultra", "Smart",
+             "Compact", "Wireless", "Leather", "Cotton", "Portable"]
+SUBSTANTIVOS = ["Backpack", "Jacket", "T-Shirt", "Ring", "Bracelet", "Monitor",
+                "Hard Drive", "Dress", "Coat", "Necklace", "Headphones", "Watch"]
+COMPLEMENTOS = ["for everyday use", "with extra pockets", "in stainless steel",
+                "with USB 3.0", "for laptops up to 15 inches", "with gold plating",
+                "made of organic cotton", "with water resistance"]
+
+
+class ConfiguracaoFakeStore(BaseSettings):
+    """
+    Parâmetros do catálogo e da injeção de falhas.
+
+    - LATENCIA: distribuição da latência de cada resposta. `fixa` usa sempre
+      LATENCIA_MS; `uniforme` sorteia entre LATENCIA_MS ± LATENCIA_DESVIO_MS;
+      `normal` usa média LATENCIA_MS e desvio LATENCIA_DESVIO_MS; `lognormal`
+      tem mediana LATENCIA_MS e cauda longa controlada por LATENCIA_DESVIO_MS.
+    - TAXA_ERRO: fração das requisições respondidas com STATUS_ERRO.
+    - TAXA_TIMEOUT: fração das requisições que só respondem após TIMEOUT_SEGUNDOS.
+    """
+    model_config = SettingsConfigDict(env_prefix="FAKE_STORE_", extra="ignore")
+
+    PRODUTOS: int = 5000
+    SEMENTE: int = 42
+
+    LATENCIA: Literal["fixa", "uniforme", "normal", "lognormal"] = "fixa"
+    LATENCIA_MS: float = 0.0
+    LATENCIA_DESVIO_MS: float = 0.0
+
+    TAXA_ERRO: float = 0.0
+    STATUS_ERRO: int = 503
+    TAXA_TIMEOUT: float = 0.0
+    TIMEOUT_SEGUNDOS: float = 30.0
+
+    # A API real responde 200 com corpo vazio para IDs inexistentes.
+    AUSENTE_404: bool = False
+
+
+def gerar_catalogo(quantidade: int, semente: int) -> List[Dict[str, Any]]:
+    """
+    Gera um catálogo determinístico no formato da Fake Store API.
+
+    :param quantidade: Quantidade de produtos.
+    :param semente: Semente do gerador pseudoaleatório.
+    :return: Lista de produtos com IDs de 1 a `quantidade`.
+    """
+    aleatorio = random.Random(semente)
+    produtos = []
+    for produto_id in range(1, quantidade + 1):
+        titulo = (f"{aleatorio.choice(ADJETIVOS)} {aleatorio.choice(SUBSTANTIVOS)} "
+                  f"{aleatorio.choice(COMPLEMENTOS)}")
+        produtos.append({
+            "id": produto_id,
+            "title": titulo,
+            "price": round(aleatorio.uniform(1, 1000), 2),
+            "description": f"{titulo}. " + " ".join(
+                aleatorio.sample(COMPLEMENTOS, 3)).capitalize() + ".",
+            "category": aleatorio.choice(CATEGORIAS),
+            "image": f"https://fakestoreapi.com/img/{produto_id}.jpg",
+            "rating": {"rate": round(aleatorio.uniform(1, 5), 1),
+                       "count": aleatorio.randint(0, 1000)},
+        })
+    return produtos
+
+
+def sortear_latencia(config: ConfiguracaoFakeStore, aleatorio: random.Random) -> float:
+    """
+    Sorteia a latência de uma resposta, em segundos, conforme a distribuição configurada.
+    """
+    media = config.LATENCIA_MS
+    desvio = config.LATENCIA_DESVIO_MS
+    if config.LATENCIA == "uniforme":
+        milissegundos = aleatorio.uniform(media - desvio, media + desvio)
+    elif config.LATENCIA == "normal":
+        milissegundos = aleatorio.gauss(media, desvio)
+    elif config.LATENCIA == "lognormal" and media > 0:
+        sigma = desvio / media if desvio else 0.0
+        milissegundos = aleatorio.lognormvariate(0, sigma) * media
+    else:
+        milissegundos = media
+    return max(0.0, milissegundos) / 1000
+
+
+def criar_app(config: Optional[ConfiguracaoFakeStore] = None) -> FastAPI:
+    """
+    Cria a aplicação ASGI do servidor substituto.
+
+    :param config: Configuração inicial (padrão: lida do ambiente).
+    :return: Aplicação FastAPI.
+    """
+    estado = {"config": config or ConfiguracaoFakeStore()}
+    estado["catalogo"] = gerar_catalogo(estado["config"].PRODUTOS,
+                                        estado["config"].SEMENTE)
+    aleatorio = random.Random()
+    fake_store = FastAPI(title="Fake Store (substituto para testes de carga)",
+                         docs_url=None, redoc_url=None)
+
+    @fake_store.middleware("http")
+    async def injetar_falhas(request, call_next):
+        if request.url.path.startswith("/_"):
+            return await call_next(request)
+
+        config_atual: ConfiguracaoFakeStore = estado["config"]
+        await asyncio.sleep(sortear_latencia(config_atual, aleatorio))
+        if aleatorio.random() < config_atual.TAXA_TIMEOUT:
+            await asyncio.sleep(config_atual.TIMEOUT_SEGUNDOS)
+        if aleatorio.random() < config_atual.TAXA_ERRO:
+            return JSONResponse(status_code=config_atual.STATUS_ERRO,
+                                content={"message": "Falha injetada."})
+        return await call_next(request)
+
+    @fake_store.api_route("/", methods=["GET", "HEAD"])
+    async def raiz():
+        return {"produtos": len(estado["catalogo"])}
+
+    @fake_store.get("/products")
+    async def listar(limit: Optional[int] = Query(None, ge=1),
+                     sort: Literal["asc", "desc"] = "asc"):
+        produtos = estado["catalogo"] if sort == "asc" else estado["catalogo"][::-1]
+        return produtos[:limit] if limit else produtos
+
+    @fake_store.get("/products/categories")
+    async def categorias():
+        return CATEGORIAS
+
+    @fake_store.get("/products/{produto_id}")
+    async def produto(produto_id: int):
+        if 1 <= produto_id <= len(estado["catalogo"]):
+            return estado["catalogo"][produto_id - 1]
+        if estado["config"].AUSENTE_404:
+            return JSONResponse(status_code=404,
+                                content={"message": "Produto não encontrado."})
+        return Response(status_code=200, media_type="application/json")
+
+    @fake_store.get("/_config")
+    async def ler_config():
+        return estado["config"].model_dump()
+
+    @fake_store.put("/_config")
+    async def alterar_config(alteracoes: Dict[str, Any] = Body(...)):
+        try:
+            novo = ConfiguracaoFakeStore(
+                **{**estado["config"].model_dump(), **alteracoes})
+        except ValidationError as e:
+            return JSONResponse(status_code=422,
+                                content={"detail": e.errors(include_url=False, include_context=False)})
+        if (novo.PRODUTOS, novo.SEMENTE) != (estado["config"].PRODUTOS,
+                                            estado["config"].SEMENTE):
+            estado["catalogo"] = gerar_catalogo(novo.PRODUTOS, novo.SEMENTE)
+        estado["config"] = novo
+        return novo.model_dump()
+
+    return fake_store
+
+
+app = criar_app()
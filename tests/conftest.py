@@ -1,8 +1,56 @@
+import asyncio
+import os
+import uuid
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
 from app.main import app
 
+PASTA_SQL = Path(__file__).resolve().parent.parent / "docker-entrypoint-initdb"
+
 
 @pytest.fixture
 def client():
     return TestClient(app)
+
+
+@pytest.fixture
+def banco_postgres():
+    """
+    Schema descartável no TEST_DATABASE_URL com o init.sql e o upgrade.sql
+    aplicados. Retorna uma função que cria um engine apontado para ele; o engine
+    deve ser criado e descartado dentro do mesmo `asyncio.run`.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL não configurada.")
+    import asyncpg
+
+    dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+    schema = f"teste_{uuid.uuid4().hex[:12]}"
+
+    async def executar(*comandos):
+        conexao = await asyncpg.connect(dsn)
+        try:
+            for comando in comandos:
+                await conexao.execute(comando)
+        finally:
+            await conexao.close()
+
+    asyncio.run(executar(
+        f"CREATE SCHEMA {schema}; SET search_path TO {schema}",
+        (PASTA_SQL / "init.sql").read_text(encoding="utf-8"),
+        (PASTA_SQL / "upgrade.sql").read_text(encoding="utf-8")))
+
+    def criar_engine():
+        return create_async_engine(
+            make_url(dsn).set(drivername="postgresql+asyncpg"), poolclass=NullPool,
+            connect_args={"server_settings": {"search_path": schema}})
+
+    yield criar_engine
+    asyncio.run(executar(f"DROP SCHEMA {schema} CASCADE"))
@@ -80,7 +80,7 @@ def test_registrar_usuario_por_admin(mocker):
 def test_logar_usuario_sucesso(mocker):
     mock_usuario = Usuario(id=1, email="cliente@teste.com", perfil="cliente", cliente_id=1)
     mock_domain = mocker.MagicMock()
-    mock_domain.autenticar_usuario.return_value = mock_usuario
+    mock_domain.autenticar_usuario = mocker.AsyncMock(return_value=mock_usuario)
 
     mocker.patch("app.api.routers.auth_router.UsusarioDomain", return_value=mock_domain)
 
@@ -104,7 +104,7 @@ def test_logar_usuario_sucesso(mocker):
 
 def test_logar_usuario_falha(mocker):
     mock_domain = mocker.MagicMock()
-    mock_domain.autenticar_usuario.return_value = None
+    mock_domain.autenticar_usuario = mocker.AsyncMock(return_value=None)
 
     mocker.patch("app.api.routers.auth_router.UsusarioDomain", return_value=mock_domain)
 
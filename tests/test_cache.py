@@ -0,0 +1,57 @@
+import asyncio
+
+from app.util.cache import CacheTTL
+
+
+def test_cache_descarta_menos_usado():
+    cache = CacheTTL("teste_lru", max_itens=2, ttl=60)
+    cache.definir(1, "a")
+    cache.definir(2, "b")
+    cache.pegar(1)
+    cache.definir(3, "c")
+
+    assert cache.pegar(1) == "a"
+    assert cache.pegar(2) is None
+    assert cache.pegar(3) == "c"
+
+
+def test_cache_miss_carrega_e_hit_reaproveita():
+    cache = CacheTTL("teste_miss", max_itens=10, ttl=60)
+    chamadas = []
+
+    async def carregar():
+        chamadas.append(1)
+        return {"id": 1}
+
+    async def cenario():
+        primeiro = await cache.pegar_ou_carregar(1, carregar)
+        segundo = await cache.pegar_ou_carregar(1, carregar)
+        return primeiro, segundo
+
+    primeiro, segundo = asyncio.run(cenario())
+
+    assert primeiro == segundo == {"id": 1}
+    assert len(chamadas) == 1
+
+
+def test_cache_stale_serve_antigo_e_revalida_uma_vez():
+    cache = CacheTTL("teste_stale", max_itens=10, ttl=0, stale=60)
+    cache.definir(1, "antigo")
+    chamadas = []
+
+    async def carregar():
+        chamadas.append(1)
+        await asyncio.sleep(0)
+        return "novo"
+
+    async def cenario():
+        respostas = await asyncio.gather(
+            *[cache.pegar_ou_carregar(1, carregar) for _ in range(5)])
+        await asyncio.sleep(0.01)
+        return respostas
+
+    respostas = asyncio.run(cenario())
+
+    assert respostas == ["antigo"] * 5
+    assert len(chamadas) == 1
+    assert cache._itens[1].valor == "novo"
@@ -0,0 +1,222 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.dto.favorito_dto import FavoritoDTO
+from app.db.dto.produto_dto import ProdutoDTO
+from app.db.models.produto_model import Produto
+from app.services.catalogo_sync_service import CatalogoSyncService
+from app.services.product_service import cache_lista_produtos
+
+PRODUTO_API = {
+    "id": 1,
+    "title": "Mochila",
+    "price": 109.95,
+    "description": "Mochila para notebook",
+    "category": "men's clothing",
+    "image": "https://fakestoreapi.com/img/1.jpg",
+    "rating": {"rate": 3.9, "count": 120}
+}
+
+
+def test_produto_dto_converte_formato_da_api():
+    colunas = ProdutoDTO.de_api(PRODUTO_API)
+    produto = Produto(**colunas)
+
+    assert colunas["titulo"] == "Mochila"
+    assert len(colunas["hash_conteudo"]) == 32
+    assert ProdutoDTO.para_dict(produto) == PRODUTO_API
+
+
+def test_sincronizacao_grava_e_invalida_cache(mocker):
+    mocker.patch(
+        "app.services.product_service.ProdutoService.buscar_produtos_api",
+        return_value=[PRODUTO_API]
+    )
+    mocker.patch("app.services.catalogo_sync_service._favoritos_pendentes", set())
+    gravar = mocker.patch.object(
+        CatalogoSyncService, "_gravar",
+        return_value=({"inseridos": 1, "atualizados": 0, "inalterados": 0}, [1])
+    )
+    atualizar_favoritos = mocker.patch.object(
+        CatalogoSyncService, "_atualizar_favoritos", return_value=0
+    )
+    cache_lista_produtos.definir("todos", [])
+
+    contagem = asyncio.run(CatalogoSyncService().sincronizar())
+
+    gravar.assert_called_once_with([PRODUTO_API])
+    atualizar_favoritos.assert_called_once_with([PRODUTO_API], {1})
+    assert contagem["inseridos"] == 1
+    assert cache_lista_produtos.pegar("todos") is None
+
+
+def test_favoritos_desatualizados_comparados_com_catalogo(mocker):
+    db = mocker.MagicMock()
+    db.execute = mocker.AsyncMock(return_value=mocker.MagicMock())
+    db.execute.return_value.all.return_value = [
+        (1, "Mochila", "https://fakestoreapi.com/img/1.jpg", Decimal("109.95")),
+        (2, "Camiseta", "https://fakestoreapi.com/img/2.jpg", Decimal("22.30")),
+        (3, "Removido", "https://fakestoreapi.com/img/3.jpg", Decimal("10.00"))
+    ]
+    catalogo = [
+        PRODUTO_API,
+        {"id": 2, "title": "Camiseta Slim", "price": 22.3,
+         "image": "https://fakestoreapi.com/img/2.jpg"}
+    ]
+
+    desatualizados = asyncio.run(FavoritoDTO(db).produtos_desatualizados(catalogo))
+
+    assert desatualizados == [{
+        "produto_id": 2, "titulo": "Camiseta Slim",
+        "imagem": "https://fakestoreapi.com/img/2.jpg", "preco": Decimal("22.30")
+    }]
+
+
+def test_favoritos_desatualizados_restritos_aos_produtos_alterados(mocker):
+    db = mocker.MagicMock()
+    db.execute = mocker.AsyncMock(return_value=mocker.MagicMock())
+    db.execute.return_value.all.return_value = [
+        (2, "Camiseta", "https://fakestoreapi.com/img/2.jpg", Decimal("22.30"))]
+    catalogo = [dict(PRODUTO_API, id=i, title=f"Produto {i}") for i in range(1, 6)]
+    favorito_dto = FavoritoDTO(db)
+
+    desatualizados = asyncio.run(favorito_dto.produtos_desatualizados(
+        catalogo, {2, 3, 4, 99}, tamanho_lote=2))
+    nenhum = asyncio.run(favorito_dto.produtos_desatualizados(catalogo, {99}))
+
+    # IDs fora do catálogo são ignorados; os demais vão em consultas de até 2.
+    filtros = [chamada.args[0].whereclause.right.value for chamada in db.execute.call_args_list]
+    assert filtros == [[2, 3], [4]]
+    assert [linha["produto_id"] for linha in desatualizados] == [2]
+    assert nenhum == []
+
+
+def test_atualizacao_dos_favoritos_acumula_produtos_pendentes(mocker):
+    mocker.patch("app.services.catalogo_sync_service._favoritos_pendentes", None)
+    atualizar = mocker.patch.object(
+        CatalogoSyncService, "_atualizar_favoritos",
+        side_effect=[0, SQLAlchemyError("falha"), 3, 0])
+    servico = CatalogoSyncService()
+
+    asyncio.run(servico.atualizar_favoritos([PRODUTO_API], [1]))
+    with pytest.raises(SQLAlchemyError):
+        asyncio.run(servico.atualizar_favoritos([PRODUTO_API], [2]))
+    asyncio.run(servico.atualizar_favoritos([PRODUTO_API], [3]))
+    asyncio.run(servico.atualizar_favoritos([PRODUTO_API], []))
+
+    # Primeira execução compara tudo; os IDs de uma execução com falha
+    # entram na seguinte.
+    assert [chamada.args[1] for chamada in atualizar.call_args_list] == [
+        None, {2}, {2, 3}, set()]
+
+
+def test_atualizacao_dos_favoritos_em_lotes(mocker):
+    mocker.patch("app.services.catalogo_sync_service._favoritos_pendentes", None)
+    mocker.patch.object(settings, "FAVORITOS_REFRESH_TAMANHO_LOTE", 2)
+    mocker.patch("app.services.catalogo_sync_service.SessionLocal",
+                 return_value=mocker.AsyncMock())
+    mocker.patch.object(
+        FavoritoDTO, "produtos_desatualizados",
+        return_value=[{"produto_id": i} for i in range(5)]
+    )
+    atualizar = mocker.patch.object(
+        FavoritoDTO, "atualizar_dados_produtos", side_effect=[4, 2, 1]
+    )
+
+    linhas = asyncio.run(CatalogoSyncService().atualizar_favoritos([PRODUTO_API]))
+
+    assert linhas == 7
+    assert [len(chamada.args[0]) for chamada in atualizar.call_args_list] == [2, 2, 1]
+
+
+def test_sincronizacao_grava_em_lotes(tmp_path):
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    produtos = [dict(PRODUTO_API, id=i, title=f"Produto {i}") for i in range(1, 6)]
+
+    async def cenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'produtos.db'}")
+        async with engine.begin() as conexao:
+            await conexao.run_sync(Produto.__table__.create)
+        comandos = []
+        async with async_sessionmaker(engine)() as db:
+            produto_dto = ProdutoDTO(db)
+            executar = db.execute
+
+            async def contar(stmt, *args, **kwargs):
+                comandos.append(stmt.is_insert)
+                return await executar(stmt, *args, **kwargs)
+            db.execute = contar
+
+            primeira, _ = await produto_dto.sincronizar(produtos, tamanho_lote=2)
+            await db.commit()
+            produtos[4]["price"] = 1.5
+            segunda, alterados = await produto_dto.sincronizar(produtos, tamanho_lote=2)
+            await db.commit()
+            total = await db.scalar(select(func.count()).select_from(Produto))
+            preco = await db.scalar(select(Produto.preco).where(Produto.id == 5))
+        await engine.dispose()
+        return primeira, segunda, alterados, comandos.count(True), total, preco
+
+    primeira, segunda, alterados, inserts, total, preco = asyncio.run(cenario())
+    assert primeira == {"inseridos": 5, "atualizados": 0, "inalterados": 0}
+    assert segunda == {"inseridos": 0, "atualizados": 1, "inalterados": 4}
+    assert alterados == [5]
+    # 3 lotes na primeira sincronização e 1 na segunda.
+    assert inserts == 4
+    assert total == 5
+    assert float(preco) == 1.5
+
+
+def test_atualizacao_dos_favoritos_incrementa_versao_no_banco(mocker):
+    from sqlalchemy.dialects import postgresql
+
+    db = mocker.MagicMock()
+    db.scalar = mocker.AsyncMock(return_value=3)
+
+    linhas = asyncio.run(FavoritoDTO(db).atualizar_dados_produtos([
+        {"produto_id": 1, "titulo": "Mochila", "imagem": "img", "preco": Decimal("9.90")}]))
+
+    sql = str(db.scalar.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert linhas == 3
+    # Um único comando: os IDs dos clientes não voltam para a aplicação.
+    assert db.scalar.await_count == 1
+    assert "WITH atualizados AS" in sql and "RETURNING favoritos.cliente_id" in sql
+    assert "SELECT atualizados.cliente_id" in sql
+
+
+def test_atualizacao_dos_favoritos_no_postgres(banco_postgres):
+    from sqlalchemy import insert, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.db.models.cliente_model import Cliente
+    from app.db.models.favorito_model import Favorito
+
+    async def cenario():
+        engine = banco_postgres()
+        async with engine.begin() as conexao:
+            await conexao.execute(insert(Cliente), [
+                {"id": i, "nome": f"Cliente {i}", "email": f"c{i}@example.com"} for i in (1, 2, 3)])
+            await conexao.execute(insert(Favorito), [
+                {"cliente_id": 1, "produto_id": 1, "titulo": "Mochila", "imagem": "img", "preco": 10},
+                {"cliente_id": 2, "produto_id": 1, "titulo": "Mochila", "imagem": "img", "preco": 10},
+                {"cliente_id": 3, "produto_id": 2, "titulo": "Anel", "imagem": "img", "preco": 5}])
+        async with async_sessionmaker(engine)() as db:
+            linhas = await FavoritoDTO(db).atualizar_dados_produtos([
+                {"produto_id": 1, "titulo": "Mochila Azul", "imagem": "img",
+                 "preco": Decimal("12.00")},
+                {"produto_id": 2, "titulo": "Anel", "imagem": "img", "preco": Decimal("5.00")}])
+            await db.commit()
+            versoes = (await db.execute(
+                select(Cliente.id, Cliente.favoritos_versao).order_by(Cliente.id))).all()
+        await engine.dispose()
+        return linhas, [tuple(versao) for versao in versoes]
+
+    linhas, versoes = asyncio.run(cenario())
+    assert linhas == 2
+    assert versoes == [(1, 1), (2, 1), (3, 0)]
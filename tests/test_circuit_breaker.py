@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.product_service import ProdutoService
+from app.util.circuit_breaker import CircuitBreaker
+
+
+def test_circuito_abre_apos_falhas_e_fecha_com_sondagem():
+    circuito = CircuitBreaker("teste_estados", limite_falhas=2, tempo_aberto=0)
+
+    circuito.registrar_falha()
+    assert circuito.estado == CircuitBreaker.FECHADO
+    circuito.registrar_falha()
+    assert circuito.estado == CircuitBreaker.ABERTO
+
+    assert circuito.permitir() is True
+    assert circuito.estado == CircuitBreaker.MEIO_ABERTO
+    assert circuito.permitir() is False
+
+    # Resultado de chamada que não é a sondagem não muda o circuito.
+    circuito.registrar_sucesso()
+    circuito.registrar_falha()
+    assert circuito.estado == CircuitBreaker.MEIO_ABERTO
+
+    circuito.registrar_sucesso(sondagem=True)
+    assert circuito.estado == CircuitBreaker.FECHADO
+
+
+def test_get_repete_5xx_e_abre_circuito(mocker, monkeypatch):
+    respostas = iter([500, 200])
+    chamadas = []
+
+    def handler(request):
+        chamadas.append(request.url.path)
+        return httpx.Response(next(respostas, 503), json={"id": 1})
+
+    circuito = CircuitBreaker("teste_get", limite_falhas=1, tempo_aberto=60)
+    mocker.patch("app.services.product_service.circuito_fake_store", circuito)
+    mocker.patch("app.services.product_service.pegar_http_client",
+                 return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF_BASE", 0)
+    monkeypatch.setattr(settings, "HTTP_RETRY_TENTATIVAS", 1)
+    servico = ProdutoService()
+
+    primeira = asyncio.run(servico._get("http://fake/products/1"))
+    assert primeira.status_code == 200
+    assert len(chamadas) == 2
+
+    falha = asyncio.run(servico._get("http://fake/products/1"))
+    assert falha.status_code == 503
+    assert circuito.estado == CircuitBreaker.ABERTO
+
+    with pytest.raises(HTTPException) as erro:
+        asyncio.run(servico._get("http://fake/products/1"))
+    assert erro.value.status_code == 503
+    assert int(erro.value.headers["Retry-After"]) > 0
+    assert len(chamadas) == 4
+
+
+def test_sondagem_cancelada_libera_o_circuito(mocker):
+    respostas = []
+
+    async def handler(request):
+        if not respostas:
+            respostas.append("pendurada")
+            await asyncio.sleep(60)
+        return httpx.Response(200, json={"id": 1})
+
+    circuito = CircuitBreaker("teste_sondagem_cancelada", limite_falhas=1, tempo_aberto=0)
+    circuito.registrar_falha()
+    mocker.patch("app.services.product_service.circuito_fake_store", circuito)
+    mocker.patch("app.services.product_service.pegar_http_client",
+                 return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    servico = ProdutoService()
+
+    async def cenario():
+        sondagem = asyncio.create_task(servico._get("http://fake/products/1"))
+        await asyncio.sleep(0.01)
+        assert circuito.estado == CircuitBreaker.MEIO_ABERTO
+        sondagem.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sondagem
+        return await servico._get("http://fake/products/1")
+
+    resposta = asyncio.run(cenario())
+    assert resposta.status_code == 200
+    assert circuito.estado == CircuitBreaker.FECHADO
+
+
+def test_sondagem_tem_uma_tentativa_e_so_ela_fecha_o_circuito(mocker, monkeypatch):
+    chamadas = []
+    liberar_antiga = asyncio.Event()
+
+    async def handler(request):
+        chamadas.append(request.url.path)
+        if request.url.path == "/antiga":
+            await liberar_antiga.wait()
+            return httpx.Response(200, json={"id": 1})
+        return httpx.Response(500)
+
+    circuito = CircuitBreaker("teste_sondagem_unica", limite_falhas=1, tempo_aberto=0)
+    mocker.patch("app.services.product_service.circuito_fake_store", circuito)
+    mocker.patch("app.services.product_service.pegar_http_client",
+                 return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF_BASE", 0)
+    monkeypatch.setattr(settings, "HTTP_RETRY_TENTATIVAS", 2)
+    servico = ProdutoService()
+
+    async def cenario():
+        antiga = asyncio.create_task(servico._get("http://fake/antiga"))
+        await asyncio.sleep(0.01)
+        circuito.registrar_falha()
+        assert circuito.estado == CircuitBreaker.ABERTO
+        sondagem = await servico._get("http://fake/sondagem")
+        liberar_antiga.set()
+        return sondagem, await antiga
+
+    sondagem, antiga = asyncio.run(cenario())
+    assert sondagem.status_code == 500
+    assert antiga.status_code == 200
+    assert chamadas == ["/antiga", "/sondagem"]
+    # O sucesso da chamada antiga não fecha o circuito reaberto pela sondagem.
+    assert circuito.estado == CircuitBreaker.ABERTO
@@ -1,4 +1,15 @@
+import asyncio
+from datetime import datetime, timezone
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.domain.cliente_domain import ClienteDomain
+from app.api.schemas.cliente_schemas import ClienteResponse
+from app.core.config import settings
+from app.db.models.cliente_model import Cliente
+from app.db.models.usuario_model import Usuario
 
 from app.core.security import pegar_admin_atual
 from app.main import app
@@ -38,20 +49,22 @@ def test_registrar_cliente(mocker):
 
 
 def test_listar_clientes(mocker):
-    mocker.patch(
+    listar = mocker.patch(
         "app.api.domain.cliente_domain.ClienteDomain.todos_clientes",
-        return_value=[{
-            "id": 1,
-            "nome": "Cliente Teste",
-            "email": "cliente@example.com",
-            "created_at": "2025-06-19T12:00:00",
-            "updated_at": None
-        }]
+        return_value=([ClienteResponse(
+            id=1,
+            nome="Cliente Teste",
+            email="cliente@example.com",
+            created_at="2025-06-19T12:00:00",
+            updated_at=None
+        )], (datetime(2025, 6, 19, 12, 0, tzinfo=timezone.utc), 1))
     )
 
     app.dependency_overrides[pegar_admin_atual] = fake_pegar_admin_atual
 
-    response = client.get("/clientes/")
+    response = client.get("/clientes/?limit=1")
+    proxima = client.get(f"/clientes/?limit=1&cursor={response.headers['X-Next-Cursor']}")
+    invalida = client.get("/clientes/?cursor=invalido")
 
     app.dependency_overrides = {}
 
@@ -63,6 +76,11 @@ def test_listar_clientes(mocker):
         "created_at": "2025-06-19T12:00:00",
         "updated_at": None
     }]
+    assert proxima.status_code == 200
+    assert listar.call_args_list[0].kwargs == {"limite": 1, "apos": None}
+    assert listar.call_args_list[1].kwargs == {
+        "limite": 1, "apos": (datetime(2025, 6, 19, 12, 0, tzinfo=timezone.utc), 1)}
+    assert invalida.status_code == 400
 
 
 def test_ler_cliente_por_id(mocker):
@@ -115,7 +133,7 @@ def test_atualizar_cliente(mocker):
 def test_deletar_cliente(mocker):
     mocker.patch(
         "app.api.domain.cliente_domain.ClienteDomain.deletar_cliente",
-        return_value=True
+        return_value="removido"
     )
     app.dependency_overrides[pegar_admin_atual] = fake_pegar_admin_atual
 
@@ -125,3 +143,85 @@ def test_deletar_cliente(mocker):
 
     assert response.status_code == 204
     assert response.content == b""
+
+
+def test_deletar_cliente_grande_em_segundo_plano(mocker):
+    mocker.patch(
+        "app.api.domain.cliente_domain.ClienteDomain.deletar_cliente",
+        return_value="agendado"
+    )
+    excluir = mocker.patch(
+        "app.api.domain.cliente_domain.ClienteDomain.excluir_cliente_em_lotes")
+    mocker.patch("app.api.routers.clientes_router.SessionLocal",
+                 return_value=mocker.AsyncMock())
+    app.dependency_overrides[pegar_admin_atual] = fake_pegar_admin_atual
+
+    response = client.delete("/clientes/1")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 202
+    excluir.assert_awaited_once_with(1)
+
+
+def test_deletar_cliente_cascata_no_banco(tmp_path, mocker):
+    mocker.patch.object(settings, "CLIENTE_EXCLUSAO_LIMITE_SINCRONO", 2)
+    mocker.patch.object(settings, "CLIENTE_EXCLUSAO_TAMANHO_LOTE", 2)
+
+    async def cenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'exclusao.db'}")
+        event.listen(engine.sync_engine, "connect",
+                     lambda conexao, _: conexao.execute("PRAGMA foreign_keys=ON"))
+        async with engine.begin() as conexao:
+            await conexao.run_sync(Cliente.__table__.create)
+            await conexao.run_sync(Usuario.__table__.create)
+            # A coluna tsvector de favoritos não existe no SQLite.
+            await conexao.exec_driver_sql(
+                "CREATE TABLE favoritos (id INTEGER PRIMARY KEY, cliente_id INTEGER "
+                "NOT NULL REFERENCES clientes(id) ON DELETE CASCADE, produto_id INTEGER)")
+            await conexao.execute(insert(Cliente), [
+                {"id": i, "nome": f"Cliente {i}", "email": f"c{i}@example.com"}
+                for i in (1, 2)])
+            await conexao.execute(insert(Usuario), [
+                {"email": f"c{i}@example.com", "hashed_password": "x", "cliente_id": i}
+                for i in (1, 2)])
+            await conexao.exec_driver_sql(
+                "INSERT INTO favoritos (cliente_id, produto_id) "
+                "VALUES (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 1)")
+
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            cliente_domain = ClienteDomain(db)
+            resultados = [await cliente_domain.deletar_cliente(i) for i in (1, 2, 99)]
+            await cliente_domain.excluir_cliente_em_lotes(1)
+            restantes = [(await db.execute(text(f"SELECT count(*) FROM {tabela}"))).scalar()
+                         for tabela in ("clientes", "usuarios", "favoritos")]
+        await engine.dispose()
+        return resultados, restantes
+
+    resultados, restantes = asyncio.run(cenario())
+    assert resultados == ["agendado", "removido", None]
+    assert restantes == [0, 0, 0]
+
+
+def test_todos_clientes_paginacao_por_keyset(tmp_path):
+    async def cenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'clientes.db'}")
+        async with engine.begin() as conexao:
+            await conexao.run_sync(Cliente.__table__.create)
+        criado_em = datetime(2025, 6, 19, 12, 0)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            db.add_all([Cliente(id=i, nome=f"Cliente {i}", email=f"c{i}@example.com",
+                                created_at=criado_em) for i in range(1, 6)])
+            await db.commit()
+
+            cliente_domain = ClienteDomain(db)
+            paginas, apos = [], None
+            while True:
+                clientes, apos = await cliente_domain.todos_clientes(limite=2, apos=apos)
+                paginas.append([cliente.id for cliente in clientes])
+                if apos is None:
+                    break
+        await engine.dispose()
+        return paginas
+
+    assert asyncio.run(cenario()) == [[1, 2], [3, 4], [5]]
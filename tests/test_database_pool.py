@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+
+from app.core.config import settings
+from app.core.database import PoolInstrumentado, criar_engine, url_assincrona
+from app.util.metrics import REGISTRY
+
+
+def _metrica(nome, **labels):
+    return REGISTRY.get_sample_value(nome, labels) or 0
+
+
+def test_url_assincrona_troca_driver():
+    assert url_assincrona("postgresql+psycopg2://u:p@db:5432/base") == \
+        "postgresql+asyncpg://u:p@db:5432/base"
+    assert url_assincrona("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_pool_configurado_e_instrumentado(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_TAMANHO", 1)
+    monkeypatch.setattr(settings, "DB_POOL_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_SEGUNDOS", 0.05)
+    engine = criar_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", nome="teste")
+    pool = engine.sync_engine.pool
+
+    assert isinstance(pool, PoolInstrumentado)
+    assert pool.size() == 1 and pool._timeout == 0.05
+
+    async def cenario():
+        timeouts_antes = _metrica("db_pool_checkout_timeouts_total", pool="teste")
+        async with engine.connect() as conexao:
+            await conexao.execute(text("SELECT 1"))
+            assert _metrica("db_pool_connections", pool="teste", estado="em_uso") == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+        assert _metrica("db_pool_checkout_timeouts_total", pool="teste") == timeouts_antes + 1
+        assert _metrica("db_pool_connections", pool="teste", estado="em_uso") == 0
+        assert _metrica("db_pool_connections", pool="teste", estado="ociosas") == 1
+        assert _metrica("db_pool_checkout_wait_seconds_count", pool="teste") >= 2
+        assert _metrica("db_pool_checkout_held_seconds_count", pool="teste") >= 1
+
+        await engine.dispose()
+        assert engine.sync_engine.pool.nome == "teste"
+
+    asyncio.run(cenario())
+
+
+def test_cache_de_prepared_statements_so_no_asyncpg(mocker, monkeypatch):
+    monkeypatch.setattr(settings, "DB_CACHE_PREPARED_STATEMENTS", 0)
+    create_async_engine = mocker.patch("app.core.database.create_async_engine")
+    mocker.patch("app.core.database.instrumentar_pool")
+
+    criar_engine("postgresql://u:p@db:5432/base")
+    criar_engine("sqlite+aiosqlite:///x.db")
+
+    postgres, sqlite = create_async_engine.call_args_list
+    assert postgres.kwargs["connect_args"] == {"prepared_statement_cache_size": 0}
+    assert sqlite.kwargs["connect_args"] == {}
+    assert postgres.kwargs["query_cache_size"] == settings.DB_CACHE_CONSULTAS_COMPILADAS
@@ -0,0 +1,87 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import criar_sessionmaker, definir_destino_leituras
+from app.core.security import pegar_admin_atual
+from app.db.dto.cliente_dto import ClienteDTO
+from app.db.models.cliente_model import Cliente
+from app.main import COOKIE_LEITURA_PRIMARIO, app
+from app.util.metrics import REGISTRY
+
+client = TestClient(app)
+
+
+def _metrica(destino):
+    return REGISTRY.get_sample_value("db_routed_operations_total", {"destino": destino}) or 0
+
+
+async def _criar_banco(url, nome):
+    engine = create_async_engine(url)
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Cliente.__table__.create)
+        await conexao.execute(insert(Cliente), [{"id": 1, "nome": nome, "email": "c1@example.com"}])
+    return engine
+
+
+def test_leituras_marcadas_vao_para_replica(tmp_path):
+    async def cenario():
+        principal = await _criar_banco(f"sqlite+aiosqlite:///{tmp_path / 'principal.db'}", "Primario")
+        leitura = await _criar_banco(f"sqlite+aiosqlite:///{tmp_path / 'leitura.db'}", "Replica")
+        fabrica = criar_sessionmaker(principal, leitura)
+        leituras_antes = _metrica("leitura")
+
+        async with fabrica() as db:
+            cliente_dto = ClienteDTO(db)
+            nomes = [(await cliente_dto.pegar_por_id(1)).nome,
+                     (await cliente_dto.pegar_por_email("c1@example.com")).nome]
+
+        async with fabrica() as db:
+            cliente_dto = ClienteDTO(db)
+            await cliente_dto.registrar({"nome": "Novo", "email": "c2@example.com"})
+            await db.commit()
+            # Depois de escrever, a sessão lê do primário (read-your-writes).
+            nomes.append([cliente.nome for cliente in await cliente_dto.pegar_todos()])
+
+        async def com_destino_principal():
+            definir_destino_leituras("principal")
+            async with fabrica() as db:
+                return (await ClienteDTO(db).pegar_todos())[0].nome
+        nomes.append(await asyncio.create_task(com_destino_principal()))
+
+        async with criar_sessionmaker(principal)() as db:
+            nomes.append((await ClienteDTO(db).pegar_por_id(1)).nome)
+
+        leituras = _metrica("leitura") - leituras_antes
+        await principal.dispose()
+        await leitura.dispose()
+        return nomes, leituras
+
+    nomes, leituras = asyncio.run(cenario())
+    assert nomes == ["Replica", "Primario", ["Primario", "Novo"], "Primario", "Primario"]
+    assert leituras == 1
+
+
+def test_escrita_fixa_leituras_no_primario(mocker):
+    mocker.patch("app.main.engine_leitura", mocker.Mock())
+    definir = mocker.patch("app.main.definir_destino_leituras")
+    mocker.patch("app.api.domain.cliente_domain.ClienteDomain.registrar_cliente",
+                 return_value={"id": 1, "nome": "Cliente Teste", "email": "cliente@example.com",
+                               "created_at": "2025-06-19T12:00:00", "updated_at": None})
+    app.dependency_overrides[pegar_admin_atual] = lambda: {"username": "admin_teste"}
+
+    leitura = client.get("/")
+    escrita = client.post("/clientes/", json={"nome": "Cliente Teste", "email": "cliente@example.com",
+                                              "password": "senhaSegura123"})
+    leitura_apos_escrita = client.get("/", cookies={COOKIE_LEITURA_PRIMARIO: "1"})
+
+    app.dependency_overrides = {}
+    client.cookies.clear()
+
+    assert COOKIE_LEITURA_PRIMARIO not in leitura.cookies
+    assert escrita.status_code == 201
+    assert escrita.cookies.get(COOKIE_LEITURA_PRIMARIO) == "1"
+    assert leitura_apos_escrita.status_code == 200
+    assert [chamada.args for chamada in definir.call_args_list] == [("principal",), ("principal",)]
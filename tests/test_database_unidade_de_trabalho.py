@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.domain.cliente_domain import ClienteDomain
+from app.api.schemas.cliente_schemas import ClienteCreateWithPassword
+from app.core.database import criar_sessionmaker, unidade_de_trabalho
+from app.db.dto.cliente_dto import ClienteDTO
+from app.db.dto.usuario_dto import UsuarioDTO
+from app.db.models.cliente_model import Cliente
+from app.db.models.usuario_model import Usuario
+
+
+async def _criar_banco(url):
+    engine = create_async_engine(url)
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Cliente.__table__.create)
+        await conexao.run_sync(Usuario.__table__.create)
+    return engine
+
+
+def test_falha_em_uma_etapa_desfaz_as_escritas_anteriores(tmp_path):
+    async def cenario():
+        engine = await _criar_banco(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+        async with engine.begin() as conexao:
+            # O usuário com o mesmo e-mail faz o segundo INSERT do cadastro falhar.
+            await conexao.execute(insert(Usuario).values(
+                email="ana@example.com", hashed_password="x", perfil="admin"))
+
+        async with criar_sessionmaker(engine)() as db:
+            with pytest.raises(HTTPException) as erro:
+                await ClienteDomain(db).registrar_cliente(ClienteCreateWithPassword(
+                    nome="Ana", email="ana@example.com", password="senhaSegura123"))
+
+        async with engine.connect() as conexao:
+            clientes = await conexao.scalar(select(func.count()).select_from(Cliente))
+        await engine.dispose()
+        return erro.value.status_code, clientes
+
+    status_code, clientes = asyncio.run(cenario())
+    assert status_code == 500
+    # O cliente gravado antes da falha não ficou no banco.
+    assert clientes == 0
+
+
+def test_colunas_geradas_voltam_no_returning_sem_select(tmp_path):
+    async def cenario():
+        engine = await _criar_banco(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+        comandos = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _registrar(conexao, cursor, comando, parametros, contexto, executemany):
+            comandos.append(comando)
+
+        async with criar_sessionmaker(engine)() as db:
+            cliente_dto = ClienteDTO(db)
+            async with unidade_de_trabalho(db):
+                cliente = await cliente_dto.registrar({"nome": "Ana", "email": "ana@example.com"})
+                criado = (cliente.id, cliente.created_at, cliente.favoritos_versao)
+                await cliente_dto.atualizar(cliente, {"nome": "Ana Maria"})
+                usuario = await UsuarioDTO(db).registrar({
+                    "email": "ana@example.com", "hashed_password": "x", "cliente_id": cliente.id})
+                datas = (cliente.updated_at, usuario.created_at, usuario.updated_at)
+        await engine.dispose()
+        return comandos, criado, datas
+
+    comandos, (cliente_id, created_at, favoritos_versao), datas = asyncio.run(cenario())
+    assert cliente_id == 1 and created_at is not None and favoritos_versao == 0
+    cliente_atualizado_em, usuario_criado_em, usuario_atualizado_em = datas
+    assert cliente_atualizado_em is not None and usuario_criado_em is not None
+    assert usuario_atualizado_em is None
+    # Nenhum SELECT para recarregar colunas geradas pelo banco.
+    assert [comando.split()[0] for comando in comandos] == ["INSERT", "UPDATE", "INSERT"]
+    assert all("RETURNING" in comando for comando in comandos)
@@ -0,0 +1,76 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+from app.core.security import pegar_admin_atual
+from app.db.dto.favorito_dto import FavoritoDTO
+from app.main import app
+
+client = TestClient(app)
+
+LINHAS = [
+    (1, 10, 100, "Mochila", "http://img/1.png", Decimal("109.95"), "Ótima",
+     datetime(2024, 1, 1, 12, 0), datetime(2024, 1, 1, 12, 0)),
+    (2, 11, 101, "Camiseta, azul", "http://img/2.png", Decimal("22.30"), None,
+     datetime(2024, 1, 2, 8, 30), datetime(2024, 1, 3, 9, 0)),
+]
+
+
+def _preparar(mocker):
+    app.dependency_overrides[pegar_admin_atual] = lambda: {"username": "admin_teste"}
+    sessao = mocker.MagicMock()
+    sessao.__aenter__ = mocker.AsyncMock(return_value=mocker.AsyncMock())
+    sessao.__aexit__ = mocker.AsyncMock(return_value=False)
+    session_local = mocker.patch("app.api.routers.admin_router.SessionLocal",
+                                 return_value=sessao)
+
+    async def lotes(*args, **kwargs):
+        yield LINHAS[:1]
+        yield LINHAS[1:]
+
+    exportar = mocker.patch.object(FavoritoDTO, "exportar", side_effect=lotes)
+    return session_local, sessao, exportar
+
+
+def test_exportar_favoritos_ndjson(mocker):
+    session_local, sessao, exportar = _preparar(mocker)
+
+    response = client.get("/admin/favoritos/exportar",
+                          params={"cliente_id_min": 10, "cliente_id_max": 11,
+                                  "desde": "2024-01-01T00:00:00"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="favoritos.ndjson"' in response.headers["content-disposition"]
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert [linha["id"] for linha in linhas] == [1, 2]
+    assert linhas[0]["preco"] == 109.95
+    assert linhas[0]["review"] == "Ótima"
+    assert linhas[1]["created_at"] == "2024-01-02T08:30:00"
+    args = exportar.call_args.args
+    assert args[:3] == (10, 11, datetime(2024, 1, 1))
+    assert args[3] is None
+    session_local.assert_called_once()
+    sessao.__aexit__.assert_awaited_once()
+
+
+def test_exportar_favoritos_csv(mocker):
+    _preparar(mocker)
+
+    response = client.get("/admin/favoritos/exportar", params={"formato": "csv"})
+    formato_invalido = client.get("/admin/favoritos/exportar", params={"formato": "xml"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "id,cliente_id,produto_id,titulo,imagem,preco,review,created_at,updated_at",
+        "1,10,100,Mochila,http://img/1.png,109.95,Ótima,2024-01-01T12:00:00,2024-01-01T12:00:00",
+        '2,11,101,"Camiseta, azul",http://img/2.png,22.30,,2024-01-02T08:30:00,2024-01-03T09:00:00',
+    ]
+    assert formato_invalido.status_code == 422
@@ -0,0 +1,61 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from loadtest.fake_store_server import (ConfiguracaoFakeStore, criar_app,
+                                        gerar_catalogo, sortear_latencia)
+
+
+def test_catalogo_gerado_e_deterministico():
+    catalogo = gerar_catalogo(3000, semente=7)
+
+    assert len(catalogo) == 3000
+    assert catalogo == gerar_catalogo(3000, semente=7)
+    assert [p["id"] for p in catalogo[:3]] == [1, 2, 3]
+    assert {"title", "price", "description", "category", "image",
+            "rating"} <= catalogo[0].keys()
+
+
+def test_rotas_no_formato_da_fake_store():
+    client = TestClient(criar_app(ConfiguracaoFakeStore(PRODUTOS=50)))
+
+    lista = client.get("/products")
+    primeiros = client.get("/products?limit=5")
+    produto = client.get("/products/10")
+    ausente = client.get("/products/51")
+
+    assert len(lista.json()) == 50
+    assert len(primeiros.json()) == 5
+    assert produto.json()["id"] == 10
+    assert ausente.status_code == 200
+    assert ausente.content == b""
+
+
+def test_falhas_injetadas_e_alteradas_em_execucao():
+    client = TestClient(criar_app(ConfiguracaoFakeStore(PRODUTOS=10, TAXA_ERRO=1.0)))
+
+    com_erro = client.get("/products/1")
+    client.put("/_config", json={"TAXA_ERRO": 0.0, "AUSENTE_404": True})
+    sem_erro = client.get("/products/1")
+    ausente = client.get("/products/11")
+    invalida = client.put("/_config", json={"LATENCIA": "exponencial"})
+
+    assert com_erro.status_code == 503
+    assert sem_erro.status_code == 200
+    assert ausente.status_code == 404
+    assert invalida.status_code == 422
+
+
+def test_distribuicoes_de_latencia():
+    aleatorio = random.Random(1)
+    fixa = ConfiguracaoFakeStore(LATENCIA_MS=50)
+    uniforme = ConfiguracaoFakeStore(LATENCIA="uniforme", LATENCIA_MS=50,
+                                     LATENCIA_DESVIO_MS=10)
+    lognormal = ConfiguracaoFakeStore(LATENCIA="lognormal", LATENCIA_MS=50,
+                                      LATENCIA_DESVIO_MS=50)
+
+    amostras = [sortear_latencia(lognormal, aleatorio) for _ in range(1000)]
+
+    assert sortear_latencia(fixa, aleatorio) == 0.05
+    assert 0.04 <= sortear_latencia(uniforme, aleatorio) <= 0.06
+    assert sorted(amostras)[500] < 0.07 < max(amostras)
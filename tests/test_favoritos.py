@@ -1,5 +1,10 @@
+import asyncio
+from datetime import datetime
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.api.schemas.favorito_schemas import FavoritoResponse
 from app.core.security import pegar_usuario_atual
 from app.main import app
 from app.db.models.usuario_model import Usuario
@@ -143,3 +148,412 @@ def test_deletar_favorito_nao_encontrado(mocker):
     assert response.json() == {
         "detail": "Favorito não encontrado para este cliente."
     }
+
+
+def test_listar_favoritos_com_etag(mocker):
+    mock_favorito = {
+        "id": 100,
+        "produto_id": 50,
+        "cliente_id": 1,
+        "created_at": "2025-06-20T10:00:00",
+        "titulo": "Produto Teste",
+        "imagem": "url_imagem_teste.jpg",
+        "preco": 99.90
+    }
+    mocker.patch(
+        "app.api.domain.favorito_domain.FavoritoDomain.versao_favoritos",
+        return_value=3
+    )
+    listar = mocker.patch(
+        "app.api.domain.favorito_domain.FavoritoDomain.favoritos_por_cliente",
+        return_value=([FavoritoResponse(**mock_favorito)], None)
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.get("/clientes/1/favoritos/")
+    etag = response.headers["ETag"]
+    nao_modificada = client.get("/clientes/1/favoritos/",
+                                headers={"If-None-Match": etag})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == 100
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert nao_modificada.status_code == 304
+    assert nao_modificada.headers["ETag"] == etag
+    assert "X-Next-Cursor" not in response.headers
+    listar.assert_called_once_with(1, limite=50, apos=None, cliente_existe=True)
+
+
+def test_buscar_favoritos(mocker):
+    mock_favorito = {
+        "id": 100,
+        "produto_id": 50,
+        "cliente_id": 1,
+        "created_at": "2025-06-20T10:00:00",
+        "titulo": "Mochila Fjallraven",
+        "imagem": "url_imagem_teste.jpg",
+        "preco": 109.95
+    }
+    buscar = mocker.patch(
+        "app.api.domain.favorito_domain.FavoritoDomain.buscar_favoritos",
+        return_value=([mock_favorito], 20)
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.get("/clientes/1/favoritos/search?q=mochila&limit=20")
+    outro_cliente = client.get("/clientes/2/favoritos/search?q=mochila")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json()[0]["titulo"] == "Mochila Fjallraven"
+    assert "X-Next-Cursor" in response.headers
+    buscar.assert_called_once_with(1, "mochila", limite=20, deslocamento=0)
+    assert outro_cliente.status_code == 403
+
+
+def test_criar_favoritos_em_lote(mocker):
+    mock_favorito = {
+        "id": 101,
+        "produto_id": 1,
+        "cliente_id": 1,
+        "created_at": "2025-06-20T11:00:00",
+        "titulo": "Mochila",
+        "imagem": "url_mochila.jpg",
+        "preco": 109.95
+    }
+    adicionar = mocker.patch(
+        "app.api.domain.favorito_domain.FavoritoDomain.adicionar_favoritos_em_lote",
+        return_value=[
+            {"produto_id": 1, "status": 201, "favorito": mock_favorito},
+            {"produto_id": 2, "status": 409, "erro": "Este produto já está na lista "
+                                                     "de favoritos do cliente."},
+            {"produto_id": 999, "status": 404, "erro": "Produto não encontrado."}
+        ]
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.post("/clientes/1/favoritos/bulk",
+                           json={"produto_ids": [1, 2, 999]})
+    outro_cliente = client.post("/clientes/2/favoritos/bulk",
+                                json={"produto_ids": [1]})
+    vazio = client.post("/clientes/1/favoritos/bulk", json={"produto_ids": []})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["status"] for item in data] == [201, 409, 404]
+    assert data[0]["favorito"]["titulo"] == "Mochila"
+    adicionar.assert_called_once_with(1, [1, 2, 999])
+    assert outro_cliente.status_code == 403
+    assert vazio.status_code == 422
+
+
+def test_adicionar_favoritos_em_lote_classifica_resultados(mocker):
+    from app.api.domain.favorito_domain import FavoritoDomain
+    from app.db.dto.cliente_dto import ClienteDTO
+    from app.db.dto.favorito_dto import FavoritoDTO
+    from app.db.models.favorito_model import Favorito
+    from app.services.product_service import ProdutoService
+
+    db = mocker.AsyncMock()
+    mocker.patch.object(ClienteDTO, "pegar_por_id", return_value=object())
+    incrementar = mocker.patch.object(ClienteDTO, "incrementar_versao_favoritos")
+    mocker.patch.object(FavoritoDTO, "produtos_favoritados", return_value={2})
+    pegar_produtos = mocker.patch.object(
+        ProdutoService, "pegar_produtos_por_ids",
+        return_value=[
+            {"id": 1, "status": 200, "produto": {"id": 1, "title": "Mochila",
+                                                 "image": "img", "price": 10}},
+            {"id": 3, "status": 200, "produto": {"id": 3, "title": "Anel",
+                                                 "image": "img", "price": 5}},
+            {"id": 4, "status": 200, "produto": {"id": 4, "title": "Sem imagem", "price": 7}},
+            {"id": 5, "status": 200, "produto": {"id": 5, "title": "Sem preco", "image": "img"}},
+            {"id": 999, "status": 404, "erro": "Produto não encontrado."}
+        ]
+    )
+    # O produto 3 foi favoritado por uma requisição concorrente: ON CONFLICT o ignora.
+    registrar_varios = mocker.patch.object(
+        FavoritoDTO, "registrar_varios",
+        return_value=[Favorito(id=50, cliente_id=1, produto_id=1),
+                      Favorito(id=51, cliente_id=1, produto_id=4)]
+    )
+
+    resultado = asyncio.run(FavoritoDomain(db).adicionar_favoritos_em_lote(
+        1, [1, 2, 3, 4, 5, 999, 1]))
+
+    pegar_produtos.assert_called_once_with([1, 3, 4, 5, 999])
+    linhas = registrar_varios.call_args.args[0]
+    assert [linha["produto_id"] for linha in linhas] == [1, 3, 4]
+    assert linhas[2]["imagem"] == ""
+    assert [(item["produto_id"], item["status"]) for item in resultado] == [
+        (1, 201), (2, 409), (3, 409), (4, 201), (5, 502), (999, 404)]
+    incrementar.assert_called_once_with(1)
+    db.commit.assert_awaited_once()
+
+
+def test_adicionar_favorito_com_upsert_no_banco(tmp_path, mocker):
+    from fastapi import HTTPException
+    from sqlalchemy import event, insert
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.api.domain.favorito_domain import FavoritoDomain
+    from app.api.schemas.favorito_schemas import FavoritoCreate
+    from app.db.models.cliente_model import Cliente
+    from app.db.models.produto_model import Produto
+    from app.services.product_service import ProdutoService
+
+    produtos = {1: {"id": 1, "title": "Mochila", "image": None, "price": 10},
+                2: {"id": 2, "title": "Anel", "image": "img2", "price": 5.5}}
+    pegar_produto = mocker.patch.object(
+        ProdutoService, "pegar_produto_por_id_api",
+        side_effect=lambda produto_id: produtos[produto_id])
+
+    async def cenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'favoritos.db'}")
+        event.listen(engine.sync_engine, "connect",
+                     lambda conexao, _: conexao.execute("PRAGMA foreign_keys=ON"))
+        async with engine.begin() as conexao:
+            await conexao.run_sync(Cliente.__table__.create)
+            await conexao.run_sync(Produto.__table__.create)
+            # A coluna tsvector de favoritos vira texto no SQLite.
+            await conexao.exec_driver_sql(
+                "CREATE TABLE favoritos (id INTEGER PRIMARY KEY, cliente_id INTEGER NOT NULL "
+                "REFERENCES clientes(id) ON DELETE CASCADE, produto_id INTEGER NOT NULL, "
+                "titulo TEXT NOT NULL, imagem TEXT NOT NULL, preco NUMERIC NOT NULL, review TEXT, "
+                "busca TEXT, created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "updated_at TIMESTAMP, UNIQUE (cliente_id, produto_id))")
+            await conexao.execute(insert(Cliente).values(id=1, nome="Ana", email="ana@example.com"))
+            await conexao.execute(insert(Produto).values(
+                id=1, titulo="Mochila", preco=10, imagem=None, descricao="Boa", hash_conteudo="x"))
+
+        comandos = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conexao, cursor, comando, *args: comandos.append(comando.split()[0]))
+
+        resultados = []
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            favorito_domain = FavoritoDomain(db)
+            for cliente_id, produto_id in ((1, 1), (1, 1), (1, 2), (99, 1), (99, 2)):
+                comandos.clear()
+                try:
+                    favorito = await favorito_domain.adicionar_favorito(
+                        cliente_id, FavoritoCreate(produto_id=produto_id))
+                    resultados.append((favorito.titulo, favorito.imagem, favorito.review))
+                except HTTPException as e:
+                    resultados.append(e.status_code)
+                resultados.append([comando for comando in comandos if comando == "SELECT"
+                                   or comando == "INSERT"])
+            versao = (await db.get(Cliente, 1, populate_existing=True)).favoritos_versao
+        await engine.dispose()
+        return resultados, versao
+
+    resultados, versao = asyncio.run(cenario())
+    assert resultados == [
+        ("Mochila", "", "Boa"), ["INSERT"],
+        # Já favorito: o segundo INSERT esbarra na constraint única.
+        409, ["INSERT", "INSERT"],
+        # Fora da réplica: dados do serviço de produtos e INSERT comum.
+        ("Anel", "img2", ""), ["INSERT", "INSERT"],
+        # Cliente inexistente: recusado pela chave estrangeira.
+        404, ["INSERT"],
+        404, ["INSERT", "INSERT"],
+    ]
+    assert versao == 2
+    # O serviço de produtos só é chamado quando o INSERT da réplica não grava nada.
+    assert [chamada.args[0] for chamada in pegar_produto.await_args_list] == [1, 2, 2]
+
+
+def test_favoritos_por_cliente_montados_das_linhas(tmp_path):
+    from fastapi import HTTPException
+    from sqlalchemy import insert
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.api.domain.favorito_domain import FavoritoDomain
+    from app.db.models.cliente_model import Cliente
+    from app.db.models.favorito_model import Favorito
+
+    async def cenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'favoritos.db'}")
+        async with engine.begin() as conexao:
+            await conexao.run_sync(Cliente.__table__.create)
+            # A coluna tsvector de favoritos vira texto no SQLite.
+            await conexao.exec_driver_sql(
+                "CREATE TABLE favoritos (id INTEGER PRIMARY KEY, cliente_id INTEGER NOT NULL, "
+                "produto_id INTEGER NOT NULL, titulo TEXT NOT NULL, imagem TEXT NOT NULL, "
+                "preco NUMERIC NOT NULL, review TEXT, busca TEXT, "
+                "created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP)")
+            await conexao.execute(insert(Cliente), [
+                {"id": 1, "nome": "Ana", "email": "ana@example.com"},
+                {"id": 2, "nome": "Bia", "email": "bia@example.com"}])
+            await conexao.execute(insert(Favorito), [
+                {"id": i, "cliente_id": 1, "produto_id": i, "titulo": f"Produto {i}",
+                 "imagem": "img", "preco": 10.5 * i, "created_at": datetime(2025, 6, 20, 10, i)}
+                for i in (1, 2, 3)])
+
+        async with async_sessionmaker(engine)() as db:
+            favorito_domain = FavoritoDomain(db)
+            paginas, apos = [], None
+            while True:
+                favoritos, apos = await favorito_domain.favoritos_por_cliente(
+                    1, limite=2, apos=apos)
+                paginas.append(favoritos)
+                if apos is None:
+                    break
+            sem_favoritos, _ = await favorito_domain.favoritos_por_cliente(2, limite=2)
+            with pytest.raises(HTTPException) as inexistente:
+                await favorito_domain.favoritos_por_cliente(99, limite=2)
+            carregados = [objeto for objeto in db.identity_map.values()
+                          if isinstance(objeto, Favorito)]
+        await engine.dispose()
+        return paginas, sem_favoritos, inexistente.value.status_code, carregados
+
+    paginas, sem_favoritos, status_inexistente, carregados = asyncio.run(cenario())
+    assert [[favorito.id for favorito in pagina] for pagina in paginas] == [[1, 2], [3]]
+    assert isinstance(paginas[0][0], FavoritoResponse)
+    assert paginas[1][0].preco == 31.5
+    assert sem_favoritos == []
+    assert status_inexistente == 404
+    # Nenhum favorito passou pelo identity map da sessão.
+    assert carregados == []
+
+
+def test_favoritos_por_cliente_sem_consultar_cliente_ja_carregado(mocker):
+    from app.api.domain.favorito_domain import FavoritoDomain
+    from app.db.dto.cliente_dto import ClienteDTO
+    from app.db.dto.favorito_dto import FavoritoDTO
+
+    mocker.patch.object(FavoritoDTO, "todos_por_cliente", return_value=[])
+    mocker.patch.object(FavoritoDTO, "todos_por_cliente_json",
+                        return_value=mocker.Mock(favoritos="[]", quantidade=0))
+    pegar_cliente = mocker.patch.object(ClienteDTO, "pegar_por_id")
+    favorito_domain = FavoritoDomain(mocker.AsyncMock())
+
+    async def cenario():
+        return (await favorito_domain.favoritos_por_cliente(1, limite=2, cliente_existe=True),
+                await favorito_domain.favoritos_por_cliente_json(1, limite=2,
+                                                                 cliente_existe=True))
+
+    assert asyncio.run(cenario()) == (([], None), ("[]", None))
+    pegar_cliente.assert_not_awaited()
+
+
+def test_favoritos_com_json_montado_no_banco(mocker):
+    from app.core.config import settings
+
+    corpo = ('[{"id" : 100, "cliente_id" : 1, "produto_id" : 50, "titulo" : "Produto Teste", '
+             '"imagem" : "img", "preco" : 99.9, "review" : null, '
+             '"created_at" : "2025-06-20T10:00:00Z", "updated_at" : null}]')
+    mocker.patch.object(settings, "FAVORITOS_JSON_NO_BANCO", {"listagem", "busca"})
+    mocker.patch("app.api.domain.favorito_domain.FavoritoDomain.versao_favoritos",
+                 return_value=3)
+    listar = mocker.patch(
+        "app.api.domain.favorito_domain.FavoritoDomain.favoritos_por_cliente_json",
+        return_value=(corpo, (datetime(2025, 6, 20, 10, 0), 100)))
+    buscar = mocker.patch(
+        "app.api.domain.favorito_domain.FavoritoDomain.buscar_favoritos_json",
+        return_value=(corpo, None))
+    por_objetos = mocker.patch(
+        "app.api.domain.favorito_domain.FavoritoDomain.favoritos_por_cliente")
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.get("/clientes/1/favoritos/", params={"limit": 1})
+    busca = client.get("/clientes/1/favoritos/search", params={"q": "produto"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.content == corpo.encode()
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["ETag"]
+    assert "X-Next-Cursor" in response.headers
+    assert FavoritoResponse(**response.json()[0]).id == 100
+    assert busca.content == corpo.encode()
+    assert "X-Next-Cursor" not in busca.headers
+    listar.assert_called_once_with(1, limite=1, apos=None, cliente_existe=True)
+    buscar.assert_called_once_with(1, "produto", limite=50, deslocamento=0)
+    por_objetos.assert_not_called()
+
+
+def test_json_montado_no_banco_tem_os_campos_da_resposta():
+    from sqlalchemy import func
+    from sqlalchemy.dialects import postgresql
+
+    from app.db.dto.favorito_dto import COLUNAS_RESPOSTA, FavoritoDTO, _pagina_em_json
+    from app.db.models.favorito_model import Favorito
+
+    pagina = FavoritoDTO._consulta_por_cliente(
+        1, 3, None, func.row_number().over(order_by=Favorito.id).label("n")).subquery()
+    sql = str(_pagina_em_json(pagina, 2).compile(dialect=postgresql.dialect()))
+
+    assert [coluna.name for coluna in COLUNAS_RESPOSTA] == list(FavoritoResponse.model_fields)
+    assert """string_agg(concat('{"id":', CAST(anon_1.id AS TEXT), ',"cliente_id":'""" in sql
+    assert "',' ORDER BY anon_1.n) FILTER (WHERE anon_1.n <=" in sql
+
+
+def test_json_montado_no_banco_igual_ao_da_api(banco_postgres, mocker):
+    from datetime import timezone
+
+    from sqlalchemy import insert
+
+    from app.core.config import settings
+    from app.core.database import criar_sessionmaker, get_db
+    from app.db.models.cliente_model import Cliente
+    from app.db.models.favorito_model import Favorito
+
+    engine = banco_postgres()
+    criado = datetime(2025, 6, 20, 10, 0, tzinfo=timezone.utc)
+
+    async def preparar():
+        async with engine.begin() as conexao:
+            await conexao.execute(insert(Cliente).values(id=1, nome="Ana", email="ana@example.com"))
+            # Preço inteiro, com uma e duas casas; textos com aspas, barra,
+            # quebra de linha, caractere de controle e acentos; datas com e sem
+            # frações de segundo; review e updated_at nulos.
+            await conexao.execute(insert(Favorito), [
+                {"cliente_id": 1, "produto_id": 1, "titulo": 'Mochila "Azul" \\ 15\'',
+                 "imagem": "https://example.com/a.jpg", "preco": 150, "review": None,
+                 "created_at": criado, "updated_at": None},
+                {"cliente_id": 1, "produto_id": 2, "titulo": "Mochila Ação\n\x01/\x7f",
+                 "imagem": "", "preco": 10.5, "review": "ótima mochila",
+                 "created_at": criado.replace(microsecond=120000),
+                 "updated_at": criado.replace(hour=11, microsecond=5)},
+                {"cliente_id": 1, "produto_id": 3, "titulo": "Mochila 3", "imagem": "img",
+                 "preco": 0.05, "review": "mochila", "created_at": criado.replace(minute=1),
+                 "updated_at": criado}])
+    asyncio.run(preparar())
+
+    fabrica = criar_sessionmaker(engine)
+
+    async def db_de_teste():
+        async with fabrica() as db:
+            yield db
+
+    def respostas():
+        return [client.get(url, params=params) for url, params in (
+            ("/clientes/1/favoritos/", {"limit": 2}),
+            ("/clientes/1/favoritos/", {"limit": 50}),
+            ("/clientes/1/favoritos/search", {"q": "mochila", "limit": 2}))]
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+    app.dependency_overrides[get_db] = db_de_teste
+    mocker.patch.object(settings, "FAVORITOS_JSON_NO_BANCO", set())
+    em_python = respostas()
+    mocker.patch.object(settings, "FAVORITOS_JSON_NO_BANCO", {"listagem", "busca"})
+    no_banco = respostas()
+    app.dependency_overrides = {}
+    asyncio.run(engine.dispose())
+
+    for resposta_python, resposta_banco in zip(em_python, no_banco):
+        assert resposta_python.status_code == resposta_banco.status_code == 200
+        assert resposta_banco.content == resposta_python.content
+        for cabecalho in ("ETag", "X-Next-Cursor"):
+            assert resposta_banco.headers.get(cabecalho) == resposta_python.headers.get(cabecalho)
+    assert len(em_python[1].json()) == 3
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.domain.favorito_domain import FavoritoDomain
+from app.core.security import pegar_admin_atual, pegar_usuario_atual
+from app.db.models.cliente_favoritos_stats_model import ClienteFavoritosStats
+from app.db.models.cliente_model import Cliente
+from app.db.models.usuario_model import Usuario
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_estatisticas_favoritos_do_cliente(mocker):
+    estatisticas = mocker.patch.object(
+        FavoritoDomain, "estatisticas_favoritos",
+        return_value={"cliente_id": 1, "quantidade": 3, "valor_total": 150.5,
+                      "ultima_atividade": "2025-06-20T10:00:00"})
+    app.dependency_overrides[pegar_usuario_atual] = \
+        lambda: Usuario(id=10, perfil="cliente", cliente_id=1)
+
+    response = client.get("/clientes/1/favoritos/stats")
+    outro_cliente = client.get("/clientes/2/favoritos/stats")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json()["quantidade"] == 3
+    assert response.json()["valor_total"] == 150.5
+    estatisticas.assert_awaited_once_with(1)
+    assert outro_cliente.status_code == 403
+
+
+def test_listar_estatisticas_favoritos_admin(mocker):
+    listar = mocker.patch.object(
+        FavoritoDomain, "listar_estatisticas_favoritos",
+        return_value=([{"cliente_id": 1, "quantidade": 2, "valor_total": 20,
+                        "ultima_atividade": None}], 1))
+    app.dependency_overrides[pegar_admin_atual] = lambda: {"username": "admin_teste"}
+
+    response = client.get("/admin/favoritos/stats", params={"limit": 1})
+    seguinte = client.get("/admin/favoritos/stats",
+                          params={"limit": 1, "cursor": response.headers["X-Next-Cursor"]})
+    cursor_invalido = client.get("/admin/favoritos/stats", params={"cursor": "x"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json()[0]["quantidade"] == 2
+    assert listar.call_args_list[0].kwargs == {"limite": 1, "apos": None}
+    assert seguinte.status_code == 200
+    assert listar.call_args_list[1].kwargs == {"limite": 1, "apos": 1}
+    assert cursor_invalido.status_code == 400
+
+
+def test_estatisticas_lidas_da_tabela_materializada(tmp_path):
+    ultima = datetime(2025, 6, 20, 10, 0)
+
+    async def cenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+        async with engine.begin() as conexao:
+            await conexao.run_sync(Cliente.__table__.create)
+            await conexao.run_sync(ClienteFavoritosStats.__table__.create)
+            await conexao.execute(insert(Cliente), [
+                {"id": i, "nome": f"Cliente {i}", "email": f"c{i}@example.com"}
+                for i in (1, 2, 3)])
+            await conexao.execute(insert(ClienteFavoritosStats).values(
+                cliente_id=2, quantidade=4, valor_total=99.9, ultima_atividade=ultima))
+
+        async with async_sessionmaker(engine)() as db:
+            favorito_domain = FavoritoDomain(db)
+            do_cliente = await favorito_domain.estatisticas_favoritos(2)
+            paginas, apos = [], None
+            while True:
+                pagina, apos = await favorito_domain.listar_estatisticas_favoritos(
+                    limite=2, apos=apos)
+                paginas.append([(item["cliente_id"], item["quantidade"]) for item in pagina])
+                if apos is None:
+                    break
+            with pytest.raises(HTTPException) as inexistente:
+                await favorito_domain.estatisticas_favoritos(99)
+        await engine.dispose()
+        return do_cliente, paginas, inexistente.value.status_code
+
+    do_cliente, paginas, status_inexistente = asyncio.run(cenario())
+    assert do_cliente["quantidade"] == 4
+    assert float(do_cliente["valor_total"]) == 99.9
+    assert do_cliente["ultima_atividade"] == ultima
+    assert paginas == [[(1, 0), (2, 4)], [(3, 0)]]
+    assert status_inexistente == 404
@@ -0,0 +1,38 @@
+import asyncio
+
+from app.core.http_client import (pegar_http_client, fechar_http_client,
+                                  estatisticas_pool)
+
+
+def test_http_client_compartilhado():
+    primeiro = pegar_http_client()
+    segundo = pegar_http_client()
+
+    assert primeiro is segundo
+    assert estatisticas_pool() == {"ativas": 0, "ociosas": 0, "aguardando": 0}
+
+    asyncio.run(fechar_http_client())
+
+    assert primeiro.is_closed
+    assert pegar_http_client() is not primeiro
+    asyncio.run(fechar_http_client())
+
+
+def test_estatisticas_pool_le_os_internos_do_httpcore():
+    # Os atributos internos lidos por estatisticas_pool existem nas versões
+    # fixadas do httpx/httpcore; uma atualização que os remova falha aqui.
+    client = pegar_http_client()
+    pool = client._transport._pool
+
+    assert isinstance(pool.connections, list)
+    assert isinstance(pool._requests, list)
+    asyncio.run(fechar_http_client())
+
+
+def test_estatisticas_pool_zera_sem_os_internos(mocker):
+    client = pegar_http_client()
+    mocker.patch.object(client, "_transport", object())
+
+    assert estatisticas_pool() == {"ativas": 0, "ociosas": 0, "aguardando": 0}
+    mocker.stopall()
+    asyncio.run(fechar_http_client())
@@ -0,0 +1,135 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.api.domain.importacao_domain import _linhas
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import pegar_admin_atual
+from app.db.dto.cliente_dto import ClienteDTO
+from app.main import app
+
+client = TestClient(app)
+
+
+def fake_pegar_admin_atual():
+    return {"username": "admin_teste"}
+
+
+def _preparar(mocker, importados):
+    db = mocker.AsyncMock()
+    app.dependency_overrides[pegar_admin_atual] = fake_pegar_admin_atual
+    app.dependency_overrides[get_db] = lambda: db
+    mocker.patch("app.api.domain.importacao_domain.pwd_context.hash",
+                 side_effect=lambda senha: f"hash-{senha}")
+    return mocker.patch.object(ClienteDTO, "importar_lote", side_effect=importados)
+
+
+def test_importar_clientes_csv_em_lotes(mocker):
+    mocker.patch.object(settings, "IMPORTACAO_TAMANHO_LOTE", 2)
+    importar_lote = _preparar(mocker, [{"a@example.com", "b@example.com"},
+                                       {"d@example.com"}])
+    corpo = ("nome,email,password\r\n"
+             "Ana,a@example.com,senhaSegura1\r\n"
+             "Bia,b@example.com,senhaSegura2\r\n"
+             "Caio,email-invalido,senhaSegura3\r\n"
+             "Ana de novo,a@example.com,senhaSegura4\r\n"
+             "Duda,d@example.com,senhaSegura5\r\n"
+             "Edu,e@example.com,senhaSegura6\r\n"
+             "linha,quebrada\n")
+
+    response = client.post("/admin/clientes/importar", content=corpo.encode(),
+                           headers={"Content-Type": "text/csv"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 7
+    assert data["importados"] == 3
+    assert [(erro["linha"], erro["erro"].split(":")[0]) for erro in data["erros"]] == [
+        (4, "email"), (5, "E-mail repetido no arquivo."),
+        (7, "E-mail já cadastrado."), (8, "Esperadas 3 colunas, encontradas 2.")]
+    primeiro_lote = importar_lote.call_args_list[0].args[0]
+    assert primeiro_lote == [(2, "Ana", "a@example.com", "hash-senhaSegura1"),
+                             (3, "Bia", "b@example.com", "hash-senhaSegura2")]
+    assert [registro[0] for registro in importar_lote.call_args_list[1].args[0]] == [6, 7]
+
+
+def test_importar_clientes_ndjson(mocker):
+    importar_lote = _preparar(mocker, [{"a@example.com"}])
+    corpo = (b'{"nome": "Ana", "email": "a@example.com", "password": "senhaSegura1"}\n'
+             b'{"nome": "Bia"\n'
+             b'[1, 2]\n')
+
+    response = client.post("/admin/clientes/importar", content=corpo,
+                           headers={"Content-Type": "application/x-ndjson"})
+    csv_sem_cabecalho = client.post("/admin/clientes/importar", content=b"Ana,a@x.com,senha\n",
+                                    headers={"Content-Type": "text/csv"})
+    formato_invalido = client.post("/admin/clientes/importar", json=[])
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json()["importados"] == 1
+    assert [erro["erro"] for erro in response.json()["erros"]] == [
+        "JSON inválido.", "A linha deve ser um objeto JSON."]
+    assert importar_lote.call_count == 1
+    assert csv_sem_cabecalho.status_code == 422
+    assert formato_invalido.status_code == 415
+
+
+def test_importar_clientes_csv_com_quebra_de_linha_entre_aspas(mocker):
+    importar_lote = _preparar(mocker, [{"a@example.com", "b@example.com"}])
+    corpo = ('nome,email,password\n'
+             '"Ana\nMaria",a@example.com,senhaSegura1\n'
+             'Bia,b@example.com,"senha\r\n\r\ncom linhas"\n'
+             '"Caio,c@example.com,senhaSegura3\n')
+
+    response = client.post("/admin/clientes/importar", content=corpo.encode(),
+                           headers={"Content-Type": "text/csv"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["importados"] == 2
+    assert [(erro["linha"], erro["erro"]) for erro in data["erros"]] == [
+        (7, "Campo entre aspas não foi fechado.")]
+    assert importar_lote.call_args.args[0] == [
+        (2, "Ana\nMaria", "a@example.com", "hash-senhaSegura1"),
+        (4, "Bia", "b@example.com", "hash-senha\n\ncom linhas")]
+
+
+def test_linhas_recusa_linha_maior_que_o_limite_sem_guardar_o_corpo():
+    async def pedacos():
+        for pedaco in [b"ab", b"c\r\nxxxx", b"xxxx", b"xx\nde", b"f\n", b"yyyyyyyyy"]:
+            yield pedaco
+
+    async def coletar():
+        return [linha async for linha in _linhas(pedacos(), 8)]
+
+    assert asyncio.run(coletar()) == [(1, b"abc"), (2, None), (3, b"def"), (4, None)]
+
+
+def test_importar_clientes_csv_com_linha_maior_que_o_limite(mocker):
+    mocker.patch.object(settings, "IMPORTACAO_MAX_TAMANHO_LINHA", 40)
+    importar_lote = _preparar(mocker, [{"a@example.com", "b@example.com"}])
+    corpo = ("nome,email,password\n"
+             "Ana,a@example.com,senhaSegura1\n"
+             f"{'x' * 100},c@example.com,senhaSegura3\n"
+             "Bia,b@example.com,senhaSegura2\n")
+
+    response = client.post("/admin/clientes/importar", content=corpo.encode(),
+                           headers={"Content-Type": "text/csv"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["importados"] == 2
+    assert [(erro["linha"], erro["erro"]) for erro in data["erros"]] == [
+        (3, "Linha maior que 40 bytes.")]
+    assert [registro[0] for registro in importar_lote.call_args.args[0]] == [2, 4]
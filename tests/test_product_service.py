@@ -0,0 +1,30 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from app.services.product_service import ProdutoService, cache_produto
+
+
+def test_produtos_por_ids_resolve_cache_replica_e_api(mocker):
+    cache_produto.invalidar()
+    cache_produto.definir(1, {"id": 1, "origem": "cache"})
+    mocker.patch.object(
+        ProdutoService, "_produtos_replica_por_ids",
+        return_value=[{"id": 2, "origem": "replica"}]
+    )
+
+    async def fake_buscar(self, produto_id):
+        if produto_id == 404:
+            raise HTTPException(status_code=404, detail="Produto não encontrado.")
+        return {"id": produto_id, "origem": "api"}
+
+    mocker.patch.object(ProdutoService, "_buscar_produto_por_id_api", fake_buscar)
+
+    lote = asyncio.run(ProdutoService().pegar_produtos_por_ids([1, 2, 3, 404, 1]))
+    cache_produto.invalidar()
+
+    assert [item["id"] for item in lote] == [1, 2, 3, 404]
+    assert lote[0]["produto"]["origem"] == "cache"
+    assert lote[1]["produto"]["origem"] == "replica"
+    assert lote[2]["produto"]["origem"] == "api"
+    assert lote[3] == {"id": 404, "status": 404, "erro": "Produto não encontrado."}
@@ -27,6 +27,86 @@ def test_listar_produtos(mocker):
     assert isinstance(response.json(), list)
 
 
+def test_listar_produtos_paginado_e_filtrado(mocker):
+    mocker.patch(
+        "app.services.product_service.ProdutoService.pegar_produtos_api",
+        return_value=[
+            {"id": 1, "title": "Camiseta", "price": 30.0, "category": "roupas"},
+            {"id": 2, "title": "Anel", "price": 200.0, "category": "joias"},
+            {"id": 3, "title": "Blusa", "price": 10.0, "category": "roupas"},
+            {"id": 4, "title": "Jaqueta", "price": 90.0, "category": "roupas"}
+        ]
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    primeira = client.get("/produtos/?category=roupas&sort=price&limit=2")
+    segunda = client.get(f"/produtos/?category=roupas&sort=price&limit=2"
+                         f"&cursor={primeira.headers['X-Next-Cursor']}")
+    faixa = client.get("/produtos/?min_price=20&max_price=100&sort=title")
+
+    app.dependency_overrides = {}
+
+    assert [p["id"] for p in primeira.json()] == [3, 1]
+    assert [p["id"] for p in segunda.json()] == [4]
+    assert "X-Next-Cursor" not in segunda.headers
+    assert [p["id"] for p in faixa.json()] == [1, 4]
+
+
+def test_listar_produtos_nao_modificado(mocker):
+    mocker.patch(
+        "app.services.product_service.ProdutoService.pegar_produtos_api",
+        return_value=[{"id": 1, "title": "Camiseta", "price": 30.0}]
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.get("/produtos/?limit=10")
+    etag = response.headers["ETag"]
+    nao_modificada = client.get("/produtos/?limit=10",
+                                headers={"If-None-Match": etag})
+    outra_pagina = client.get("/produtos/?limit=5",
+                              headers={"If-None-Match": etag})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+    assert nao_modificada.status_code == 304
+    assert nao_modificada.content == b""
+    assert outra_pagina.status_code == 200
+
+
+def test_buscar_produtos_por_relevancia(mocker):
+    mocker.patch(
+        "app.services.product_service.ProdutoService.pegar_produtos_api",
+        return_value=[
+            {"id": 1, "title": "Mochila Fjallraven",
+             "description": "Mochila para notebook de 15 polegadas"},
+            {"id": 2, "title": "Jaqueta de inverno",
+             "description": "Bolso interno para notebook"},
+            {"id": 3, "title": "Notebook Gamer", "description": "Tela de 15 polegadas"},
+            {"id": 4, "title": "Camiseta", "description": "Algodão"}
+        ]
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    primeira = client.get("/produtos/search?q=noteb&limit=2")
+    segunda = client.get(f"/produtos/search?q=noteb&limit=2"
+                         f"&cursor={primeira.headers['X-Next-Cursor']}")
+    todos_os_termos = client.get("/produtos/search?q=notebook polegadas")
+    sem_resultado = client.get("/produtos/search?q=sapato")
+
+    app.dependency_overrides = {}
+
+    assert [p["id"] for p in primeira.json()] == [3, 1]
+    assert [p["id"] for p in segunda.json()] == [2]
+    assert "X-Next-Cursor" not in segunda.headers
+    assert [p["id"] for p in todos_os_termos.json()] == [3, 1]
+    assert sem_resultado.json() == []
+
+
 def test_produto_por_id(mocker):
     mocker.patch(
         "app.services.product_service.ProdutoService.pegar_produto_por_id_api",
@@ -44,3 +124,51 @@ def test_produto_por_id(mocker):
     assert data["id"] == 1
     assert data["nome"] == "Produto Teste"
     assert "descricao" in data
+
+
+def test_produtos_em_lote_por_query(mocker):
+    lote = mocker.patch(
+        "app.services.product_service.ProdutoService.pegar_produtos_por_ids",
+        return_value=[
+            {"id": 1, "status": 200, "produto": {"id": 1}},
+            {"id": 999, "status": 404, "erro": "Produto não encontrado."}
+        ]
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.get("/produtos/?ids=1,999")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    lote.assert_called_once_with([1, 999])
+    data = response.json()
+    assert data[0]["produto"] == {"id": 1}
+    assert data[1]["status"] == 404
+
+
+def test_produtos_em_lote_ids_invalidos():
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.get("/produtos/?ids=1,abc")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 422
+
+
+def test_produtos_em_lote_post(mocker):
+    mocker.patch(
+        "app.services.product_service.ProdutoService.pegar_produtos_por_ids",
+        return_value=[{"id": 2, "status": 200, "produto": {"id": 2}}]
+    )
+
+    app.dependency_overrides[pegar_usuario_atual] = fake_pegar_usuario_atual
+
+    response = client.post("/produtos/lote", json={"ids": [2]})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": 2, "status": 200, "produto": {"id": 2}, "erro": None}]
@@ -0,0 +1,49 @@
+import asyncio
+
+from app.util.single_flight import SingleFlight
+
+
+def test_single_flight_agrupa_chamadas_concorrentes():
+    voo = SingleFlight("teste_agrupa")
+    chamadas = []
+
+    async def buscar():
+        chamadas.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": 7}
+
+    async def cenario():
+        return await asyncio.gather(
+            *[voo.executar(7, buscar) for _ in range(10)])
+
+    resultados = asyncio.run(cenario())
+
+    assert resultados == [{"id": 7}] * 10
+    assert len(chamadas) == 1
+    assert not voo.em_andamento(7)
+
+
+def test_single_flight_propaga_erro_e_libera_chave():
+    voo = SingleFlight("teste_erro")
+    chamadas = []
+
+    async def falhar():
+        chamadas.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("falhou")
+
+    async def sucesso():
+        return "ok"
+
+    async def cenario():
+        resultados = await asyncio.gather(
+            *[voo.executar(1, falhar) for _ in range(3)],
+            return_exceptions=True)
+        depois = await voo.executar(1, sucesso)
+        return resultados, depois
+
+    resultados, depois = asyncio.run(cenario())
+
+    assert len(chamadas) == 1
+    assert all(isinstance(r, ValueError) for r in resultados)
+    assert depois == "ok"